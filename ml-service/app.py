@@ -1,12 +1,34 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import FastAPI, File, Header, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-import tempfile
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from typing import List, Optional, Union
 import os
+import io
+import sys
+import time
 import logging
+import asyncio
+import hmac
+import importlib.util
+import json
+import random
+import re
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+from functools import lru_cache
+import zipfile
 
-# Document parsing
-import pdfplumber
-from docx import Document
+from parsers.ner_parser import NER_MODEL, get_pipeline
+from parsers.skill_taxonomy import get_taxonomy, taxonomy_store
+from utils.engine_stats import EngineStats
+from utils.job_queue import JobStore
+from utils.metrics import STAGE_SECONDS, registry as metrics_registry
+from utils.model_registry import DEFAULT_SENTENCE_MODEL, registry as model_registry
+from utils.profiling import ProfileRing, profiled, stage
+from utils.response_cache import ResponseCache, content_hash
+from utils.single_flight import SingleFlight
+from utils.worker_pool import PipelineTimeoutError, PoolSaturatedError, WorkerPool
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -22,222 +44,258 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Comprehensive skill database (500+ industry-standard skills)
-SKILLS = [
-    # ════════════════════════════════════════════════════════════
-    # PROGRAMMING LANGUAGES
-    # ════════════════════════════════════════════════════════════
-    'Python', 'Java', 'JavaScript', 'TypeScript', 'C++', 'C#', 'C', 'Go', 'Rust',
-    'Ruby', 'PHP', 'Swift', 'Kotlin', 'Scala', 'R', 'MATLAB', 'Perl', 'Dart',
-    'Objective-C', 'Shell Scripting', 'Bash', 'PowerShell', 'Groovy', 'Elixir',
-    'Haskell', 'Clojure', 'F#', 'Visual Basic', 'Assembly', 'COBOL', 'Fortran',
-    
-    # ════════════════════════════════════════════════════════════
-    # WEB TECHNOLOGIES (Frontend)
-    # ════════════════════════════════════════════════════════════
-    'HTML', 'HTML5', 'CSS', 'CSS3', 'Sass', 'SCSS', 'Less', 'Tailwind CSS',
-    'React', 'Angular', 'Vue', 'Svelte', 'Next.js', 'Nuxt.js',
-    'jQuery', 'Bootstrap', 'Material-UI', 'Ant Design', 'Chakra UI', 'Styled Components',
-    'Redux', 'MobX', 'Vuex', 'Pinia', 'Context API', 'Webpack', 'Vite', 'Parcel',
-    'Babel', 'ESLint', 'Prettier', 'TypeScript', 'JSX', 'AJAX', 'Responsive Design',
-    'Progressive Web Apps', 'PWA', 'Single Page Application', 'SPA', 'Web Components',
-    
-    # ════════════════════════════════════════════════════════════
-    # WEB TECHNOLOGIES (Backend)
-    # ════════════════════════════════════════════════════════════
-    'Node.js', 'Express', 'Nest.js', 'Fastify', 'Koa', 'Hapi.js',
-    'Django', 'Flask', 'FastAPI', 'Pyramid', 'Tornado', 'Bottle',
-    'Spring', 'Spring Boot', 'Spring MVC', 'Hibernate', 'Micronaut', 'Quarkus',
-    'Ruby on Rails', 'Sinatra', 'Laravel', 'Symfony', 'CodeIgniter', 'CakePHP',
-    'ASP.NET', 'ASP.NET Core', '.NET Framework', '.NET Core', 'Entity Framework',
-    'GraphQL', 'REST API', 'RESTful Services', 'SOAP', 'gRPC', 'WebSockets',
-    'Microservices', 'API Gateway', 'Message Queue', 'Event-Driven Architecture',
-    
-    # ════════════════════════════════════════════════════════════
-    # MOBILE DEVELOPMENT
-    # ════════════════════════════════════════════════════════════
-    'React Native', 'Flutter', 'iOS Development', 'Android Development',
-    'Swift UI', 'Jetpack Compose', 'Xamarin', 'Ionic', 'Cordova', 'PhoneGap',
-    'Kotlin Multiplatform', 'Android Studio', 'Xcode', 'Mobile UI/UX',
-    
-    # ════════════════════════════════════════════════════════════
-    # DATABASES & DATA STORAGE
-    # ════════════════════════════════════════════════════════════
-    'SQL', 'NoSQL', 'MongoDB', 'PostgreSQL', 'MySQL', 'MariaDB', 'SQLite',
-    'Microsoft SQL Server', 'Oracle Database', 'IBM DB2', 'Redis', 'Memcached',
-    'Elasticsearch', 'Apache Solr', 'Cassandra', 'CouchDB', 'DynamoDB', 'Firebase',
-    'Firestore', 'Neo4j', 'ArangoDB', 'InfluxDB', 'TimescaleDB', 'ClickHouse',
-    'Snowflake', 'BigQuery', 'Amazon RDS', 'Amazon Aurora', 'Azure SQL', 'Cosmos DB',
-    'Database Design', 'Database Optimization', 'Query Optimization', 'Indexing',
-    'Data Modeling', 'ETL', 'Data Warehousing', 'OLAP', 'OLTP',
-    
-    # ════════════════════════════════════════════════════════════
-    # CLOUD & DEVOPS
-    # ════════════════════════════════════════════════════════════
-    'AWS', 'Amazon Web Services', 'Azure', 'Microsoft Azure', 'Google Cloud', 'GCP',
-    'AWS EC2', 'AWS S3', 'AWS Lambda', 'AWS ECS', 'AWS EKS', 'AWS RDS',
-    'Azure DevOps', 'Azure Functions', 'Azure App Service', 'Google Cloud Functions',
-    'Docker', 'Kubernetes', 'K8s', 'Helm', 'OpenShift', 'Rancher',
-    'Jenkins', 'GitLab CI/CD', 'GitHub Actions', 'CircleCI', 'Travis CI', 'Bamboo',
-    'Terraform', 'Ansible', 'Puppet', 'Chef', 'CloudFormation', 'ARM Templates',
-    'CI/CD', 'Continuous Integration', 'Continuous Deployment', 'DevOps',
-    'Infrastructure as Code', 'IaC', 'Monitoring', 'Prometheus', 'Grafana',
-    'ELK Stack', 'Splunk', 'Datadog', 'New Relic', 'Nagios', 'Zabbix',
-    'Service Mesh', 'Istio', 'Linkerd', 'Container Orchestration',
-    
-    # ════════════════════════════════════════════════════════════
-    # MACHINE LEARNING & AI
-    # ════════════════════════════════════════════════════════════
-    'Machine Learning', 'Deep Learning', 'Artificial Intelligence', 'AI',
-    'TensorFlow', 'PyTorch', 'Keras', 'Scikit-learn', 'XGBoost', 'LightGBM',
-    'Natural Language Processing', 'NLP', 'Computer Vision', 'Neural Networks',
-    'CNN', 'RNN', 'LSTM', 'GAN', 'Transformer', 'BERT', 'GPT', 'Large Language Models', 'LLM',
-    'Reinforcement Learning', 'Supervised Learning', 'Unsupervised Learning',
-    'Feature Engineering', 'Model Deployment', 'MLOps', 'Hugging Face',
-    'OpenCV', 'YOLO', 'ResNet', 'Model Training', 'Hyperparameter Tuning',
-    
-    # ════════════════════════════════════════════════════════════
-    # DATA SCIENCE & ANALYTICS
-    # ════════════════════════════════════════════════════════════
-    'Data Science', 'Data Analysis', 'Data Analytics', 'Business Intelligence',
-    'Pandas', 'NumPy', 'SciPy', 'Matplotlib', 'Seaborn', 'Plotly', 'Bokeh',
-    'Tableau', 'Power BI', 'Looker', 'Qlik', 'D3.js', 'Apache Spark', 'PySpark',
-    'Hadoop', 'MapReduce', 'Hive', 'Pig', 'Kafka', 'Apache Airflow', 'Luigi',
-    'Statistical Analysis', 'Predictive Analytics', 'A/B Testing', 'Hypothesis Testing',
-    'Data Visualization', 'Data Mining', 'Big Data', 'Data Pipelines',
-    
-    # ════════════════════════════════════════════════════════════
-    # VERSION CONTROL & COLLABORATION
-    # ════════════════════════════════════════════════════════════
-    'Git', 'GitHub', 'GitLab', 'Bitbucket', 'SVN', 'Mercurial', 'Perforce',
-    'Git Flow', 'GitHub Flow', 'Version Control', 'Code Review', 'Pull Requests',
-    'JIRA', 'Confluence', 'Trello', 'Asana', 'Monday.com', 'Slack', 'Microsoft Teams',
-    
-    # ════════════════════════════════════════════════════════════
-    # TESTING & QA
-    # ════════════════════════════════════════════════════════════
-    'Unit Testing', 'Integration Testing', 'End-to-End Testing', 'E2E Testing',
-    'Jest', 'Mocha', 'Chai', 'Jasmine', 'Karma', 'Cypress', 'Selenium', 'Playwright',
-    'JUnit', 'TestNG', 'PyTest', 'Robot Framework', 'Cucumber', 'Postman',
-    'Test-Driven Development', 'TDD', 'Behavior-Driven Development', 'BDD',
-    'Load Testing', 'Performance Testing', 'JMeter', 'Gatling', 'Locust',
-    
-    # ════════════════════════════════════════════════════════════
-    # SECURITY & COMPLIANCE
-    # ════════════════════════════════════════════════════════════
-    'Cybersecurity', 'Information Security', 'Application Security', 'Network Security',
-    'OAuth', 'JWT', 'OpenID', 'SAML', 'SSO', 'Authentication', 'Authorization',
-    'Encryption', 'SSL/TLS', 'HTTPS', 'Penetration Testing', 'Vulnerability Assessment',
-    'OWASP', 'Security Auditing', 'GDPR', 'HIPAA', 'SOC 2', 'ISO 27001',
-    
-    # ════════════════════════════════════════════════════════════
-    # TOOLS & IDEs
-    # ════════════════════════════════════════════════════════════
-    'VS Code', 'Visual Studio', 'IntelliJ IDEA', 'PyCharm', 'WebStorm', 'Eclipse',
-    'NetBeans', 'Sublime Text', 'Vim', 'Emacs', 'Atom', 'Android Studio', 'Xcode',
-    'Postman', 'Insomnia', 'Swagger', 'OpenAPI', 'Figma', 'Adobe XD', 'Sketch',
-    
-    # ════════════════════════════════════════════════════════════
-    # METHODOLOGIES & PRACTICES
-    # ════════════════════════════════════════════════════════════
-    'Agile', 'Scrum', 'Kanban', 'Waterfall', 'Lean', 'Six Sigma', 'SAFe',
-    'Object-Oriented Programming', 'OOP', 'Functional Programming', 'Design Patterns',
-    'SOLID Principles', 'Clean Code', 'Code Refactoring', 'Pair Programming',
-    'Code Reviews', 'Documentation', 'Technical Writing', 'System Design',
-    'Software Architecture', 'Scalability', 'High Availability', 'Fault Tolerance',
-    
-    # ════════════════════════════════════════════════════════════
-    # EMERGING TECHNOLOGIES
-    # ════════════════════════════════════════════════════════════
-    'Blockchain', 'Smart Contracts', 'Ethereum', 'Solidity', 'Web3',
-    'IoT', 'Internet of Things', 'Edge Computing', 'Quantum Computing',
-    'AR/VR', 'Augmented Reality', 'Virtual Reality', '5G', 'Serverless',
-    
-    # ════════════════════════════════════════════════════════════
-    # SOFT SKILLS (Important but not overweight in ATS)
-    # ════════════════════════════════════════════════════════════
-    'Communication', 'Leadership', 'Teamwork', 'Problem Solving', 'Critical Thinking',
-    'Time Management', 'Project Management', 'Stakeholder Management',
-    'Presentation Skills', 'Mentoring', 'Collaboration', 'Adaptability'
-]
+# Skill vocabulary, variations, implication rules and categories live in
+# taxonomy/skills.json, compiled into a memory-mapped artifact that every
+# worker reloads when it is recompiled (python -m parsers.skill_taxonomy).
+# SKILLS is the startup snapshot, for the benchmarks; requests use get_taxonomy()
+SKILLS = list(get_taxonomy().skills)
 
-def parse_pdf(file_path: str) -> str:
+def read_document(source: Union[bytes, str]) -> bytes:
     """
-    Production-grade PDF text extraction for resumes
-    Uses PyMuPDF (fitz) - industry standard for resume parsing
+    Uploaded bytes pass straight through; a path is read once
     """
-    text = ""
+    if isinstance(source, bytes):
+        return source
+    if isinstance(source, (bytearray, memoryview)):
+        return bytes(source)
+    with open(source, 'rb') as f:
+        return f.read()
+
+# Page-wise PDF limits: long portfolios and scanned appendices stop being read
+# once we have more pages/text than scoring ever looks at
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "20"))
+PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", "100000"))
+PDF_MIN_CHARS = 50
+# Wall-clock budget per engine; checked between pages (see read_pdf_pages)
+PDF_ENGINE_BUDGET_SECONDS = float(os.getenv("PDF_ENGINE_BUDGET_SECONDS", "10"))
+# pdfplumber is many times slower per page than PyMuPDF; longer documents skip it
+PDF_PLUMBER_MAX_PAGES = int(os.getenv("PDF_PLUMBER_MAX_PAGES", "10"))
+
+PDF_PAGE_OBJECT_RE = re.compile(rb'/Type\s*/Page(?![A-Za-z])')
+
+def _pymupdf_pages(content: bytes):
+    import fitz  # PyMuPDF
     
-    # ══════════════════════════════════════════════════════════════
-    # METHOD 1: PyMuPDF (fitz) - BEST for resumes ⭐
-    # ══════════════════════════════════════════════════════════════
+    doc = fitz.open(stream=content, filetype="pdf")
     try:
-        import fitz  # PyMuPDF
-        
-        doc = fitz.open(file_path)
-        for page_num, page in enumerate(doc):
+        page_count = doc.page_count
+        for page_index, page in enumerate(doc):
             # Extract text with layout preservation
-            page_text = page.get_text("text")
-            if page_text:
-                text += page_text + "\n"
-        
+            yield page_index, page_count, page.get_text("text")
+    finally:
         doc.close()
-        
-        if len(text.strip()) > 50:
-            logger.info(f"✅ PyMuPDF extracted {len(text)} chars from {len(doc)} pages")
-            # Clean up the text
-            text = clean_extracted_text(text)
-            return text.strip()
-    except ImportError:
-        logger.warning("⚠️ PyMuPDF not installed, trying fallback...")
-    except Exception as e:
-        logger.warning(f"⚠️ PyMuPDF failed: {e}")
+
+def _pdfplumber_pages(content: bytes):
+    import pdfplumber
     
-    # ══════════════════════════════════════════════════════════════
-    # METHOD 2: pdfplumber - Good fallback
-    # ══════════════════════════════════════════════════════════════
-    try:
-        import pdfplumber
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        
-        if len(text.strip()) > 50:
-            logger.info(f"✅ pdfplumber extracted {len(text)} chars")
-            text = clean_extracted_text(text)
-            return text.strip()
-    except Exception as e:
-        logger.warning(f"⚠️ pdfplumber failed: {e}")
+    with pdfplumber.open(io.BytesIO(content)) as pdf:
+        page_count = len(pdf.pages)
+        for page_index, page in enumerate(pdf.pages):
+            yield page_index, page_count, page.extract_text()
+
+def _pypdf2_pages(content: bytes):
+    from PyPDF2 import PdfReader
+    
+    reader = PdfReader(io.BytesIO(content))
+    page_count = len(reader.pages)
+    for page_index, page in enumerate(reader.pages):
+        yield page_index, page_count, page.extract_text()
+
+# ══════════════════════════════════════════════════════════════
+# PDF engines, best first:
+#   PyMuPDF (fitz) - BEST for resumes ⭐
+#   pdfplumber     - Good fallback
+#   PyPDF2         - Last resort (no decryption without extra setup)
+# ══════════════════════════════════════════════════════════════
+PDF_ENGINES = {
+    'PyMuPDF': _pymupdf_pages,
+    'pdfplumber': _pdfplumber_pages,
+    'PyPDF2': _pypdf2_pages
+}
+PDF_ENGINE_MODULES = {
+    'PyMuPDF': 'fitz',
+    'pdfplumber': 'pdfplumber',
+    'PyPDF2': 'PyPDF2'
+}
+
+@lru_cache(maxsize=1)
+def available_pdf_engines() -> tuple:
+    """
+    Installed engines, best first (looked up without importing them)
+    """
+    return tuple(
+        engine for engine, module in PDF_ENGINE_MODULES.items()
+        if importlib.util.find_spec(module) is not None
+    )
+
+def probe_pdf(content: bytes) -> dict:
+    """
+    Cheap look at the raw bytes before any engine parses them: encryption,
+    estimated page count and whether there is a text layer ('yes', 'no', or
+    'unknown' when the objects sit in compressed object streams)
+    """
+    font_refs = content.count(b'/Font')
+    if font_refs:
+        text_layer = 'yes'
+    elif b'/ObjStm' in content:
+        text_layer = 'unknown'
+    else:
+        text_layer = 'no'
+    
+    return {
+        'bytes': len(content),
+        'encrypted': b'/Encrypt' in content,
+        'page_estimate': len(PDF_PAGE_OBJECT_RE.findall(content)) or None,
+        'text_layer': text_layer,
+        'images': content.count(b'/Image')
+    }
+
+def plan_pdf_engines(probe: dict, available: tuple = None) -> tuple:
+    """
+    (route, engines to try in order) for a probed PDF, limited to the
+    available (installed) engines:
+
+        encrypted              PyMuPDF, pdfplumber (PyPDF2 can't decrypt)
+        image / no-text        the best engine alone - without a text layer
+                               there is nothing another engine could find
+        long (> PDF_PLUMBER_MAX_PAGES pages)
+                               PyMuPDF, PyPDF2 - pdfplumber would spend
+                               the budget on a few pages
+        text                   PyMuPDF, pdfplumber, PyPDF2
+    """
+    if available is None:
+        available = available_pdf_engines()
+    if probe['encrypted']:
+        route, engines = 'encrypted', ('PyMuPDF', 'pdfplumber')
+    elif probe['text_layer'] == 'no':
+        route, engines = 'image' if probe['images'] else 'no-text', tuple(PDF_ENGINES)
+    elif (probe['page_estimate'] or 0) > PDF_PLUMBER_MAX_PAGES:
+        route, engines = 'long', ('PyMuPDF', 'PyPDF2')
+    else:
+        route, engines = 'text', tuple(PDF_ENGINES)
+    engines = tuple(engine for engine in engines if engine in available)
+    if route in ('image', 'no-text'):
+        engines = engines[:1]
+    return route, engines
+
+def read_pdf_pages(pages, engine: str, deadline: float = None) -> tuple:
+    """
+    Join the text of a (page_index, page_count, page_text) generator,
+    stopping after PDF_MAX_PAGES pages, PDF_MAX_CHARS characters or at the
+    perf_counter() deadline. Pages past the limit are never extracted.
+    Returns (text, pages_read, page_count, timed_out).
+    The deadline is checked between pages: the engines extract a page in
+    one uninterruptible call, so a single slow page can overrun it; the
+    worker pool's timeout is the hard stop for that.
+    """
+    parts = []
+    chars = 0
+    pages_read = page_count = 0
+    slowest_page_ms = 0.0
+    timed_out = False
     
-    # ══════════════════════════════════════════════════════════════
-    # METHOD 3: PyPDF2 - Last resort
-    # ══════════════════════════════════════════════════════════════
     try:
-        from PyPDF2 import PdfReader
-        reader = PdfReader(file_path)
-        text = ""
-        for page in reader.pages:
-            page_text = page.extract_text()
+        page_start = time.perf_counter()
+        for page_index, page_count, page_text in pages:
+            page_end = time.perf_counter()
+            page_ms = (page_end - page_start) * 1000
+            slowest_page_ms = max(slowest_page_ms, page_ms)
+            logger.debug(f"📄 {engine} page {page_index + 1}/{page_count}: {len(page_text or '')} chars in {page_ms:.1f}ms")
+            
             if page_text:
-                text += page_text + "\n"
-        
-        if len(text.strip()) > 50:
-            logger.info(f"✅ PyPDF2 extracted {len(text)} chars")
-            text = clean_extracted_text(text)
-            return text.strip()
-    except Exception as e:
-        logger.warning(f"⚠️ PyPDF2 failed: {e}")
+                parts.append(page_text + "\n")
+                chars += len(page_text) + 1
+            pages_read = page_index + 1
+            
+            if pages_read < page_count and (pages_read >= PDF_MAX_PAGES or chars >= PDF_MAX_CHARS):
+                logger.info(f"✂️ {engine} stopped after {pages_read}/{page_count} pages ({chars} chars)")
+                break
+            if pages_read < page_count and deadline is not None and page_end > deadline:
+                logger.warning(f"⏱️ {engine} out of time after {pages_read}/{page_count} pages ({chars} chars)")
+                timed_out = True
+                break
+            page_start = time.perf_counter()
+    finally:
+        # Closes the document even when we stop early
+        pages.close()
+    
+    text = "".join(parts)
+    if len(text.strip()) > PDF_MIN_CHARS:
+        logger.info(
+            f"✅ {engine} extracted {len(text)} chars from {pages_read}/{page_count} pages "
+            f"(slowest page {slowest_page_ms:.1f}ms)"
+        )
+    return text, pages_read, page_count, timed_out
+
+def _clean_pdf_text(text: str, report: dict = None) -> str:
+    with stage(report, 'clean_extracted_text'):
+        return clean_extracted_text(text).strip()
+
+def parse_pdf(source: Union[bytes, str], report: dict = None) -> str:
+    """
+    Production-grade PDF text extraction for resumes
+    Uses PyMuPDF (fitz) - industry standard for resume parsing
+    A byte-level probe picks the route (see plan_pdf_engines); the next
+    engine only runs when one fails, runs out of its time budget, or finds
+    little text in a PDF the probe says has a text layer. A PDF without a
+    text layer gets a single read by the best engine. Every engine reads the same in-memory buffer,
+    page by page, up to PDF_MAX_PAGES / PDF_MAX_CHARS.
+    When given, report is filled with the probe, route, per-engine attempts
+    and the clean_extracted_text time.
+    """
+    content = read_document(source)
+    probe = probe_pdf(content)
+    route, engines = plan_pdf_engines(probe)
+    attempts = []
+    if report is not None:
+        report.update(probe=probe, route=route, engine=None, attempts=attempts)
+    
+    # A completed read with little text is final unless the probe saw fonts,
+    # in which case one other engine gets a second look
+    reads_allowed = 2 if probe['text_layer'] == 'yes' else 1
+    reads = 0
+    # Longest text any engine produced, for the limited-text fallback
+    best_text = ""
+    
+    for engine in engines:
+        start = time.perf_counter()
+        attempt = {'engine': engine, 'outcome': 'error', 'ms': 0.0, 'pages': 0, 'page_count': 0, 'chars': 0}
+        attempts.append(attempt)
+        try:
+            text, attempt['pages'], attempt['page_count'], timed_out = read_pdf_pages(
+                PDF_ENGINES[engine](content), engine, deadline=start + PDF_ENGINE_BUDGET_SECONDS
+            )
+            attempt['chars'] = len(text)
+            if len(text.strip()) > PDF_MIN_CHARS:
+                # Clean up the text
+                attempt['outcome'] = 'ok'
+                if report is not None:
+                    report['engine'] = engine
+                return _clean_pdf_text(text, report)
+            best_text = max(best_text, text, key=len)
+            if timed_out:
+                attempt['outcome'] = 'timeout'
+            else:
+                attempt['outcome'] = 'short'
+                reads += 1
+                if reads >= reads_allowed:
+                    break
+        except ImportError:
+            attempt['outcome'] = 'unavailable'
+            logger.warning(f"⚠️ {engine} not installed, trying fallback...")
+        except Exception as e:
+            logger.warning(f"⚠️ {engine} failed: {e}")
+        finally:
+            attempt['ms'] = round((time.perf_counter() - start) * 1000, 3)
     
     # ══════════════════════════════════════════════════════════════
     # FALLBACK: Return whatever we got or error
     # ══════════════════════════════════════════════════════════════
-    if len(text.strip()) > 0:
-        logger.warning(f"⚠️ Limited text extracted: {len(text)} chars")
-        return clean_extracted_text(text).strip()
+    if len(best_text.strip()) > 0:
+        logger.warning(f"⚠️ Limited text extracted ({route} PDF): {len(best_text)} chars")
+        return _clean_pdf_text(best_text, report)
     else:
-        logger.error("❌ All PDF extraction methods failed")
+        logger.error(f"❌ All PDF extraction methods failed ({route} PDF, tried {', '.join(a['engine'] for a in attempts)})")
         raise Exception("Unable to extract text from PDF. The file may be corrupted or image-based.")
 
 
@@ -266,8 +324,10 @@ def clean_extracted_text(text: str) -> str:
     
     return text
 
-def parse_docx(file_path: str) -> str:
-    doc = Document(file_path)
+def parse_docx(source: Union[bytes, str]) -> str:
+    from docx import Document
+
+    doc = Document(io.BytesIO(read_document(source)))
     text = "\n".join([para.text for para in doc.paragraphs])
     return text.strip()
 
@@ -276,220 +336,173 @@ def extract_skills(text: str) -> list:
     Intelligent skill extraction with fuzzy matching and context awareness
     Enhanced to catch more variations
     """
-    import re
-    
     text_lower = text.lower()
-    found_skills = set()  # Use set to avoid duplicates
+    # One taxonomy for the whole call, even if a reload swaps it meanwhile
+    taxonomy = get_taxonomy()
+    # Method 1 + 2: Canonical skills and their variations/acronyms, matched in a
+    # single pass with the trie of the compiled taxonomy
+    found_skills = taxonomy.matcher.match(text_lower)
+
+    # Method 3-5: parents of found frameworks/libraries, canonical names
+    # (React.js → React), then implied languages (React → JavaScript)
+    found_skills = taxonomy.expand(found_skills, text_lower)
+
+    # Convert back to sorted list
+    return sorted(list(found_skills))
+
+# ═══════════════════════════════════════════════════════════
+# ATS SCORING VOCABULARY (compiled once at startup)
+# ═══════════════════════════════════════════════════════════
+ATS_LOCATION_WORDS = ['city', 'state', 'country', 'address', 'location', 'remote']
+ATS_LINK_TERMS = ['linkedin.com', 'github.com', 'portfolio', 'website']
+ATS_REQUIRED_SECTIONS = ['experience', 'education', 'skills']
+ATS_OPTIONAL_SECTIONS = ['summary', 'projects', 'certifications', 'achievements', 'objective']
+ATS_ACTION_VERBS = [
+    'developed', 'managed', 'led', 'created', 'implemented', 'designed', 
+    'built', 'improved', 'optimized', 'analyzed', 'increased', 'reduced',
+    'launched', 'delivered', 'achieved', 'spearheaded', 'collaborated',
+    'engineered', 'architected', 'automated'
+]
+ATS_JOB_TITLES = ['engineer', 'developer', 'manager', 'lead', 'senior', 'architect', 'analyst', 'consultant', 'specialist']
+ATS_DEGREES = ['bachelor', 'master', 'phd', 'mba', 'b.tech', 'm.tech', 'b.s.', 'm.s.', 'associate']
+ATS_CERTIFICATIONS = ['certified', 'certification', 'aws certified', 'google cloud', 'microsoft certified', 'pmp', 'cfa']
+ATS_UNIVERSITIES = ['university', 'college', 'institute', 'academy']
+# Industry keywords (software/tech focused)
+ATS_INDUSTRY_KEYWORDS = [
+    'software', 'development', 'engineering', 'agile', 'scrum', 'api',
+    'database', 'cloud', 'deployment', 'testing', 'debugging', 'version control',
+    'collaboration', 'problem solving', 'scalability', 'performance'
+]
+ATS_SOFT_SKILLS = ['communication', 'leadership', 'teamwork', 'creative', 'organized', 'motivated']
+ATS_HOT_SKILLS = ['python', 'react', 'aws', 'docker', 'kubernetes', 'machine learning', 'ai', 'node.js', 'typescript']
+
+# Every literal the scorer tests, each searched exactly once per resume
+ATS_LITERAL_TERMS = tuple(dict.fromkeys(
+    ATS_LOCATION_WORDS + ATS_LINK_TERMS + ATS_REQUIRED_SECTIONS + ATS_OPTIONAL_SECTIONS +
+    ATS_ACTION_VERBS + ATS_JOB_TITLES + ATS_DEGREES + ATS_CERTIFICATIONS +
+    ATS_UNIVERSITIES + ATS_INDUSTRY_KEYWORDS + ['present', 'current']
+))
+
+ATS_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+ATS_PHONE_RE = re.compile(r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]')
+ATS_LOCATION_RE = re.compile(r'\b(city|state|country|address|location|remote)\b')
+# Proper date formatting (MM/YYYY or Month YYYY)
+ATS_DATE_RES = [
+    re.compile(r'\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{4}\b'),
+    re.compile(r'\b\d{1,2}/\d{4}\b'),
+    re.compile(r'\b\d{4}\s*-\s*\d{4}\b')
+]
+ATS_PRESENT_RE = re.compile(r'\b(present|current)\b')
+# Quantified achievements (numbers = impact):
+# \b\d+%|\b\d+\+|\b\d+ (users|customers|projects|teams|million|thousand)\b
+ATS_QUANTITY_UNITS = ['users', 'customers', 'projects', 'teams', 'million', 'thousand']
+
+@lru_cache(maxsize=4096)
+def _skill_flags(skill_lower: str) -> tuple:
+    """
+    (is_soft_skill, is_hot_skill) for a lowercased skill name
+    """
+    return (
+        any(soft in skill_lower for soft in ATS_SOFT_SKILLS),
+        any(hot in skill_lower for hot in ATS_HOT_SKILLS)
+    )
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+def _count_quantified(text_lower: str) -> int:
+    """
+    Number of matches of the quantified-achievement pattern.
+    Every match is a whole digit run followed by '%', '+' or ' <unit>', so we
+    find those suffixes with str.find and check the digits in front of them,
+    instead of running a regex that has to try every character.
+    """
+    suffixes = []
+    for marker in ('%', '+'):
+        i = text_lower.find(marker)
+        while i != -1:
+            suffixes.append(i)
+            i = text_lower.find(marker, i + 1)
+    n = len(text_lower)
+    for unit in ATS_QUANTITY_UNITS:
+        needle = ' ' + unit
+        i = text_lower.find(needle)
+        while i != -1:
+            end = i + len(needle)
+            if end == n or not _is_word_char(text_lower[end]):
+                suffixes.append(i)
+            i = text_lower.find(needle, i + 1)
+    
+    # A digit run matches at most once, whichever suffix follows it
+    runs = set()
+    for i in suffixes:
+        start = i
+        while start > 0 and text_lower[start - 1].isdecimal():
+            start -= 1
+        if start < i and (start == 0 or not _is_word_char(text_lower[start - 1])):
+            runs.add(start)
+    return len(runs)
+
+def _experience_span(text_lower: str):
+    """
+    (start, end) of what r'experience.*?(?=education|skills|$)' (DOTALL) matches,
+    found with str.find instead of a lazy regex
+    """
+    start = text_lower.find('experience')
+    if start == -1:
+        return None
+    body = start + len('experience')
+    
+    ends = [i for i in (text_lower.find('education', body), text_lower.find('skills', body)) if i != -1]
+    # '$' also matches just before a trailing newline
+    if text_lower.endswith('\n') and len(text_lower) - 1 >= body:
+        ends.append(len(text_lower) - 1)
+    else:
+        ends.append(len(text_lower))
+    return start, min(ends)
+
+def scan_ats_features(text: str, text_lower: str) -> dict:
+    """
+    Collect every text-derived flag and counter calculate_ats_score needs.
+    Each vocabulary term is searched once; regexes are precompiled and only
+    run when a cheap literal check says they can match.
+    """
+    present = {term for term in ATS_LITERAL_TERMS if term in text_lower}
     
-    # Method 1: Case-insensitive substring matching (more lenient)
-    for skill in SKILLS:
-        skill_lower = skill.lower()
-        
-        # For single-letter or very short skills (C, C++, R), use strict word boundaries
-        if len(skill_lower.replace('+', '').replace('#', '').replace('.', '')) <= 2:
-            pattern = r'\b' + re.escape(skill_lower) + r'\b'
-        else:
-            # For longer skills, use more flexible matching
-            # Match if skill appears as whole word OR with common separators
-            skill_pattern = re.escape(skill_lower).replace(r'\ ', r'[\s\-\_]*')
-            pattern = r'(?:^|[\s,\.\-\(\)\[\]\{\}])' + skill_pattern + r'(?:$|[\s,\.\-\(\)\[\]\{\}])'
-        
-        if re.search(pattern, text_lower):
-            found_skills.add(skill)
-    
-    # Method 2: Common skill variations and acronyms (expanded)
-    # All variations map to CANONICAL names (without .js suffix)
-    variations = {
-        'javascript': 'JavaScript',
-        'java script': 'JavaScript',
-        'js': 'JavaScript',
-        'typescript': 'TypeScript',
-        'type script': 'TypeScript',
-        'ts': 'TypeScript',
-        'nodejs': 'Node.js',
-        'node js': 'Node.js',
-        'node': 'Node.js',
-        'reactjs': 'React',
-        'react js': 'React',
-        'react.js': 'React',
-        'react native': 'React Native',
-        'vuejs': 'Vue',
-        'vue js': 'Vue',
-        'vue.js': 'Vue',
-        'vue': 'Vue',
-        'angular': 'Angular',
-        'angularjs': 'Angular',
-        'nextjs': 'Next.js',
-        'next js': 'Next.js',
-        'next.js': 'Next.js',
-        'expressjs': 'Express',
-        'express js': 'Express',
-        'express.js': 'Express',
-        'nestjs': 'Nest.js',
-        'nest js': 'Nest.js',
-        'nest.js': 'Nest.js',
-        'k8s': 'Kubernetes',
-        'eks': 'AWS EKS',
-        'ecs': 'AWS ECS',
-        'ec2': 'AWS EC2',
-        's3': 'AWS S3',
-        'lambda': 'AWS Lambda',
-        'rds': 'AWS RDS',
-        'postgresql': 'PostgreSQL',
-        'postgres': 'PostgreSQL',
-        'mongo': 'MongoDB',
-        'mongodb': 'MongoDB',
-        'mysql': 'MySQL',
-        'mssql': 'Microsoft SQL Server',
-        'sql server': 'Microsoft SQL Server',
-        'ci/cd': 'CI/CD',
-        'cicd': 'CI/CD',
-        'ml': 'Machine Learning',
-        'ai': 'Artificial Intelligence',
-        'nlp': 'Natural Language Processing',
-        'dl': 'Deep Learning',
-        'tf': 'TensorFlow',
-        'tensorflow': 'TensorFlow',
-        'pytorch': 'PyTorch',
-        'sklearn': 'Scikit-learn',
-        'scikit-learn': 'Scikit-learn',
-        'scikit learn': 'Scikit-learn',
-        'restful': 'REST API',
-        'rest api': 'REST API',
-        'rest': 'REST API',
-        'graphql': 'GraphQL',
-        'graph ql': 'GraphQL',
-        'oauth': 'OAuth',
-        'jwt': 'JWT',
-        'sso': 'SSO',
-        'tdd': 'Test-Driven Development',
-        'bdd': 'Behavior-Driven Development',
-        'oop': 'Object-Oriented Programming',
-        'aws': 'AWS',
-        'amazon web services': 'AWS',
-        'gcp': 'Google Cloud',
-        'google cloud platform': 'Google Cloud',
-        'azure': 'Azure',
-        'microsoft azure': 'Azure',
-        'docker': 'Docker',
-        'kubernetes': 'Kubernetes',
-        'git': 'Git',
-        'github': 'GitHub',
-        'gitlab': 'GitLab',
-        'tailwind': 'Tailwind CSS',
-        'tailwindcss': 'Tailwind CSS',
-        'bootstrap': 'Bootstrap',
-        'material ui': 'Material-UI',
-        'mui': 'Material-UI',
-        'html5': 'HTML5',
-        'html': 'HTML',
-        'css3': 'CSS3',
-        'css': 'CSS',
-        'sass': 'Sass',
-        'scss': 'SCSS',
-        'redux': 'Redux',
-        'mobx': 'MobX',
-        'webpack': 'Webpack',
-        'vite': 'Vite',
-        'babel': 'Babel',
-        'jest': 'Jest',
-        'mocha': 'Mocha',
-        'chai': 'Chai',
-        'cypress': 'Cypress',
-        'selenium': 'Selenium',
-        'postman': 'Postman',
-        'django': 'Django',
-        'flask': 'Flask',
-        'fastapi': 'FastAPI',
-        'spring': 'Spring',
-        'spring boot': 'Spring Boot',
-        'hibernate': 'Hibernate',
-        'laravel': 'Laravel',
-        'symfony': 'Symfony',
-        'rails': 'Ruby on Rails',
-        'ruby on rails': 'Ruby on Rails',
-        'asp.net': 'ASP.NET',
-        'dotnet': '.NET Core',
-        '.net': '.NET Framework',
-        'redis': 'Redis',
-        'elasticsearch': 'Elasticsearch',
-        'kafka': 'Kafka',
-        'rabbitmq': 'RabbitMQ',
-        'nginx': 'Nginx',
-        'apache': 'Apache'
-    }
+    has_dates = any(p.search(text_lower) for p in ATS_DATE_RES) or (
+        ('present' in present or 'current' in present) and bool(ATS_PRESENT_RE.search(text_lower))
+    )
     
-    for variant, canonical in variations.items():
-        # Use word boundaries for variations too
-        pattern = r'(?:^|[\s,\.\-\(\)\[\]\{\}])' + re.escape(variant) + r'(?:$|[\s,\.\-\(\)\[\]\{\}])'
-        if re.search(pattern, text_lower):
-            found_skills.add(canonical)
-    
-    # Method 3: Framework/library pairs (add parent if child is found)
-    framework_pairs = {
-        'React': ['Redux', 'React Native', 'Next.js'],
-        'Angular': ['RxJS', 'NgRx', 'AngularJS'],
-        'Vue': ['Vuex', 'Nuxt.js', 'Pinia'],
-        'Node.js': ['Express', 'Nest.js', 'Fastify'],
-        'Python': ['Django', 'Flask', 'FastAPI', 'Pandas', 'NumPy', 'PyTorch', 'TensorFlow'],
-        'Java': ['Spring', 'Spring Boot', 'Hibernate', 'Maven', 'Gradle'],
-        'JavaScript': ['React', 'Angular', 'Vue', 'Node.js', 'Express', 'TypeScript'],
-        'AWS': ['AWS Lambda', 'AWS EC2', 'AWS S3', 'AWS EKS', 'AWS RDS'],
-        'Machine Learning': ['TensorFlow', 'PyTorch', 'Keras', 'Scikit-learn', 'XGBoost'],
-        'Docker': ['Kubernetes', 'Docker Compose'],
-        'Database': ['MongoDB', 'PostgreSQL', 'MySQL', 'Redis', 'Elasticsearch']
+    return {
+        'has_email': '@' in text and bool(ATS_EMAIL_RE.search(text)),
+        'has_phone': bool(ATS_PHONE_RE.search(text)),
+        'has_location': any(w in present for w in ATS_LOCATION_WORDS) and bool(ATS_LOCATION_RE.search(text_lower)),
+        'has_linkedin': any(t in present for t in ATS_LINK_TERMS),
+        'required_found': sum(1 for s in ATS_REQUIRED_SECTIONS if s in present),
+        'optional_found': sum(1 for s in ATS_OPTIONAL_SECTIONS if s in present),
+        'has_dates': has_dates,
+        'experience_span': _experience_span(text_lower) if 'experience' in present else None,
+        'action_count': sum(text_lower.count(verb) for verb in ATS_ACTION_VERBS if verb in present),
+        'quantified_count': _count_quantified(text_lower),
+        'title_count': sum(1 for title in ATS_JOB_TITLES if title in present),
+        'has_degree': any(degree in present for degree in ATS_DEGREES),
+        'has_cert': any(cert in present for cert in ATS_CERTIFICATIONS),
+        'has_institution': any(uni in present for uni in ATS_UNIVERSITIES),
+        'keyword_matches': sum(1 for kw in ATS_INDUSTRY_KEYWORDS if kw in present)
     }
-    
-    for parent, children in framework_pairs.items():
-        for child in children:
-            if child in found_skills or child.lower() in text_lower:
-                found_skills.add(parent)
-                break
-    
-    # Method 4: Remove redundant/duplicate entries & normalize names
-    # Normalize to canonical names (remove .js suffix for consistency)
-    normalized_skills = set()
-    for skill in found_skills:
-        # Normalize React.js → React, Vue.js → Vue, etc.
-        if skill == 'React.js':
-            normalized_skills.add('React')
-        elif skill == 'Vue.js':
-            normalized_skills.add('Vue')
-        elif skill == 'Next.js':
-            normalized_skills.add('Next.js')  # Keep Next.js as is
-        elif skill == 'Nest.js':
-            normalized_skills.add('Nest.js')  # Keep Nest.js as is
-        elif skill == 'Express.js':
-            normalized_skills.add('Express')
-        else:
-            normalized_skills.add(skill)
-    
-    found_skills = normalized_skills
-    
-    # Method 5: Add common implied skills
-    # If has "React" and "JavaScript" not found, add it
-    if any(fw in found_skills for fw in ['React', 'Angular', 'Vue.js', 'Express', 'Node.js']):
-        found_skills.add('JavaScript')
-    
-    if any(fw in found_skills for fw in ['Django', 'Flask', 'FastAPI', 'Pandas', 'NumPy']):
-        found_skills.add('Python')
-    
-    if any(fw in found_skills for fw in ['Spring', 'Spring Boot', 'Hibernate']):
-        found_skills.add('Java')
-    
-    # Convert back to sorted list
-    return sorted(list(found_skills))
 
 def calculate_ats_score(text: str, skills: list) -> dict:
     """
     Industry-Standard ATS Scoring (Based on Real ATS Systems)
     Mirrors scoring logic from Taleo, Greenhouse, Workday, Lever
     """
-    import re
-    
     text_lower = text.lower()
     word_count = len(text.split())
     skill_count = len(skills)
+    skills_lower = [skill.lower() for skill in skills]
+    
+    # All text-derived signals in one scan
+    found = scan_ats_features(text, text_lower)
     
     # Initialize score components (total 100 points)
     scores = {
@@ -504,14 +517,10 @@ def calculate_ats_score(text: str, skills: list) -> dict:
     # ═══════════════════════════════════════════════════════════
     # 1️⃣ CONTACT INFORMATION (15 points) - Critical for ATS
     # ═══════════════════════════════════════════════════════════
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    phone_pattern = r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]'
-    linkedin_pattern = r'(linkedin\.com|github\.com|portfolio|website)'
-    
-    has_email = bool(re.search(email_pattern, text))
-    has_phone = bool(re.search(phone_pattern, text))
-    has_location = bool(re.search(r'\b(city|state|country|address|location|remote)\b', text_lower))
-    has_linkedin = bool(re.search(linkedin_pattern, text_lower))
+    has_email = found['has_email']
+    has_phone = found['has_phone']
+    has_location = found['has_location']
+    has_linkedin = found['has_linkedin']
     
     contact_score = 0
     contact_score += 6 if has_email else 0      # Email is mandatory
@@ -531,23 +540,14 @@ def calculate_ats_score(text: str, skills: list) -> dict:
     format_score = 0
     
     # Section headers (standard ATS sections)
-    required_sections = ['experience', 'education', 'skills']
-    optional_sections = ['summary', 'projects', 'certifications', 'achievements', 'objective']
-    
-    required_found = sum(1 for s in required_sections if s in text_lower)
-    optional_found = sum(1 for s in optional_sections if s in text_lower)
+    required_found = found['required_found']
+    optional_found = found['optional_found']
     
     format_score += required_found * 4  # 4 pts each required section (max 12)
     format_score += min(optional_found * 2, 4)  # 2 pts each optional (max 4)
     
     # Proper date formatting (MM/YYYY or Month YYYY)
-    date_patterns = [
-        r'\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{4}\b',
-        r'\b\d{1,2}/\d{4}\b',
-        r'\b\d{4}\s*-\s*\d{4}\b',
-        r'\b(present|current)\b'
-    ]
-    has_dates = any(re.search(pattern, text_lower) for pattern in date_patterns)
+    has_dates = found['has_dates']
     format_score += 4 if has_dates else 0
     
     scores['formatting'] = min(format_score, 20)
@@ -574,22 +574,20 @@ def calculate_ats_score(text: str, skills: list) -> dict:
     
     # Skill context bonus (skills mentioned in experience section)
     experience_section = ''
-    exp_match = re.search(r'experience.*?(?=education|skills|$)', text_lower, re.DOTALL)
+    exp_match = found['experience_span']
     if exp_match:
-        experience_section = exp_match.group()
-        skills_in_context = sum(1 for skill in skills if skill.lower() in experience_section)
+        experience_section = text_lower[exp_match[0]:exp_match[1]]
+        skills_in_context = sum(1 for skill in skills_lower if skill in experience_section)
         context_bonus = min(skills_in_context * 0.3, 3)  # Max 3 bonus points
         skill_score += context_bonus
     
     # Penalty for too many generic soft skills
-    soft_skills = ['communication', 'leadership', 'teamwork', 'creative', 'organized', 'motivated']
-    soft_skill_count = sum(1 for s in skills if any(soft in s.lower() for soft in soft_skills))
+    soft_skill_count = sum(1 for s in skills_lower if _skill_flags(s)[0])
     if soft_skill_count > skill_count * 0.4:  # More than 40% soft skills
         skill_score -= 2
     
     # Bonus for in-demand tech skills
-    hot_skills = ['python', 'react', 'aws', 'docker', 'kubernetes', 'machine learning', 'ai', 'node.js', 'typescript']
-    hot_skill_count = sum(1 for s in skills if any(hot in s.lower() for hot in hot_skills))
+    hot_skill_count = sum(1 for s in skills_lower if _skill_flags(s)[1])
     if hot_skill_count >= 3:
         skill_score += 2
     
@@ -601,13 +599,7 @@ def calculate_ats_score(text: str, skills: list) -> dict:
     exp_score = 0
     
     # Action verbs (ATS scans for achievement indicators)
-    action_verbs = [
-        'developed', 'managed', 'led', 'created', 'implemented', 'designed', 
-        'built', 'improved', 'optimized', 'analyzed', 'increased', 'reduced',
-        'launched', 'delivered', 'achieved', 'spearheaded', 'collaborated',
-        'engineered', 'architected', 'automated'
-    ]
-    action_count = sum(text_lower.count(verb) for verb in action_verbs)
+    action_count = found['action_count']
     
     # Tiered scoring based on action verb density
     if action_count >= 15:
@@ -620,13 +612,11 @@ def calculate_ats_score(text: str, skills: list) -> dict:
         exp_score += 1
     
     # Quantified achievements (numbers = impact)
-    numbers_pattern = r'\b\d+%|\b\d+\+|\b\d+ (users|customers|projects|teams|million|thousand)\b'
-    quantified_count = len(re.findall(numbers_pattern, text_lower))
+    quantified_count = found['quantified_count']
     exp_score += min(quantified_count * 2, 6)  # Max 6 points
     
     # Job titles/roles (career progression)
-    job_titles = ['engineer', 'developer', 'manager', 'lead', 'senior', 'architect', 'analyst', 'consultant', 'specialist']
-    title_count = sum(1 for title in job_titles if title in text_lower)
+    title_count = found['title_count']
     exp_score += min(title_count * 2, 6)  # Max 6 points
     
     scores['experience'] = min(exp_score, 20)
@@ -636,14 +626,9 @@ def calculate_ats_score(text: str, skills: list) -> dict:
     # ═══════════════════════════════════════════════════════════
     edu_score = 0
     
-    degrees = ['bachelor', 'master', 'phd', 'mba', 'b.tech', 'm.tech', 'b.s.', 'm.s.', 'associate']
-    has_degree = any(degree in text_lower for degree in degrees)
-    
-    certifications = ['certified', 'certification', 'aws certified', 'google cloud', 'microsoft certified', 'pmp', 'cfa']
-    has_cert = any(cert in text_lower for cert in certifications)
-    
-    universities = ['university', 'college', 'institute', 'academy']
-    has_institution = any(uni in text_lower for uni in universities)
+    has_degree = found['has_degree']
+    has_cert = found['has_cert']
+    has_institution = found['has_institution']
     
     edu_score += 6 if has_degree else 2  # Degree strongly preferred
     edu_score += 3 if has_cert else 0    # Certifications valuable
@@ -656,13 +641,7 @@ def calculate_ats_score(text: str, skills: list) -> dict:
     # ═══════════════════════════════════════════════════════════
     keyword_score = 0
     
-    # Industry keywords (software/tech focused)
-    industry_keywords = [
-        'software', 'development', 'engineering', 'agile', 'scrum', 'api',
-        'database', 'cloud', 'deployment', 'testing', 'debugging', 'version control',
-        'collaboration', 'problem solving', 'scalability', 'performance'
-    ]
-    keyword_matches = sum(1 for kw in industry_keywords if kw in text_lower)
+    keyword_matches = found['keyword_matches']
     keyword_score = min(keyword_matches * 0.8, 10)  # Max 10 points
     
     scores['keywords'] = keyword_score
@@ -803,6 +782,200 @@ def calculate_ats_score(text: str, skills: list) -> dict:
         'recommendations': recommendations
     }
 
+# Part of every response cache key: bump it with any change to what
+# /parse-resume returns for the same bytes (scoring code, vocabularies, PDF
+# extraction, library upgrades). The skill taxonomy can change at runtime,
+# so its key (source and compiler) joins each cache key instead.
+SCORING_VERSION = "2"
+
+def response_cache_key(content: bytes, filename: str, taxonomy_key: str) -> tuple:
+    """
+    Everything that shapes a /parse-resume response: the bytes, the parser
+    the extension selects, the scoring version and the skill taxonomy build
+    """
+    return (content_hash(content), os.path.splitext(filename)[1], SCORING_VERSION, taxonomy_key)
+
+# Repeat uploads of the same file are served from memory
+response_cache = ResponseCache(
+    max_entries=int(os.getenv("PARSE_CACHE_MAX_ENTRIES", "256")),
+    ttl_seconds=float(os.getenv("PARSE_CACHE_TTL_SECONDS", "3600")),
+    max_bytes=int(os.getenv("PARSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+)
+
+# On-demand profiling of /parse-resume: requests carrying X-Profile plus the
+# admin token, and a random PROFILE_SAMPLE_RATE share of traffic
+PROFILE_ADMIN_TOKEN = os.getenv("PROFILE_ADMIN_TOKEN") or None
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "2")) / 1000
+# X-Profile values that request a profile (see parse_resume)
+PROFILE_HEADER_VALUES = ('1', 'attach')
+profile_ring = ProfileRing(max_profiles=int(os.getenv("PROFILE_RING_SIZE", "50")))
+
+# Per-engine PDF extraction outcomes, collected from every worker
+pdf_engine_stats = EngineStats()
+
+# CPU-bound parsing/scoring runs here so the event loop stays responsive
+pipeline_pool = WorkerPool.from_env()
+
+# Async jobs (/jobs) get their own workers (JOB_EXECUTOR, JOB_WORKERS, ...),
+# so a queued batch never sits in front of interactive requests
+job_pool = WorkerPool.from_env('JOB', default_workers=2, default_timeout=600)
+
+# Prometheus metrics for /metrics. Worker-side stages are timed into the
+# extraction report and observed here, where the registry lives.
+EXTRACTION_SECONDS = metrics_registry.histogram(
+    'ml_extraction_duration_seconds', 'Document text extraction time per engine attempt', ('engine', 'outcome')
+)
+DOCUMENT_BYTES = metrics_registry.histogram(
+    'ml_document_size_bytes', 'Size of uploaded resumes', ('type',),
+    buckets=(10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 2_500_000, 5_000_000, 10_000_000, 50_000_000)
+)
+DOCUMENT_PAGES = metrics_registry.histogram(
+    'ml_document_pages', 'Page count of parsed PDF resumes',
+    buckets=(1, 2, 3, 4, 5, 10, 20, 50, 100, 500)
+)
+# Series bound once, so the request path pays only for observe()
+UPLOAD_READ_SECONDS = STAGE_SECONDS.labels('upload_read')
+PIPELINE_SECONDS = STAGE_SECONDS.labels('pipeline')
+SERIALIZATION_SECONDS = STAGE_SECONDS.labels('serialization')
+COALESCED_UPLOADS = metrics_registry.counter(
+    'ml_coalesced_uploads', 'Uploads served by joining an in-flight analysis of identical content'
+)
+
+# Identical uploads arriving while the first is still being analyzed wait for it
+upload_flights = SingleFlight(on_join=COALESCED_UPLOADS.inc)
+
+REQUESTS_IN_FLIGHT = metrics_registry.gauge('ml_requests_in_flight', 'HTTP requests currently being handled')
+metrics_registry.gauge(
+    'ml_pipeline_queue_depth', 'Jobs admitted to the pipeline pool and not yet finished',
+    function=lambda: pipeline_pool.stats()['pending']
+)
+
+def observe_pipeline_report(report: dict):
+    """
+    Record the stage timings, engine attempts and page count of one analysis
+    """
+    if not report:
+        return
+    for stage_name, seconds in report.get('stages', {}).items():
+        STAGE_SECONDS.labels(stage_name).observe(seconds)
+    if 'parse_docx' in report.get('stages', {}):
+        EXTRACTION_SECONDS.labels('python-docx', 'ok').observe(report['stages']['parse_docx'])
+    for attempt in report.get('attempts', ()):
+        EXTRACTION_SECONDS.labels(attempt['engine'], attempt['outcome']).observe(attempt['ms'] / 1000)
+    page_counts = [attempt['page_count'] for attempt in report.get('attempts', ()) if attempt.get('page_count')]
+    if page_counts:
+        DOCUMENT_PAGES.observe(page_counts[-1])
+
+class InFlightMiddleware:
+    """
+    Plain ASGI middleware keeping ml_requests_in_flight current, streamed bodies included
+    """
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+
+app.add_middleware(InFlightMiddleware)
+
+def json_response(content: dict) -> JSONResponse:
+    """
+    The JSONResponse FastAPI would build, with the serialization timed
+    """
+    start = time.perf_counter()
+    response = JSONResponse(content=jsonable_encoder(content))
+    SERIALIZATION_SECONDS.observe(time.perf_counter() - start)
+    return response
+
+class ResumeContentError(ValueError):
+    """
+    Raised by the pipeline when a file parses but is unusable (mapped to HTTP 400)
+    """
+
+def analyze_resume(content: bytes, filename: str, report: dict = None) -> dict:
+    """
+    Full parse → skills → ATS score pipeline for one uploaded file.
+    Runs inside pipeline_pool, so it must stay a picklable module-level function.
+    Stage timings (seconds) go to report['stages'] when a report is given.
+    """
+    # Extract text straight from the uploaded bytes (no temp file)
+    if filename.endswith('.pdf'):
+        with stage(report, 'parse_pdf'):
+            text = parse_pdf(content, report)
+    else:
+        with stage(report, 'parse_docx'):
+            text = parse_docx(content)
+    
+    if len(text.strip()) < 50:
+        raise ResumeContentError("Resume content too short")
+    
+    # Log extracted text preview for debugging
+    logger.info(f"📄 Extracted text preview (first 500 chars):\n{text[:500]}...")
+    
+    # Extract skills
+    with stage(report, 'extract_skills'):
+        skills = extract_skills(text)
+    
+    # Log ALL detected skills for debugging
+    logger.info(f"🎯 FULL SKILL LIST ({len(skills)} total):")
+    logger.info(f"   {', '.join(sorted(skills))}")
+    
+    # Calculate ATS score
+    with stage(report, 'calculate_ats_score'):
+        ats_result = calculate_ats_score(text, skills)
+    
+    logger.info(f"✅ Parsed resume: {len(text)} chars, {len(skills)} skills, {ats_result['final_score']}% ATS ({ats_result['grade']})")
+    
+    return {
+        "success": True,
+        "data": {
+            "final_ats_score": ats_result['final_score'],
+            "ats_score": ats_result['final_score'],  # Duplicate for compatibility
+            "ats_grade": ats_result['grade'],
+            "ml_relevance_score": ats_result['final_score'],
+            "skill_match_score": min(len(skills) / 12 * 100, 100),  # Optimal: 12 skills
+            "extracted_skills": skills,
+            "skill_count": len(skills),
+            "word_count": ats_result['word_count'],
+            "score_breakdown": ats_result['breakdown'],
+            "raw_component_scores": ats_result['raw_scores'],
+            "quality_multiplier": ats_result['quality_multiplier'],
+            "parsed_data": {
+                "primary_info": {
+                    "name": "Extracted Name",
+                    "email": None,
+                    "phone": None
+                }
+            },
+            "skill_gaps": [],
+            "recommendations": ats_result['recommendations']
+        }
+    }
+
+def analyze_upload(content: bytes, filename: str, profile: bool = False) -> tuple:
+    """
+    Pool entry point: (analyze_resume result, extraction report).
+    The report rides back to this process, on the exception if the
+    pipeline fails, because worker processes keep no shared stats.
+    With profile=True the run is profiled into report['profile'].
+    report['taxonomy'] is the key of the skill taxonomy build it used.
+    """
+    report = {'taxonomy': get_taxonomy().key}
+    try:
+        with profiled(report, PROFILE_SAMPLE_INTERVAL) if profile else nullcontext():
+            result = analyze_resume(content, filename, report)
+        return result, report
+    except Exception as e:
+        e.extraction_report = report
+        raise
+
 @app.get("/")
 async def root():
     return {
@@ -815,80 +988,708 @@ async def root():
 async def health():
     return {"status": "healthy", "service": "ml-parser"}
 
+# Document libraries are imported on first use; warmup imports them at boot instead
+DOCUMENT_LIBRARIES = {
+    'pymupdf': 'fitz',
+    'pdfplumber': 'pdfplumber',
+    'pypdf2': 'PyPDF2',
+    'python-docx': 'docx'
+}
+
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "false").lower() in ("1", "true", "yes")
+
+# Registry models the 'deep' job workers load at warmup ('spacy/<name>' is a spaCy pipeline)
+WARMUP_MODELS = [
+    name.strip()
+    for name in os.getenv("WARMUP_MODELS", f"spacy/{NER_MODEL},{DEFAULT_SENTENCE_MODEL}").split(",")
+    if name.strip()
+]
+
+warmup_state = {
+    'status': 'pending' if WARMUP_ON_STARTUP else 'disabled',
+    'seconds': None,
+    'components': {},
+    'workers': 0,
+    'job_workers': 0,
+    'error': None
+}
+
+# Model load stats the job workers reported at warmup, per model
+warmed_models = {}
+
+def warm_document_libraries() -> dict:
+    """
+    Import every document library now; seconds per library (None if not installed)
+    """
+    timings = {}
+    for name, module in DOCUMENT_LIBRARIES.items():
+        start = time.perf_counter()
+        try:
+            importlib.import_module(module)
+            timings[name] = round(time.perf_counter() - start, 3)
+        except ImportError:
+            timings[name] = None
+    return timings
+
+def warm_job_worker() -> dict:
+    """
+    Document libraries plus WARMUP_MODELS in this worker. The registry is
+    per process, so its load stats ride back to be aggregated in /ready.
+    """
+    warm_document_libraries()
+    errors = {}
+    for name in WARMUP_MODELS:
+        try:
+            if name.startswith('spacy/'):
+                get_pipeline(name[len('spacy/'):])
+            else:
+                model_registry.get(name)
+        except Exception as e:
+            # Missing package or model files: deep jobs will fail on it, the rest still works
+            errors[name] = str(e)
+    return {'pid': os.getpid(), 'models': model_registry.stats(), 'errors': errors}
+
+def aggregate_model_stats(worker_reports: list) -> dict:
+    """
+    Per model: how many workers loaded it and their load times. A worker
+    that ran more than one warmup call is counted once.
+    """
+    models = {}
+    for report in {report['pid']: report for report in worker_reports}.values():
+        for name, stats in report['models'].items():
+            entry = models.setdefault(name, {'loaded': True, 'workers': 0, 'load_seconds': []})
+            entry['workers'] += 1
+            entry['load_seconds'].append(stats['load_seconds'])
+            for key in ('parameter_bytes', 'rss_delta_bytes'):
+                entry[key] = stats.get(key)
+        for name, error in report['errors'].items():
+            models.setdefault(name, {'loaded': False, 'workers': 0, 'load_seconds': []})['error'] = error
+    return models
+
+async def warmup():
+    """
+    Background warmup: libraries in this process first, so forked
+    workers inherit them, then start every pipeline worker and every
+    job worker, the latter with the models 'deep' jobs use
+    """
+    warmup_state['status'] = 'running'
+    start = time.perf_counter()
+    try:
+        warmup_state['components'] = await asyncio.to_thread(warm_document_libraries)
+        warmup_state['workers'] = len(await pipeline_pool.warmup(warm_document_libraries))
+        job_workers = await job_pool.warmup(warm_job_worker)
+        warmup_state['job_workers'] = len({report['pid'] for report in job_workers})
+        warmed_models.update(aggregate_model_stats(job_workers))
+        warmup_state['status'] = 'done'
+        logger.info(f"🔥 Warmup finished in {time.perf_counter() - start:.2f}s")
+    except Exception as e:
+        # Requests still work, they just load lazily
+        warmup_state['status'] = 'failed'
+        warmup_state['error'] = str(e)
+        logger.warning(f"⚠️ Warmup failed: {e}")
+    warmup_state['seconds'] = round(time.perf_counter() - start, 3)
+
+@app.on_event("startup")
+async def start_warmup():
+    if WARMUP_ON_STARTUP:
+        app.state.warmup_task = asyncio.create_task(warmup())
+
+@app.get("/ready")
+async def ready():
+    """
+    Readiness, separate from /health: 503 until the startup warmup
+    (if enabled) has finished, plus which components are loaded. Models
+    load in the job workers, so 'models' is what they reported at warmup
+    (empty without it: they then load lazily on a worker's first deep job).
+    """
+    is_ready = warmup_state['status'] not in ('pending', 'running')
+    components = {
+        name: {
+            'loaded': module in sys.modules,
+            'load_seconds': warmup_state['components'].get(name)
+        }
+        for name, module in DOCUMENT_LIBRARIES.items()
+    }
+    return JSONResponse(
+        status_code=200 if is_ready else 503,
+        content={
+            'ready': is_ready,
+            'warmup': warmup_state,
+            'components': components,
+            'models': warmed_models,
+            'pool': {'mode': pipeline_pool.stats()['mode'], 'workers_warmed': warmup_state['workers']},
+            'job_pool': {'mode': job_pool.stats()['mode'], 'workers_warmed': warmup_state['job_workers']}
+        }
+    )
+
+@app.get("/cache/stats")
+async def cache_stats():
+    return {**response_cache.stats(), "single_flight": upload_flights.stats(), "scoring_version": SCORING_VERSION}
+
+@app.get("/pool/stats")
+async def pool_stats():
+    return {**pipeline_pool.stats(), "bulk_concurrency": BULK_CONCURRENCY}
+
+@app.get("/metrics")
+async def metrics():
+    """
+    Prometheus text exposition of this process's metrics
+    """
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
+def require_profile_admin(token: Optional[str]):
+    if not is_profile_admin(token):
+        raise HTTPException(403, "A valid X-Profile-Token is required")
+
+@app.get("/profiles")
+async def list_profiles(x_profile_token: Optional[str] = Header(None)):
+    require_profile_admin(x_profile_token)
+    ids = await asyncio.to_thread(profile_ring.ids)
+    return {'profiles': ids[::-1], 'max_profiles': profile_ring.max_profiles, 'directory': profile_ring.directory}
+
+@app.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str, x_profile_token: Optional[str] = Header(None)):
+    """
+    One stored profile as a JSON attachment
+    """
+    require_profile_admin(x_profile_token)
+    try:
+        profile = await asyncio.to_thread(profile_ring.load, profile_id)
+    except KeyError:
+        raise HTTPException(404, f"Profile {profile_id} not found")
+    return JSONResponse(
+        content=profile,
+        headers={'Content-Disposition': f'attachment; filename="profile-{profile_id}.json"'}
+    )
+
+@app.get("/pdf/stats")
+async def pdf_stats():
+    return {**pdf_engine_stats.stats(), "engine_budget_seconds": PDF_ENGINE_BUDGET_SECONDS}
+
+@app.get("/taxonomy")
+async def taxonomy_info():
+    """
+    The skill taxonomy this process serves (workers reload on the same schedule)
+    """
+    return taxonomy_store.stats()
+
+@app.on_event("shutdown")
+def shutdown_pipeline_pool():
+    pipeline_pool.shutdown()
+    job_pool.shutdown()
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx')
+
+# Limits for /parse-resumes
+BULK_MAX_FILES = int(os.getenv("BULK_MAX_FILES", "500"))
+BULK_MAX_ARCHIVE_BYTES = int(os.getenv("BULK_MAX_ARCHIVE_BYTES", str(200 * 1024 * 1024)))
+# Pool slots all bulk requests together may hold (default: one per worker).
+# Capped below max_pending so interactive /parse-resume calls always have room.
+BULK_CONCURRENCY = max(1, min(
+    int(os.getenv("BULK_CONCURRENCY", "0")) or pipeline_pool.max_workers,
+    pipeline_pool.max_pending - pipeline_pool.max_workers
+))
+bulk_slots = asyncio.Semaphore(BULK_CONCURRENCY)
+
+async def run_pipeline(content: bytes, filename: str, profile: bool = False, pool: WorkerPool = None) -> tuple:
+    """
+    Pooled analysis of one file; (result, report) with the report recorded
+    in the engine stats and metrics, whether or not the pipeline succeeds
+    """
+    start = time.perf_counter()
+    report = None
+    try:
+        result, report = await (pool or pipeline_pool).run(analyze_upload, content, filename, profile)
+    except Exception as e:
+        report = getattr(e, 'extraction_report', None)
+        raise
+    finally:
+        # Queueing plus the whole worker-side analysis
+        PIPELINE_SECONDS.observe(time.perf_counter() - start)
+        pdf_engine_stats.record(report)
+        observe_pipeline_report(report)
+    return result, report
+
+async def score_upload(content: bytes, filename: str, pool: WorkerPool = None) -> dict:
+    """
+    Cached, pooled analysis of one file - shared by single and bulk endpoints
+    and 'ats' jobs (which pass job_pool)
+    """
+    DOCUMENT_BYTES.labels(os.path.splitext(filename)[1].lstrip('.').lower()).observe(len(content))
+    
+    # Same bytes + same scoring logic + same skill taxonomy build → same response
+    taxonomy_key = get_taxonomy().key
+    cache_key = response_cache_key(content, filename, taxonomy_key)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"⚡ Cache hit for {filename}")
+        return cached
+    
+    async def analyze() -> dict:
+        result, report = await run_pipeline(content, filename, pool=pool)
+        # A worker that had not picked up a taxonomy reload yet answered for the old one
+        if report.get('taxonomy') == taxonomy_key:
+            response_cache.put(cache_key, result)
+        return result
+    
+    # Same key in flight on the same pool → wait for that run instead of starting
+    # another; never across pools, so /parse-resume can't inherit a job's timeout
+    result, shared = await upload_flights.do((cache_key, pool or pipeline_pool), analyze)
+    if shared:
+        logger.info(f"🔗 Joined in-flight analysis for {filename}")
+    return result
+
+def is_profile_admin(token: Optional[str]) -> bool:
+    return PROFILE_ADMIN_TOKEN is not None and token is not None and hmac.compare_digest(token, PROFILE_ADMIN_TOKEN)
+
+def profile_trigger(x_profile: Optional[str], x_profile_token: Optional[str]) -> Optional[str]:
+    """
+    Why this request gets profiled ('header' or 'sampled'), or None.
+    Only the documented X-Profile values (PROFILE_HEADER_VALUES) ask for a profile.
+    """
+    if (x_profile or '').strip().lower() in PROFILE_HEADER_VALUES:
+        if not is_profile_admin(x_profile_token):
+            raise HTTPException(403, "Profiling requires a valid X-Profile-Token")
+        return 'header'
+    if PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE:
+        return 'sampled'
+    return None
+
+async def profile_upload(content: bytes, filename: str, trigger: str) -> tuple:
+    """
+    Uncached, profiled analysis of one file; (result, profile). The profile
+    is saved to the ring even when the pipeline fails.
+    """
+    DOCUMENT_BYTES.labels(os.path.splitext(filename)[1].lstrip('.').lower()).observe(len(content))
+    
+    result = error = None
+    try:
+        result, report = await run_pipeline(content, filename, profile=True)
+    except Exception as e:
+        report = getattr(e, 'extraction_report', None) or {}
+        error = e
+    
+    profile = {
+        'created_at': time.time(),
+        'trigger': trigger,
+        'filename': filename,
+        'bytes': len(content),
+        'scoring_version': SCORING_VERSION,
+        'error': str(error) if error is not None else None,
+        'pdf': {key: report[key] for key in ('probe', 'route', 'engine', 'attempts') if key in report},
+        **report.get('profile', {})
+    }
+    profile['id'] = await asyncio.to_thread(profile_ring.save, profile)
+    
+    if error is not None:
+        logger.warning(f"🔬 Profiled request failed, see profile {profile['id']}")
+        raise error
+    return result, profile
+
+def to_http_exception(e: Exception, filename: str) -> HTTPException:
+    """
+    Map a pipeline failure to the HTTP error the API reports
+    """
+    if isinstance(e, HTTPException):
+        return e
+    if isinstance(e, ResumeContentError):
+        return HTTPException(400, str(e))
+    if isinstance(e, PoolSaturatedError):
+        logger.warning(f"⚠️ {e}")
+        return HTTPException(503, "Service busy, please retry shortly")
+    if isinstance(e, PipelineTimeoutError):
+        logger.error(f"❌ {e}: {filename}")
+        return HTTPException(504, str(e))
+    logger.error(f"❌ Error: {str(e)}")
+    return HTTPException(500, str(e))
+
+def expand_archive(content: bytes, archive_name: str) -> list:
+    """
+    List (filename, bytes) for every PDF/DOCX inside a zip archive
+    """
+    entries = []
+    total_bytes = 0
+    try:
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            for info in archive.infolist():
+                name = info.filename
+                base = os.path.basename(name)
+                if info.is_dir() or name.startswith('__MACOSX/') or base.startswith('.'):
+                    continue
+                if not base.endswith(SUPPORTED_EXTENSIONS):
+                    continue
+                total_bytes += info.file_size
+                if total_bytes > BULK_MAX_ARCHIVE_BYTES:
+                    raise HTTPException(413, f"{archive_name}: archive expands beyond {BULK_MAX_ARCHIVE_BYTES} bytes")
+                entries.append((f"{archive_name}/{name}", archive.read(info)))
+    except zipfile.BadZipFile:
+        raise HTTPException(400, f"{archive_name}: not a valid zip archive")
+    return entries
+
 @app.post("/parse-resume")
-async def parse_resume(file: UploadFile = File(...)):
-    """Parse resume and calculate ATS score"""
+async def parse_resume(
+    file: UploadFile = File(...),
+    x_profile: Optional[str] = Header(None),
+    x_profile_token: Optional[str] = Header(None)
+):
+    """
+    Parse resume and calculate ATS score.
+    Admins can profile a request with X-Profile: 1 (profile id in the
+    X-Profile-Id response header) or X-Profile: attach (profile returned
+    as a JSON attachment next to the result), plus X-Profile-Token.
+    """
     try:
         # Validate file type
-        if not file.filename.endswith(('.pdf', '.docx')):
+        if not file.filename.endswith(SUPPORTED_EXTENSIONS):
             raise HTTPException(400, "Only PDF and DOCX supported")
         
-        # Save temp file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as tmp:
-            content = await file.read()
-            tmp.write(content)
-            tmp_path = tmp.name
+        start = time.perf_counter()
+        content = await file.read()
+        UPLOAD_READ_SECONDS.observe(time.perf_counter() - start)
         
-        try:
-            # Extract text
-            if file.filename.endswith('.pdf'):
-                text = parse_pdf(tmp_path)
-            else:
-                text = parse_docx(tmp_path)
-            
-            if len(text.strip()) < 50:
-                raise HTTPException(400, "Resume content too short")
-            
-            # Log extracted text preview for debugging
-            logger.info(f"📄 Extracted text preview (first 500 chars):\n{text[:500]}...")
-            
-            # Extract skills
-            skills = extract_skills(text)
-            
-            # Log ALL detected skills for debugging
-            logger.info(f"🎯 FULL SKILL LIST ({len(skills)} total):")
-            logger.info(f"   {', '.join(sorted(skills))}")
-            
-            # Calculate ATS score
-            ats_result = calculate_ats_score(text, skills)
-            
-            logger.info(f"✅ Parsed resume: {len(text)} chars, {len(skills)} skills, {ats_result['final_score']}% ATS ({ats_result['grade']})")
-            
-            return {
-                "success": True,
-                "data": {
-                    "final_ats_score": ats_result['final_score'],
-                    "ats_score": ats_result['final_score'],  # Duplicate for compatibility
-                    "ats_grade": ats_result['grade'],
-                    "ml_relevance_score": ats_result['final_score'],
-                    "skill_match_score": min(len(skills) / 12 * 100, 100),  # Optimal: 12 skills
-                    "extracted_skills": skills,
-                    "skill_count": len(skills),
-                    "word_count": ats_result['word_count'],
-                    "score_breakdown": ats_result['breakdown'],
-                    "raw_component_scores": ats_result['raw_scores'],
-                    "quality_multiplier": ats_result['quality_multiplier'],
-                    "parsed_data": {
-                        "primary_info": {
-                            "name": "Extracted Name",
-                            "email": None,
-                            "phone": None
-                        }
-                    },
-                    "skill_gaps": [],
-                    "recommendations": ats_result['recommendations']
-                }
-            }
+        trigger = profile_trigger(x_profile, x_profile_token)
+        if trigger is None:
+            return json_response(await score_upload(content, file.filename))
         
-        finally:
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
+        result, profile = await profile_upload(content, file.filename, trigger)
+        headers = {'X-Profile-Id': profile['id']}
+        if trigger == 'header' and x_profile.strip().lower() == 'attach':
+            headers['Content-Disposition'] = f'attachment; filename="profile-{profile["id"]}.json"'
+            return JSONResponse(content=jsonable_encoder({'result': result, 'profile': profile}), headers=headers)
+        response = json_response(result)
+        response.headers.update(headers)
+        return response
     
-    except HTTPException:
+    except Exception as e:
+        raise to_http_exception(e, file.filename)
+
+@app.post("/parse-resumes")
+async def parse_resumes(
+    files: List[UploadFile] = File(...),
+    stream: bool = False
+):
+    """
+    Parse and score many resumes (PDF/DOCX files and/or zip archives) in parallel.
+    Returns per-file results sorted by ATS score, or NDJSON lines as each file
+    finishes when stream=true.
+    """
+    uploads = []
+    for upload in files:
+        start = time.perf_counter()
+        content = await upload.read()
+        UPLOAD_READ_SECONDS.observe(time.perf_counter() - start)
+        if upload.filename.lower().endswith('.zip'):
+            uploads.extend(expand_archive(content, upload.filename))
+        else:
+            uploads.append((upload.filename, content))
+        if len(uploads) > BULK_MAX_FILES:
+            raise HTTPException(413, f"Too many files (max {BULK_MAX_FILES})")
+    
+    if not uploads:
+        raise HTTPException(400, "No PDF or DOCX files found")
+    
+    logger.info(f"📦 Bulk request: {len(uploads)} files")
+    
+    async def score_one(index: int, filename: str, content: bytes) -> dict:
+        if not filename.endswith(SUPPORTED_EXTENSIONS):
+            return {"index": index, "filename": filename, "success": False,
+                    "status_code": 400, "error": "Only PDF and DOCX supported"}
+        # Shared by every bulk request, so concurrent batches can't fill the pool's queue
+        async with bulk_slots:
+            try:
+                result = await score_upload(content, filename)
+                return {"index": index, "filename": filename, "success": True, "data": result["data"]}
+            except Exception as e:
+                error = to_http_exception(e, filename)
+                return {"index": index, "filename": filename, "success": False,
+                        "status_code": error.status_code, "error": error.detail}
+    
+    tasks = [asyncio.ensure_future(score_one(i, name, content)) for i, (name, content) in enumerate(uploads)]
+    
+    if stream:
+        async def ndjson():
+            try:
+                for finished in asyncio.as_completed(tasks):
+                    yield json.dumps(await finished) + "\n"
+            finally:
+                for task in tasks:
+                    task.cancel()
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+    
+    results = await asyncio.gather(*tasks)
+    
+    # Best scores first, failures last (in upload order)
+    results.sort(key=lambda r: (not r["success"], -(r["data"]["final_ats_score"] if r["success"] else 0), r["index"]))
+    succeeded = sum(1 for r in results if r["success"])
+    
+    return json_response({
+        "success": True,
+        "total": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "results": results
+    })
+
+# ══════════════════════════════════════════════════════════════
+# ASYNC JOBS: submit now, poll GET /jobs/{id} for results
+# ══════════════════════════════════════════════════════════════
+JOB_MODES = ('ats', 'deep')
+JOB_DISPATCH = os.getenv("JOB_DISPATCH", "true").lower() in ("1", "true", "yes")
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1"))
+JOB_PURGE_INTERVAL_SECONDS = float(os.getenv("JOB_PURGE_INTERVAL_SECONDS", "300"))
+# Files of one 'deep' job scored per job_pool call (one feature matrix, one
+# ranker call); the pool timeout (JOB_TIMEOUT_SECONDS) covers the whole batch
+JOB_DEEP_BATCH_SIZE = max(1, int(os.getenv("JOB_DEEP_BATCH_SIZE", "8")))
+# Higher runs first; without an explicit priority single files go ahead of batches
+JOB_PRIORITY_SINGLE = 10
+JOB_PRIORITY_BATCH = 0
+
+# Set whenever a job is submitted, so idle dispatchers don't wait out their poll
+job_wakeup = asyncio.Event()
+
+@lru_cache(maxsize=1)
+def get_job_store() -> JobStore:
+    # Opened on first use: worker processes import this module too
+    return JobStore(
+        max_attempts=int(os.getenv("JOB_MAX_ATTEMPTS", "3")),
+        retry_backoff_seconds=float(os.getenv("JOB_RETRY_BACKOFF_SECONDS", "5")),
+        result_ttl_seconds=float(os.getenv("JOB_RESULT_TTL_SECONDS", "86400"))
+    )
+
+@lru_cache(maxsize=1)
+def get_ats_scorer():
+    from scoring.ats_scorer import ATSScorer
+    
+    return ATSScorer()
+
+def deep_resume_text(content: bytes, filename: str, report: dict = None) -> str:
+    """
+    Text of one 'deep' upload, refused when too short to score
+    """
+    if filename.endswith('.pdf'):
+        with stage(report, 'parse_pdf'):
+            text = parse_pdf(content, report)
+    else:
+        with stage(report, 'parse_docx'):
+            text = parse_docx(content)
+    if len(text.strip()) < 50:
+        raise ResumeContentError("Resume content too short")
+    return text
+
+def deep_analyze_uploads(files: list, job_skills: list = None) -> tuple:
+    """
+    job_pool entry point for 'deep' jobs: the full ATSScorer pipeline for
+    (filename, bytes) files, ranked together in one batch.
+    Returns (outcomes, reports): per file its result or the exception it
+    failed with, and the extraction reports (one per file plus the batch
+    stages), which ride back as in analyze_upload.
+    """
+    outcomes = [None] * len(files)
+    reports = [{} for _ in files]
+    batch_report = {}
+    texts, positions = [], []
+    for position, (filename, content) in enumerate(files):
+        try:
+            texts.append(deep_resume_text(content, filename, reports[position]))
+            positions.append(position)
+        except Exception as e:
+            # Library exceptions may not survive pickling back to the parent
+            outcomes[position] = e if isinstance(e, ResumeContentError) else RuntimeError(str(e))
+    try:
+        if texts:
+            results = get_ats_scorer().score_resumes(
+                texts, job_skills, [reports[position] for position in positions], batch_report
+            )
+            for position, result in zip(positions, results):
+                outcomes[position] = result
+    except Exception as e:
+        e.extraction_reports = reports + [batch_report]
+        raise
+    return outcomes, reports + [batch_report]
+
+async def run_deep_batch(files: list, job_skills: list = None) -> list:
+    """
+    'deep' analysis of several files in one job_pool call, their reports
+    recorded in the engine stats and metrics whether or not it succeeds
+    """
+    reports = None
+    try:
+        outcomes, reports = await job_pool.run(deep_analyze_uploads, files, job_skills)
+    except Exception as e:
+        reports = getattr(e, 'extraction_reports', None)
         raise
+    finally:
+        for report in reports or ():
+            pdf_engine_stats.record(report)
+            observe_pipeline_report(report)
+    return outcomes
+
+async def record_task_failure(store: JobStore, task: dict, e: Exception):
+    """
+    Only pool trouble (busy, crashed worker) is retried; a bad file fails the
+    same way every time, and a file that timed out would only tie up a worker
+    for another timeout.
+    """
+    error = to_http_exception(e, task['filename'])
+    retry = isinstance(e, (PoolSaturatedError, BrokenProcessPool))
+    state = await asyncio.to_thread(
+        store.fail, task['job_id'], task['index'], str(error.detail), error.status_code, retry
+    )
+    logger.warning(
+        f"⚠️ Job {task['job_id']} file {task['index']} ({task['filename']}) attempt {task['attempt']}: "
+        f"{error.detail} → {state}"
+    )
+
+async def run_job_task(store: JobStore, task: dict):
+    """
+    Run one claimed 'ats' task and record its outcome
+    """
+    try:
+        result = (await score_upload(task['content'], task['filename'], pool=job_pool))['data']
+    except Exception as e:
+        await record_task_failure(store, task, e)
+        return
+    await asyncio.to_thread(store.complete, task['job_id'], task['index'], result)
+
+async def run_job_batch(store: JobStore, tasks: list):
+    """
+    Run claimed 'deep' tasks of one job as one batch and record each outcome;
+    a pool failure fails every task in it
+    """
+    try:
+        outcomes = await run_deep_batch(
+            [(task['filename'], task['content']) for task in tasks], tasks[0]['options'].get('job_skills')
+        )
     except Exception as e:
-        logger.error(f"❌ Error: {str(e)}")
-        raise HTTPException(500, str(e))
+        for task in tasks:
+            await record_task_failure(store, task, e)
+        return
+    for task, outcome in zip(tasks, outcomes):
+        if isinstance(outcome, Exception):
+            await record_task_failure(store, task, outcome)
+        else:
+            await asyncio.to_thread(store.complete, task['job_id'], task['index'], outcome)
+
+async def claim_deep_batch(store: JobStore, task: dict, lease_seconds: float) -> list:
+    """
+    The claimed task plus up to JOB_DEEP_BATCH_SIZE - 1 more ready tasks of its job
+    """
+    tasks = [task]
+    while len(tasks) < JOB_DEEP_BATCH_SIZE:
+        more = await asyncio.to_thread(store.claim, lease_seconds, task['job_id'])
+        if more is None:
+            break
+        tasks.append(more)
+    return tasks
+
+async def job_dispatcher():
+    """
+    Keeps one job_pool worker busy: claim the next task (with more of its
+    job's tasks, for 'deep' batches), run it, repeat
+    """
+    store = get_job_store()
+    # A lease outlives the pool timeout, so only tasks of a dead worker expire
+    lease_seconds = job_pool.timeout_seconds + 60
+    while True:
+        try:
+            job_wakeup.clear()
+            task = await asyncio.to_thread(store.claim, lease_seconds)
+            if task is None:
+                try:
+                    await asyncio.wait_for(job_wakeup.wait(), JOB_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            if task['mode'] == 'deep':
+                await run_job_batch(store, await claim_deep_batch(store, task, lease_seconds))
+            else:
+                await run_job_task(store, task)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Job dispatcher error: {e}")
+            await asyncio.sleep(JOB_POLL_SECONDS)
+
+async def job_purger():
+    store = get_job_store()
+    while True:
+        try:
+            purged = await asyncio.to_thread(store.purge_expired)
+            if purged:
+                logger.info(f"🧹 Purged {purged} expired jobs")
+        except Exception as e:
+            logger.error(f"❌ Job purge failed: {e}")
+        await asyncio.sleep(JOB_PURGE_INTERVAL_SECONDS)
+
+@app.on_event("startup")
+async def start_job_dispatchers():
+    if JOB_DISPATCH:
+        app.state.job_tasks = [asyncio.create_task(job_dispatcher()) for _ in range(job_pool.max_workers)]
+        app.state.job_tasks.append(asyncio.create_task(job_purger()))
+
+@app.on_event("shutdown")
+async def stop_job_dispatchers():
+    # Interrupted tasks stay leased and are picked up again after a restart
+    for task in getattr(app.state, 'job_tasks', []):
+        task.cancel()
+
+@app.post("/jobs", status_code=202)
+async def submit_job(
+    files: List[UploadFile] = File(...),
+    mode: str = 'ats',
+    priority: Optional[int] = None,
+    job_skills: Optional[str] = None
+):
+    """
+    Queue resumes (PDF/DOCX files and/or zip archives) for background analysis.
+    mode 'ats' gives the /parse-resume result per file, 'deep' the full
+    ATSScorer report (job_skills: comma-separated). Higher priority runs first.
+    """
+    if mode not in JOB_MODES:
+        raise HTTPException(400, f"mode must be one of {', '.join(JOB_MODES)}")
+    
+    uploads = []
+    for upload in files:
+        content = await upload.read()
+        if upload.filename.lower().endswith('.zip'):
+            uploads.extend(expand_archive(content, upload.filename))
+        elif upload.filename.endswith(SUPPORTED_EXTENSIONS):
+            uploads.append((upload.filename, content))
+        else:
+            raise HTTPException(400, f"{upload.filename}: only PDF, DOCX and zip supported")
+        if len(uploads) > BULK_MAX_FILES:
+            raise HTTPException(413, f"Too many files (max {BULK_MAX_FILES})")
+    if not uploads:
+        raise HTTPException(400, "No PDF or DOCX files found")
+    
+    if priority is None:
+        priority = JOB_PRIORITY_SINGLE if len(uploads) == 1 else JOB_PRIORITY_BATCH
+    options = {'job_skills': [skill.strip() for skill in job_skills.split(',') if skill.strip()]} if job_skills else {}
+    
+    job_id = await asyncio.to_thread(get_job_store().submit, mode, uploads, priority, options)
+    job_wakeup.set()
+    logger.info(f"📥 Job {job_id}: {len(uploads)} files, mode {mode}, priority {priority}")
+    return {"job_id": job_id, "status": "queued", "total": len(uploads), "status_url": f"/jobs/{job_id}"}
+
+@app.get("/jobs/stats")
+async def job_stats():
+    return {**await asyncio.to_thread(get_job_store().stats), "pool": job_pool.stats()}
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str, results: bool = True):
+    job = await asyncio.to_thread(get_job_store().get, job_id, results)
+    if job is None:
+        raise HTTPException(404, f"Job {job_id} not found (or expired)")
+    return job
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    store = get_job_store()
+    cancelled = await asyncio.to_thread(store.cancel, job_id)
+    job = await asyncio.to_thread(store.get, job_id, False)
+    if job is None:
+        raise HTTPException(404, f"Job {job_id} not found (or expired)")
+    return {**job, "cancelled": cancelled}
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,230 @@
+"""
+Stage-by-stage benchmark of the ml-service pipeline on a synthetic corpus.
+
+    python -m benchmarks.run                       # quick run, prints a table
+    python -m benchmarks.run --out bench.json      # save results
+    python -m benchmarks.run --baseline bench.json # compare against a saved run
+    python -m benchmarks.run --deep                # also time ATSScorer stages
+
+Runs offline: the corpus is generated locally and the deep stages are
+skipped (with the reason) when their models are not available.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+# Run from ml-service/ so app and the parser packages import the same way uvicorn does
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import SIZES, build_corpus  # noqa: E402
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(samples_ms: List[float], total_bytes: int = 0) -> Dict[str, float]:
+    ordered = sorted(samples_ms)
+    total_s = sum(ordered) / 1000
+    summary = {
+        'runs': len(ordered),
+        'mean_ms': round(statistics.fmean(ordered), 4),
+        'p50_ms': round(percentile(ordered, 50), 4),
+        'p95_ms': round(percentile(ordered, 95), 4),
+        'p99_ms': round(percentile(ordered, 99), 4),
+        'max_ms': round(ordered[-1], 4),
+        'throughput_per_s': round(len(ordered) / total_s, 2) if total_s else 0.0
+    }
+    if total_bytes:
+        summary['mb_per_s'] = round(total_bytes / (1024 * 1024) / total_s, 2) if total_s else 0.0
+    return summary
+
+
+def time_stage(func: Callable, inputs: List[tuple], repeat: int, warmup: int = 1) -> List[float]:
+    """
+    Per-call wall time (ms) of func over every input, repeated
+    """
+    for args in inputs[:warmup]:
+        func(*args)
+    samples = []
+    for _ in range(repeat):
+        for args in inputs:
+            start = time.perf_counter_ns()
+            func(*args)
+            samples.append((time.perf_counter_ns() - start) / 1e6)
+    return samples
+
+
+def bench_fast_pipeline(corpus: List[Dict], repeat: int) -> Dict[str, Dict]:
+    """
+    Stages behind /parse-resume
+    """
+    import app
+
+    results = {}
+    by_size: Dict[str, List[Dict]] = {}
+    for doc in corpus:
+        by_size.setdefault(doc['size'], []).append(doc)
+
+    for size, docs in by_size.items():
+        raw_texts = [(doc['text'],) for doc in docs]
+        cleaned = [(app.clean_extracted_text(doc['text']),) for doc in docs]
+        scored = [(text, app.extract_skills(text)) for (text,) in cleaned]
+
+        stages = {
+            'parse_pdf': (app.parse_pdf, [(doc['pdf'],) for doc in docs], sum(len(d['pdf']) for d in docs)),
+            'parse_docx': (app.parse_docx, [(doc['docx'],) for doc in docs], sum(len(d['docx']) for d in docs)),
+            'clean_extracted_text': (app.clean_extracted_text, raw_texts, sum(len(d['text']) for d in docs)),
+            'extract_skills': (app.extract_skills, cleaned, sum(len(t) for (t,) in cleaned)),
+            'calculate_ats_score': (app.calculate_ats_score, scored, sum(len(t) for t, _ in scored)),
+            'analyze_resume_pdf': (app.analyze_resume, [(doc['pdf'], f"{doc['id']}.pdf") for doc in docs],
+                                   sum(len(d['pdf']) for d in docs))
+        }
+        for stage, (func, inputs, total_bytes) in stages.items():
+            samples = time_stage(func, inputs, repeat)
+            results[f"{stage}[{size}]"] = summarize(samples, total_bytes * repeat)
+    return results
+
+
+def bench_deep_pipeline(corpus: List[Dict], repeat: int) -> Dict[str, Dict]:
+    """
+    ATSScorer stages, in the order score_resume runs them
+    """
+    from scoring.ats_scorer import ATSScorer
+
+    scorer = ATSScorer()
+    job_skills = ['Python', 'React', 'AWS', 'Docker', 'Kubernetes', 'PostgreSQL', 'Machine Learning']
+    texts = [doc['text'] for doc in corpus]
+
+    samples: Dict[str, List[float]] = {}
+
+    def timed(stage: str, func: Callable, *args):
+        start = time.perf_counter_ns()
+        result = func(*args)
+        samples.setdefault(stage, []).append((time.perf_counter_ns() - start) / 1e6)
+        return result
+
+    def featurize(parsed: Dict, similarity: Dict):
+        # What score_resumes does per batch: the ranker matrix plus the breakdown dict
+        matrix = scorer.feature_engineer.extract_feature_matrix([parsed], [similarity])
+        scorer.feature_engineer.extract_features(parsed, similarity)
+        return matrix
+
+    scorer.score_resume(texts[0], job_skills)  # warm up models
+    for _ in range(repeat):
+        for text in texts:
+            parsed = timed('ats.ner_parse', scorer.ner_parser.parse, text)
+            skills = timed('ats.skill_extract', scorer.skill_extractor.extract_skills, text)
+            parsed['skills'] = skills
+            similarity = timed('ats.similarity', scorer.similarity_engine.calculate_skill_similarity,
+                               skills['all_skills'], job_skills)
+            matrix = timed('ats.features', featurize, parsed, similarity)
+            timed('ats.predict', scorer.xgboost_ranker.predict_batch, matrix)
+            timed('ats.score_resume', scorer.score_resume, text, job_skills)
+
+    return {stage: summarize(values) for stage, values in samples.items()}
+
+
+def compare(current: Dict[str, Dict], baseline: Dict[str, Dict], threshold_pct: float) -> List[str]:
+    """
+    Print p50/p95 deltas against a baseline; return stages slower than threshold_pct
+    """
+    regressions = []
+    print(f"\n{'stage':40} {'p50 base':>10} {'p50 now':>10} {'Δ p50':>8} {'Δ p95':>8}")
+    for stage, now in current.items():
+        base = baseline.get(stage)
+        if not base:
+            continue
+        d50 = (now['p50_ms'] / base['p50_ms'] - 1) * 100 if base['p50_ms'] else 0.0
+        d95 = (now['p95_ms'] / base['p95_ms'] - 1) * 100 if base['p95_ms'] else 0.0
+        flag = '  ⚠️' if d50 > threshold_pct else ''
+        print(f"{stage:40} {base['p50_ms']:>10.3f} {now['p50_ms']:>10.3f} {d50:>7.1f}% {d95:>7.1f}%{flag}")
+        if d50 > threshold_pct:
+            regressions.append(stage)
+    return regressions
+
+
+def print_table(results: Dict[str, Dict]):
+    print(f"\n{'stage':40} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ops/s':>10}")
+    for stage, r in results.items():
+        print(f"{stage:40} {r['p50_ms']:>9.3f} {r['p95_ms']:>9.3f} {r['p99_ms']:>9.3f} {r['throughput_per_s']:>10.1f}")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the ml-service pipeline')
+    parser.add_argument('--per-size', type=int, default=5, help='documents per size bucket')
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=list(SIZES))
+    parser.add_argument('--repeat', type=int, default=3, help='passes over the corpus per stage')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--deep', action='store_true', help='also time the ATSScorer pipeline')
+    parser.add_argument('--out', help='write results JSON here')
+    parser.add_argument('--baseline', help='compare against a previous results JSON')
+    parser.add_argument('--fail-threshold', type=float, default=None,
+                        help='exit 1 if any stage p50 is this many %% slower than the baseline')
+    args = parser.parse_args(argv)
+
+    # Pipeline INFO logs would dominate the output
+    logging.disable(logging.INFO)
+
+    import app
+    corpus = build_corpus(app.SKILLS, per_size=args.per_size, sizes=args.sizes, seed=args.seed)
+    print(f"📄 Corpus: {len(corpus)} documents ({', '.join(args.sizes)}) x text/docx/pdf")
+
+    results = bench_fast_pipeline(corpus, args.repeat)
+    skipped = {}
+    if args.deep:
+        try:
+            results.update(bench_deep_pipeline(corpus, args.repeat))
+        except Exception as e:
+            skipped['ats_scorer'] = f"{type(e).__name__}: {e}"
+            print(f"⚠️ Skipping ATSScorer stages: {skipped['ats_scorer']}")
+
+    print_table(results)
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'documents': len(corpus),
+            'sizes': args.sizes,
+            'per_size': args.per_size,
+            'repeat': args.repeat,
+            'seed': args.seed,
+            'skipped': skipped
+        },
+        'results': results
+    }
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Saved results to {args.out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        threshold = args.fail_threshold if args.fail_threshold is not None else 10.0
+        regressions = compare(results, baseline, threshold)
+        if regressions and args.fail_threshold is not None:
+            print(f"\n❌ {len(regressions)} stage(s) regressed more than {threshold}%")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
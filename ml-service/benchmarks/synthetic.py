@@ -0,0 +1,148 @@
+"""
+Synthetic resume corpus for benchmarking.
+Resumes are assembled from SKILLS and section templates with a seeded RNG,
+so every run (and every machine) sees the same documents.
+"""
+import io
+import random
+from typing import Dict, List
+
+FIRST_NAMES = ['Aarav', 'Maya', 'Liam', 'Priya', 'Noah', 'Sofia', 'Ethan', 'Zara', 'Lucas', 'Anika']
+LAST_NAMES = ['Shah', 'Patel', 'Nguyen', 'Garcia', 'Smith', 'Kim', 'Okafor', 'Rossi', 'Müller', 'Silva']
+CITIES = ['Mumbai, India', 'Austin, TX', 'London, UK', 'Toronto, Canada', 'Remote']
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Stark Industries', 'Wayne Tech', 'Hooli', 'Vandelay']
+TITLES = ['Software Engineer', 'Senior Developer', 'Data Analyst', 'Engineering Manager',
+          'Cloud Architect', 'Full Stack Developer', 'ML Engineer', 'Technical Lead']
+DEGREES = ['Bachelor of Technology in Computer Science', 'Master of Science in Data Science',
+           'B.S. in Information Technology', 'MBA, Technology Management']
+SCHOOLS = ['State University', 'Institute of Technology', 'City College', 'National Academy']
+VERBS = ['Developed', 'Led', 'Designed', 'Built', 'Optimized', 'Implemented', 'Automated',
+         'Architected', 'Delivered', 'Improved', 'Reduced', 'Increased', 'Launched', 'Collaborated on']
+OBJECTS = ['a microservices platform', 'the data pipeline', 'a customer-facing dashboard',
+           'CI/CD workflows', 'the recommendation engine', 'an internal API gateway',
+           'the billing system', 'mobile onboarding flows', 'observability tooling']
+IMPACTS = ['cutting latency by {n}%', 'serving {n}+ users', 'for {n} customers',
+           'saving {n} thousand dollars a year', 'across {n} teams', 'improving throughput {n}%']
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+CERTS = ['AWS Certified Solutions Architect', 'Certified Kubernetes Administrator',
+         'Google Cloud Professional Data Engineer', 'PMP Certification', 'Microsoft Certified: Azure Fundamentals']
+
+# name -> (approximate word count, PDF page count)
+SIZES: Dict[str, tuple] = {
+    'short': (250, 1),
+    'medium': (600, 2),
+    'long': (1500, 4),
+    'huge': (5000, 12)
+}
+
+
+def _bullet(rng: random.Random, skills: List[str]) -> str:
+    picked = rng.sample(skills, k=min(len(skills), rng.randint(1, 3)))
+    impact = rng.choice(IMPACTS).format(n=rng.randint(2, 500))
+    return f"• {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {', '.join(picked)}, {impact}."
+
+
+def _date_range(rng: random.Random, year: int) -> str:
+    start = f"{rng.choice(MONTHS)} {year}"
+    if rng.random() < 0.3:
+        start = f"{rng.randint(1, 12):02d}/{year}"
+    end = 'Present' if rng.random() < 0.2 else f"{rng.choice(MONTHS)} {year + rng.randint(1, 3)}"
+    return f"{start} - {end}"
+
+
+def generate_resume_text(seed: int, target_words: int, skills: List[str]) -> str:
+    """
+    One synthetic resume of roughly target_words words
+    """
+    rng = random.Random(seed)
+    own_skills = rng.sample(skills, k=min(len(skills), rng.randint(8, 30)))
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+    lines = [
+        name,
+        f"{name.split()[0].lower()}.{seed}@example.com | +1 ({rng.randint(200, 999)}) "
+        f"{rng.randint(200, 999)}-{rng.randint(1000, 9999)} | {rng.choice(CITIES)}",
+        f"linkedin.com/in/{name.replace(' ', '').lower()} | github.com/{name.split()[0].lower()}",
+        '',
+        'SUMMARY',
+        f"{rng.choice(TITLES)} with {rng.randint(1, 15)}+ years of experience in "
+        f"{', '.join(own_skills[:4])}. Focused on scalability, performance and clean code.",
+        '',
+        'SKILLS',
+        ', '.join(own_skills),
+        '',
+        'EXPERIENCE'
+    ]
+
+    year = 2024
+    words = sum(len(line.split()) for line in lines)
+    body_budget = max(target_words - 80, 60)
+    while words < body_budget:
+        year -= rng.randint(1, 3)
+        header = f"{rng.choice(TITLES)} | {rng.choice(COMPANIES)} | {_date_range(rng, year)}"
+        lines.append(header)
+        words += len(header.split())
+        for _ in range(rng.randint(3, 6)):
+            bullet = _bullet(rng, own_skills)
+            lines.append(bullet)
+            words += len(bullet.split())
+        lines.append('')
+
+    lines += [
+        'PROJECTS',
+        _bullet(rng, own_skills),
+        '',
+        'EDUCATION',
+        f"{rng.choice(DEGREES)} | {rng.choice(SCHOOLS)} | {year - 4} - {year}",
+        '',
+        'CERTIFICATIONS',
+        rng.choice(CERTS)
+    ]
+    return '\n'.join(lines)
+
+
+def to_docx(text: str) -> bytes:
+    from docx import Document
+
+    doc = Document()
+    for line in text.split('\n'):
+        doc.add_paragraph(line)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def to_pdf(text: str, pages: int) -> bytes:
+    import fitz  # PyMuPDF
+
+    lines = text.split('\n')
+    per_page = max(1, -(-len(lines) // pages))
+    doc = fitz.open()
+    for start in range(0, len(lines), per_page):
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(40, 40, 572, 800), '\n'.join(lines[start:start + per_page]), fontsize=8)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def build_corpus(skills: List[str], per_size: int = 5, sizes: List[str] = None, seed: int = 0) -> List[Dict]:
+    """
+    Documents of every requested size in text, DOCX and PDF form
+    """
+    corpus = []
+    for size in sizes or list(SIZES):
+        target_words, pages = SIZES[size]
+        size_index = list(SIZES).index(size)
+        for i in range(per_size):
+            doc_seed = seed * 100003 + size_index * 1000 + i
+            text = generate_resume_text(doc_seed, target_words, skills)
+            corpus.append({
+                'id': f"{size}-{i}",
+                'size': size,
+                'pages': pages,
+                'text': text,
+                'docx': to_docx(text),
+                'pdf': to_pdf(text, pages)
+            })
+    return corpus
@@ -1,7 +1,113 @@
 import re
 from datetime import datetime
-from typing import Dict, List, Any
-import dateparser
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+# Model input columns in order: (feature key, short label used in reports)
+FEATURE_SCHEMA: List[Tuple[str, str]] = [
+    ('has_name', 'has_name'),
+    ('has_email', 'has_email'),
+    ('has_phone', 'has_phone'),
+    ('has_location', 'has_location'),
+    ('word_count_normalized', 'word_count'),
+    ('sentence_count', 'sentence_count'),
+    ('has_experience_section', 'experience_section'),
+    ('has_education_section', 'education_section'),
+    ('has_skills_section', 'skills_section'),
+    ('has_projects_section', 'projects_section'),
+    ('years_of_experience', 'years_experience'),
+    ('organization_count', 'organizations'),
+    ('total_skills', 'total_skills'),
+    ('skill_density', 'skill_density'),
+    ('programming_skills_count', 'prog_skills'),
+    ('framework_skills_count', 'framework_skills'),
+    ('database_skills_count', 'db_skills'),
+    ('cloud_skills_count', 'cloud_skills'),
+    ('skill_match_percentage', 'skill_match_%'),
+    ('matched_skills_count', 'matched_count'),
+    ('missing_skills_count', 'missing_count'),
+    ('skill_match_ratio', 'match_ratio'),
+    ('action_verb_count', 'action_verbs'),
+    ('has_bullet_points', 'bullet_points'),
+    ('proper_capitalization', 'capitalization')
+]
+FEATURE_NAMES = [name for name, _ in FEATURE_SCHEMA]
+FEATURE_LABELS = [label for _, label in FEATURE_SCHEMA]
+NUM_FEATURES = len(FEATURE_SCHEMA)
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+
+# Common resume date formats: 'Jan 2020', 'January, 2020', '01/2020', '2020', 'Present'
+DATE_TOKEN_PATTERN = re.compile(
+    r'\b(?:'
+    r'(?P<month>jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?,?\s*(?P<month_year>(?:19|20)\d{2})'
+    r'|(?P<num_month>0?[1-9]|1[0-2])\s*[/.]\s*(?P<num_year>(?:19|20)\d{2})'
+    r'|(?P<year>(?:19|20)\d{2})'
+    r'|(?P<present>present|current|now|today|date)'
+    r')\b',
+    re.IGNORECASE
+)
+
+# What may sit between the two ends of a range: '2019 - Present', 'Jan 2020 to Mar 2021'
+RANGE_SEPARATOR_PATTERN = re.compile(r'\s*(?:-|–|—|to|until|till|through|thru)\s*', re.IGNORECASE)
+
+YEAR_PATTERN = re.compile(r'(19|20)\d{2}')
+
+@lru_cache(maxsize=4096)
+def _dateparser_year(date_str: str) -> Optional[int]:
+    """
+    Last resort for dates no fast pattern understands ('last summer'), memoized
+    """
+    import dateparser
+    
+    try:
+        parsed = dateparser.parse(date_str)
+    except Exception:
+        return None
+    return parsed.year if parsed else None
+
+def parse_date_spans(date_str: str, current_month: int) -> Tuple[List[Tuple[int, int]], List[int]]:
+    """
+    Ranges and single dates in one DATE entity, as month indexes (year * 12 + month - 1).
+    Returns (ranges as (start, end) with end exclusive, months of dates not part of a range).
+    """
+    tokens = []
+    for match in DATE_TOKEN_PATTERN.finditer(date_str):
+        if match.group('present'):
+            month = current_month
+        elif match.group('month'):
+            month = int(match.group('month_year')) * 12 + MONTHS[match.group('month')[:3].lower()] - 1
+        elif match.group('num_month'):
+            month = int(match.group('num_year')) * 12 + int(match.group('num_month')) - 1
+        else:
+            month = int(match.group('year')) * 12
+        # As a range end, a month counts in full ('Jan 2020 - Dec 2020' is 12 months);
+        # a bare year stays at its start ('2019 - 2021' is 24 months)
+        through = month if match.group('year') else month + 1
+        tokens.append((match.start(), match.end(), month, through, bool(match.group('present'))))
+    
+    ranges, points = [], []
+    i = 0
+    while i < len(tokens):
+        start_pos, end_pos, month, _, is_present = tokens[i]
+        if i + 1 < len(tokens) and not is_present and RANGE_SEPARATOR_PATTERN.fullmatch(
+            date_str, end_pos, tokens[i + 1][0]
+        ):
+            end_month = min(tokens[i + 1][3], current_month + 1)
+            if end_month >= month:
+                ranges.append((month, end_month))
+            i += 2
+            continue
+        if not is_present:
+            points.append(month)
+        i += 1
+    
+    return ranges, points
 
 class FeatureEngineer:
     """
@@ -16,91 +122,140 @@ class FeatureEngineer:
         """
         Extract all features for ML model
         """
-        features = {}
+        features = dict(zip(FEATURE_NAMES, self._feature_row(parsed_data, similarity_data)))
+        
+        # Descriptive values that are not model inputs
+        features['word_count'] = float(parsed_data.get('word_count', 0))
+        features['section_count'] = float(len(parsed_data.get('sections', {})))
+        features['has_urls'] = float(len(parsed_data.get('entities', {}).get('urls', [])))
         
-        # 1. Basic Information Features
-        features['has_name'] = 1.0 if parsed_data.get('primary_info', {}).get('name') else 0.0
-        features['has_email'] = 1.0 if parsed_data.get('primary_info', {}).get('email') else 0.0
-        features['has_phone'] = 1.0 if parsed_data.get('primary_info', {}).get('phone') else 0.0
-        features['has_location'] = 1.0 if parsed_data.get('primary_info', {}).get('location') else 0.0
+        return features
+    
+    def extract_feature_matrix(
+        self,
+        parsed_resumes: List[Dict],
+        similarity_results: List[Dict],
+        out: np.ndarray = None
+    ) -> np.ndarray:
+        """
+        Features of many resumes as a float32 (N, NUM_FEATURES) matrix in
+        FEATURE_SCHEMA order, built from per-resume tuples without any dicts.
+        out, if given, is a preallocated matrix to fill (e.g. a slice of a training set).
+        """
+        if len(parsed_resumes) != len(similarity_results):
+            raise ValueError(
+                f"Got {len(parsed_resumes)} parsed resumes for {len(similarity_results)} similarity results"
+            )
+        
+        shape = (len(parsed_resumes), NUM_FEATURES)
+        if out is None:
+            out = np.empty(shape, dtype=np.float32)
+        elif out.shape != shape:
+            raise ValueError(f"Output matrix has shape {out.shape}, expected {shape}")
+        
+        if not len(out):
+            return out
+        
+        # Converting all rows in one call is far cheaper than N row assignments
+        out[:] = [
+            self._feature_row(parsed_data, similarity_data)
+            for parsed_data, similarity_data in zip(parsed_resumes, similarity_results)
+        ]
+        
+        return out
+    
+    def _feature_row(self, parsed_data: Dict, similarity_data: Dict) -> Tuple[float, ...]:
+        """
+        One resume's model inputs, in FEATURE_SCHEMA order
+        """
+        primary_info = parsed_data.get('primary_info', {})
+        entities = parsed_data.get('entities', {})
         
         # 2. Content Length Features
-        features['word_count'] = float(parsed_data.get('word_count', 0))
-        features['sentence_count'] = float(parsed_data.get('sentence_count', 0))
-        features['word_count_normalized'] = min(features['word_count'] / 1000.0, 1.0)  # Normalize to 0-1
+        word_count = float(parsed_data.get('word_count', 0))
         
         # 3. Section Completeness Features
         sections = parsed_data.get('sections', {})
-        features['has_experience_section'] = 1.0 if sections.get('experience') else 0.0
-        features['has_education_section'] = 1.0 if sections.get('education') else 0.0
-        features['has_skills_section'] = 1.0 if sections.get('skills') else 0.0
-        features['has_projects_section'] = 1.0 if sections.get('projects') else 0.0
-        features['section_count'] = float(len(sections))
-        
-        # 4. Experience Features
-        features['years_of_experience'] = self._extract_years_of_experience(
-            parsed_data.get('entities', {}).get('dates', [])
-        )
-        features['organization_count'] = float(len(parsed_data.get('entities', {}).get('organizations', [])))
+        section_text = ' '.join(sections.values()) if sections else ''
         
         # 5. Skill Features
         skill_data = parsed_data.get('skills', {})
-        features['total_skills'] = float(skill_data.get('skill_count', 0))
-        features['skill_density'] = features['total_skills'] / max(features['word_count'], 1)
-        
+        total_skills = float(skill_data.get('skill_count', 0))
         categorized_skills = skill_data.get('categorized_skills', {})
-        features['programming_skills_count'] = float(len(categorized_skills.get('programming_languages', [])))
-        features['framework_skills_count'] = float(len(categorized_skills.get('frameworks', [])))
-        features['database_skills_count'] = float(len(categorized_skills.get('databases', [])))
-        features['cloud_skills_count'] = float(len(categorized_skills.get('cloud_devops', [])))
         
         # 6. Similarity Features
-        features['skill_match_percentage'] = float(similarity_data.get('overall_similarity', 0))
-        features['matched_skills_count'] = float(similarity_data.get('match_count', 0))
-        features['missing_skills_count'] = float(len(similarity_data.get('missing_skills', [])))
-        features['skill_match_ratio'] = (
-            features['matched_skills_count'] / 
-            max(similarity_data.get('total_required', 1), 1)
-        )
-        
-        # 7. Quality Indicators
-        features['has_urls'] = float(len(parsed_data.get('entities', {}).get('urls', [])))
-        features['action_verb_count'] = self._count_action_verbs(
-            ' '.join(sections.values()) if sections else ''
-        )
+        matched_skills_count = float(similarity_data.get('match_count', 0))
         
-        # 8. Formatting Features
-        features['has_bullet_points'] = self._has_bullet_points(
-            ' '.join(sections.values()) if sections else ''
-        )
-        features['proper_capitalization'] = self._check_capitalization(
-            parsed_data.get('primary_info', {}).get('name', '')
+        return (
+            # 1. Basic Information Features
+            1.0 if primary_info.get('name') else 0.0,
+            1.0 if primary_info.get('email') else 0.0,
+            1.0 if primary_info.get('phone') else 0.0,
+            1.0 if primary_info.get('location') else 0.0,
+            min(word_count / 1000.0, 1.0),  # Normalize to 0-1
+            float(parsed_data.get('sentence_count', 0)),
+            1.0 if sections.get('experience') else 0.0,
+            1.0 if sections.get('education') else 0.0,
+            1.0 if sections.get('skills') else 0.0,
+            1.0 if sections.get('projects') else 0.0,
+            # 4. Experience Features
+            self._extract_years_of_experience(entities.get('dates', [])),
+            float(len(entities.get('organizations', []))),
+            total_skills,
+            total_skills / max(word_count, 1),
+            float(len(categorized_skills.get('programming_languages', []))),
+            float(len(categorized_skills.get('frameworks', []))),
+            float(len(categorized_skills.get('databases', []))),
+            float(len(categorized_skills.get('cloud_devops', []))),
+            float(similarity_data.get('overall_similarity', 0)),
+            matched_skills_count,
+            float(len(similarity_data.get('missing_skills', []))),
+            matched_skills_count / max(similarity_data.get('total_required', 1), 1),
+            # 7. Quality Indicators
+            self._count_action_verbs(section_text),
+            # 8. Formatting Features
+            self._has_bullet_points(section_text),
+            self._check_capitalization(primary_info.get('name', ''))
         )
-        
-        return features
     
     def _extract_years_of_experience(self, dates: List[str]) -> float:
         """
-        Calculate total years of experience from date mentions
+        Calculate total years of experience from date mentions.
+        Date ranges are merged so overlapping roles are not double counted.
         """
         if not dates:
             return 0.0
         
+        now = datetime.now()
+        current_month = now.year * 12 + now.month - 1
+        
+        ranges = []
         years = []
         for date_str in dates:
-            try:
-                # Try to parse year
-                parsed = dateparser.parse(date_str)
-                if parsed:
-                    years.append(parsed.year)
-            except:
-                # Try extracting year with regex
-                year_match = re.search(r'(19|20)\d{2}', date_str)
-                if year_match:
-                    years.append(int(year_match.group()))
+            date_ranges, date_points = parse_date_spans(date_str, current_month)
+            ranges.extend(date_ranges)
+            years.extend(month // 12 for month in date_points)
+            if not date_ranges and not date_points and not YEAR_PATTERN.search(date_str):
+                year = _dateparser_year(date_str)
+                if year:
+                    years.append(year)
+        
+        if ranges:
+            # Sum of merged intervals, in months
+            ranges.sort()
+            total_months = 0
+            span_start, span_end = ranges[0]
+            for start, end in ranges[1:]:
+                if start > span_end:
+                    total_months += span_end - span_start
+                    span_start, span_end = start, end
+                else:
+                    span_end = max(span_end, end)
+            total_months += span_end - span_start
+            return round(total_months / 12, 2)
         
         if len(years) >= 2:
-            # Calculate experience as max_year - min_year
+            # No ranges to measure; fall back to the spread of the years mentioned
             return float(max(years) - min(years))
         
         return 0.0
@@ -143,18 +298,4 @@ class FeatureEngineer:
         """
         Convert features dict to ordered vector for ML model
         """
-        feature_order = [
-            'has_name', 'has_email', 'has_phone', 'has_location',
-            'word_count_normalized', 'sentence_count',
-            'has_experience_section', 'has_education_section', 
-            'has_skills_section', 'has_projects_section',
-            'years_of_experience', 'organization_count',
-            'total_skills', 'skill_density',
-            'programming_skills_count', 'framework_skills_count',
-            'database_skills_count', 'cloud_skills_count',
-            'skill_match_percentage', 'matched_skills_count',
-            'missing_skills_count', 'skill_match_ratio',
-            'action_verb_count', 'has_bullet_points', 'proper_capitalization'
-        ]
-        
-        return [features.get(key, 0.0) for key in feature_order]
+        return [features.get(key, 0.0) for key in FEATURE_NAMES]
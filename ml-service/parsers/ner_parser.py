@@ -1,9 +1,65 @@
-import spacy
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
+import bisect
 import re
 
-# Load spaCy model
-nlp = spacy.load("en_core_web_sm")
+from utils.model_registry import registry
+
+NER_MODEL = "en_core_web_sm"
+
+# Only doc.ents and doc.sents are used; these components only feed POS tags,
+# lemmas and dependency parses, so they are never loaded
+UNUSED_COMPONENTS = ["tagger", "parser", "attribute_ruler", "lemmatizer"]
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]')
+URL_PATTERN = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+
+SECTION_HEADERS = {
+    'experience': r'work experience|experience|employment|professional experience',
+    'education': r'education|academic|qualifications',
+    'skills': r'skills|technical skills|competencies',
+    'projects': r'projects|portfolio',
+    'certifications': r'certifications|certificates|licenses'
+}
+SECTION_TERMS = {header: tuple(pattern.split('|')) for header, pattern in SECTION_HEADERS.items()}
+
+# Header terms not containing another term ('experience' also finds 'work experience')
+_HEADER_TERMS = [term for terms in SECTION_TERMS.values() for term in terms]
+SECTION_HEADER_NEEDLES = tuple(
+    term for term in _HEADER_TERMS
+    if not any(other != term and other in term for other in _HEADER_TERMS)
+)
+
+# Characters re.IGNORECASE matches to ASCII letters that str.lower() does not
+# (U+0130 even lowercases to two characters); mapped first so offsets line up
+CASEFOLD_EXCEPTIONS = str.maketrans({'\u0130': 'i', '\u0131': 'i', '\u017f': 's'})
+
+def load_pipeline(model_name: str = NER_MODEL):
+    """
+    Load spaCy trimmed to NER plus a cheap sentence splitter
+    """
+    import spacy
+    
+    nlp = spacy.load(model_name, exclude=UNUSED_COMPONENTS)
+    
+    # Sentences come from the small statistical senter (shipped disabled)
+    # instead of the dependency parser, or from rules if the model has none
+    if "senter" in nlp.disabled:
+        nlp.enable_pipe("senter")
+    elif not nlp.has_pipe("senter"):
+        nlp.add_pipe("sentencizer")
+    
+    # The shared tok2vec only feeds the excluded tagger/parser in the small models
+    if nlp.has_pipe("tok2vec") and not nlp.get_pipe("tok2vec").listening_components:
+        nlp.disable_pipe("tok2vec")
+    
+    return nlp
+
+def get_pipeline(model_name: str = NER_MODEL):
+    """
+    Shared spaCy pipeline, loaded on first use and reported by the model registry
+    """
+    return registry.get(f"spacy/{model_name}", loader=lambda _: load_pipeline(model_name))
 
 class NERResumeParser:
     """
@@ -11,15 +67,34 @@ class NERResumeParser:
     Extracts: Names, Organizations, Dates, Locations, Skills
     """
     
-    def __init__(self):
-        self.nlp = nlp
+    def __init__(self, model_name: str = NER_MODEL):
+        self.model_name = model_name
+    
+    @property
+    def nlp(self):
+        # Loaded on the first parse, not when the parser (or this module) is created
+        return get_pipeline(self.model_name)
         
     def parse(self, text: str) -> Dict[str, Any]:
         """
         Parse resume using NER model
         """
-        doc = self.nlp(text)
-        
+        return self._build_result(text, self.nlp(text))
+    
+    def parse_many(
+        self,
+        texts: List[str],
+        batch_size: int = 16,
+        n_process: int = 1
+    ) -> List[Dict[str, Any]]:
+        """
+        Parse many resumes with nlp.pipe; results are in input order.
+        n_process > 1 (or -1 for every core) runs NER in worker processes.
+        """
+        docs = self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+        return [self._build_result(text, doc) for text, doc in zip(texts, docs)]
+    
+    def _build_result(self, text: str, doc) -> Dict[str, Any]:
         entities = {
             'names': [],
             'organizations': [],
@@ -42,16 +117,13 @@ class NERResumeParser:
                 entities['locations'].append(ent.text)
         
         # Extract emails using regex
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        entities['emails'] = re.findall(email_pattern, text)
+        entities['emails'] = EMAIL_PATTERN.findall(text)
         
         # Extract phone numbers
-        phone_pattern = r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]'
-        entities['phones'] = re.findall(phone_pattern, text)
+        entities['phones'] = PHONE_PATTERN.findall(text)
         
         # Extract URLs
-        url_pattern = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-        entities['urls'] = re.findall(url_pattern, text)
+        entities['urls'] = URL_PATTERN.findall(text)
         
         # Get primary name (usually first person mentioned)
         primary_name = entities['names'][0] if entities['names'] else None
@@ -71,41 +143,59 @@ class NERResumeParser:
             'entities': entities,
             'sections': sections,
             'word_count': len(text.split()),
-            'sentence_count': len(list(doc.sents))
+            'sentence_count': sum(1 for _ in doc.sents)
         }
     
     def _extract_sections(self, text: str) -> Dict[str, str]:
         """
         Extract different sections from resume
         """
-        sections = {}
-        
-        section_headers = {
-            'experience': r'(?i)(work experience|experience|employment|professional experience)',
-            'education': r'(?i)(education|academic|qualifications)',
-            'skills': r'(?i)(skills|technical skills|competencies)',
-            'projects': r'(?i)(projects|portfolio)',
-            'certifications': r'(?i)(certifications|certificates|licenses)'
+        return {
+            header: text[start:end].strip()
+            for header, (start, end) in self._section_offsets(text).items()
         }
+    
+    def _section_offsets(self, text: str) -> Dict[str, Tuple[int, int]]:
+        """
+        (start, end) offsets of each section's body, found in linear time.
+        A section runs from the line after the first header line of its type
+        to the next header line of any type.
+        """
+        # Same length as text, and a header term occurs in it exactly where
+        # a case-insensitive regex would find one in text
+        if any(chr(code) in text for code in CASEFOLD_EXCEPTIONS):
+            text = text.translate(CASEFOLD_EXCEPTIONS)
+        text_lower = text.lower()
+        header_starts = self._header_line_starts(text_lower)
         
-        lines = text.split('\n')
-        current_section = None
-        
-        for header, pattern in section_headers.items():
-            for i, line in enumerate(lines):
-                if re.search(pattern, line):
-                    # Found section header
-                    section_content = []
-                    j = i + 1
-                    while j < len(lines):
-                        next_line = lines[j]
-                        # Check if we hit another section
-                        if any(re.search(p, next_line) for p in section_headers.values()):
-                            break
-                        section_content.append(next_line)
-                        j += 1
-                    
-                    sections[header] = '\n'.join(section_content).strip()
-                    break
+        offsets = {}
+        for header, terms in SECTION_TERMS.items():
+            # The first header line of a type holds the earliest occurrence of its terms
+            found = [p for p in (text_lower.find(term) for term in terms) if p != -1]
+            if not found:
+                continue
+            position = min(found)
+            
+            line_start = text_lower.rfind('\n', 0, position) + 1
+            line_end = text_lower.find('\n', position)
+            if line_end == -1:
+                line_end = len(text)
+            following = bisect.bisect_right(header_starts, line_start)
+            body_end = header_starts[following] - 1 if following < len(header_starts) else len(text)
+            offsets[header] = (line_end + 1, body_end)
         
-        return sections
+        return offsets
+    
+    def _header_line_starts(self, text_lower: str) -> List[int]:
+        """
+        Sorted start offsets of every line containing a header term
+        """
+        line_starts = set()
+        for needle in SECTION_HEADER_NEEDLES:
+            position = text_lower.find(needle)
+            while position != -1:
+                line_starts.add(text_lower.rfind('\n', 0, position) + 1)
+                # Continue on the next line so every line is scanned once per needle
+                line_end = text_lower.find('\n', position)
+                position = text_lower.find(needle, line_end + 1) if line_end != -1 else -1
+        return sorted(line_starts)
@@ -0,0 +1,97 @@
+import logging
+import os
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+from utils.model_registry import DEFAULT_SENTENCE_MODEL, get_encoder
+from utils.vector_index import VectorIndex
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_DIR = os.getenv(
+    'RESUME_INDEX_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'resume_index')
+)
+
+
+class ResumeIndex:
+    """
+    Persistent embedding index of resumes for job-to-candidate retrieval.
+    Embeds with the same shared Sentence-BERT model SimilarityEngine uses,
+    so search scores are cosine similarities on the same scale as
+    SimilarityEngine.calculate_text_similarity.
+    Not wired into the HTTP API: callers build, query and save() it directly.
+    """
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_SENTENCE_MODEL,
+        index_dir: str = None,
+        mode: str = 'exact',
+        nprobe: int = 8,
+        encode_batch_size: int = 64
+    ):
+        self.model_name = model_name
+        self.model = get_encoder(model_name)
+        self.index_dir = index_dir or DEFAULT_INDEX_DIR
+        self.encode_batch_size = encode_batch_size
+        self.index = self._load_or_create(mode, nprobe)
+
+    def _load_or_create(self, mode: str, nprobe: int) -> VectorIndex:
+        if os.path.exists(os.path.join(self.index_dir, 'manifest.json')):
+            try:
+                index = VectorIndex.load(self.index_dir)
+                if index.metadata.get('model_name') == self.model_name:
+                    index.nprobe = nprobe
+                    if index.mode != mode:
+                        logger.warning(f"⚠️ Resume index was built in '{index.mode}' mode; keeping it")
+                    return index
+                logger.warning(
+                    f"⚠️ Resume index in {self.index_dir} was built with "
+                    f"'{index.metadata.get('model_name')}', starting a new one"
+                )
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"⚠️ Unreadable resume index in {self.index_dir}: {e}")
+
+        return VectorIndex(mode=mode, nprobe=nprobe, metadata={'model_name': self.model_name})
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(
+            self.model.encode(texts, batch_size=self.encode_batch_size, normalize_embeddings=True),
+            dtype=np.float32
+        )
+
+    def add(self, resumes: Dict[str, str]):
+        """
+        Index (or re-index) resumes given as {resume_id: resume_text}
+        """
+        resumes = {str(resume_id): text for resume_id, text in resumes.items() if text}
+        if not resumes:
+            return
+        self.index.add(list(resumes), self._encode(list(resumes.values())))
+        logger.info(f"📇 Indexed {len(resumes)} resumes ({len(self.index)} total)")
+
+    def delete(self, resume_ids: Iterable[str]) -> int:
+        return self.index.delete(str(resume_id) for resume_id in resume_ids)
+
+    def search(self, job_description: str, top_k: int = 10, nprobe: int = None) -> List[Dict]:
+        """
+        Top-K resumes most similar to a job description
+        """
+        if not job_description or not len(self.index):
+            return []
+        query = self._encode([job_description])[0]
+        return [
+            {'resume_id': resume_id, 'similarity': round(similarity, 4)}
+            for resume_id, similarity in self.index.search(query, top_k=top_k, nprobe=nprobe)
+        ]
+
+    def save(self):
+        self.index.save(self.index_dir)
+
+    def stats(self) -> Dict:
+        return {'model_name': self.model_name, 'index_dir': self.index_dir, **self.index.stats()}
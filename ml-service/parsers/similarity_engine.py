@@ -1,15 +1,28 @@
-from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 from typing import List, Dict, Tuple
 
+from utils.model_registry import DEFAULT_SENTENCE_MODEL, get_encoder
+
+MATCH_THRESHOLD = 0.7  # Similarity threshold
+EXACT_MATCH_THRESHOLD = 0.95
+
 class SimilarityEngine:
     """
     Sentence-BERT based similarity matching between resume and job requirements
     """
     
-    def __init__(self):
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+    def __init__(
+        self,
+        model_name: str = DEFAULT_SENTENCE_MODEL,
+        encode_batch_size: int = 64,
+        block_size: int = 1024
+    ):
+        # Same shared instance AdvancedSkillExtractor uses
+        self.model = get_encoder(model_name)
+        self.encode_batch_size = encode_batch_size
+        # Rows per matrix product when ranking many candidates
+        self.block_size = block_size
     
     def calculate_skill_similarity(
         self,
@@ -35,22 +48,33 @@ class SimilarityEngine:
         similarity_matrix = cosine_similarity(resume_embeddings, job_embeddings)
         
         # Find best matches for each job skill
+        best_indices = np.argmax(similarity_matrix, axis=0)
+        best_similarities = similarity_matrix[best_indices, np.arange(len(job_skills))]
+        
+        return self._summarize_matches(resume_skills, job_skills, best_indices, best_similarities)
+    
+    @staticmethod
+    def _summarize_matches(
+        resume_skills: List[str],
+        job_skills: List[str],
+        best_indices: np.ndarray,
+        best_similarities: np.ndarray
+    ) -> Dict[str, any]:
+        """
+        Build the match report from the best resume skill for every job skill
+        """
         skill_matches = []
         matched_job_skills = []
-        threshold = 0.7  # Similarity threshold
         
         for job_idx, job_skill in enumerate(job_skills):
-            # Get similarities for this job skill
-            similarities = similarity_matrix[:, job_idx]
-            best_match_idx = np.argmax(similarities)
-            best_similarity = similarities[best_match_idx]
+            best_similarity = best_similarities[job_idx]
             
-            if best_similarity >= threshold:
+            if best_similarity >= MATCH_THRESHOLD:
                 skill_matches.append({
                     'job_skill': job_skill,
-                    'resume_skill': resume_skills[best_match_idx],
+                    'resume_skill': resume_skills[best_indices[job_idx]],
                     'similarity': float(best_similarity),
-                    'match_type': 'exact' if best_similarity > 0.95 else 'similar'
+                    'match_type': 'exact' if best_similarity > EXACT_MATCH_THRESHOLD else 'similar'
                 })
                 matched_job_skills.append(job_skill)
         
@@ -92,23 +116,107 @@ class SimilarityEngine:
     def rank_candidates(
         self,
         resumes: List[Dict],
-        job_requirements: Dict
+        job_requirements: Dict,
+        top_k: int = None
     ) -> List[Dict]:
         """
-        Rank multiple resumes based on similarity to job requirements
+        Rank multiple resumes based on similarity to job requirements.
+        Job skills are encoded once and every distinct resume skill once across
+        the whole candidate set; best matches come from blocked matrix products.
+        Returned resumes get 'similarity_score' and the full
+        calculate_skill_similarity report under 'skill_similarity'.
         """
-        ranked_resumes = []
+        job_skills = job_requirements.get('required_skills', [])
+        resume_skills = [resume.get('skills', []) or [] for resume in resumes]
+        if not resumes:
+            return []
         
-        for resume in resumes:
-            similarity_score = self.calculate_skill_similarity(
-                resume.get('skills', []),
-                job_requirements.get('required_skills', [])
-            )
-            
-            resume['similarity_score'] = similarity_score['overall_similarity']
-            ranked_resumes.append(resume)
+        best_indices, best_similarities = self._best_matches_batch(resume_skills, job_skills)
+        
+        # Same rounding calculate_skill_similarity applies, so ties sort identically
+        match_counts = (best_similarities >= MATCH_THRESHOLD).sum(axis=1).tolist()
+        scores = [
+            round((count / len(job_skills)) * 100, 2) if job_skills else 0.0
+            for count in match_counts
+        ]
+        
+        # Stable sort keeps input order between equal scores (descending)
+        order = np.argsort(-np.asarray(scores, dtype=np.float64), kind='stable')
+        if top_k is not None:
+            order = order[:top_k]
         
-        # Sort by similarity score (descending)
-        ranked_resumes.sort(key=lambda x: x['similarity_score'], reverse=True)
+        ranked_resumes = []
+        for i in order.tolist():
+            resume = resumes[i]
+            if resume_skills[i] and job_skills:
+                details = self._summarize_matches(
+                    resume_skills[i], job_skills, best_indices[i], best_similarities[i]
+                )
+            else:
+                details = {
+                    'overall_similarity': 0.0,
+                    'matched_skills': [],
+                    'missing_skills': job_skills,
+                    'skill_matches': []
+                }
+            resume['similarity_score'] = scores[i]
+            resume['skill_similarity'] = details
+            ranked_resumes.append(resume)
         
         return ranked_resumes
+    
+    def _best_matches_batch(
+        self,
+        resume_skills: List[List[str]],
+        job_skills: List[str]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        For every resume and job skill, the position of the best matching resume
+        skill and its cosine similarity; (N, J) arrays, -inf where a resume has no skills
+        """
+        n_resumes, n_job = len(resume_skills), len(job_skills)
+        best_indices = np.zeros((n_resumes, n_job), dtype=np.int64)
+        best_similarities = np.full((n_resumes, n_job), -np.inf, dtype=np.float32)
+        
+        # Vocabulary of distinct skills across all candidates
+        vocabulary: Dict[str, int] = {}
+        skill_ids = [[vocabulary.setdefault(skill, len(vocabulary)) for skill in skills] for skills in resume_skills]
+        if not vocabulary or not n_job:
+            return best_indices, best_similarities
+        
+        job_embeddings = self._encode_normalized(job_skills)
+        vocab_embeddings = self._encode_normalized(list(vocabulary))
+        
+        # (V + 1, J) similarity table; the extra -inf row pads short skill lists
+        n_vocab = len(vocabulary)
+        table = np.empty((n_vocab + 1, n_job), dtype=np.float32)
+        for start in range(0, n_vocab, self.block_size):
+            stop = min(start + self.block_size, n_vocab)
+            table[start:stop] = vocab_embeddings[start:stop] @ job_embeddings.T
+        table[n_vocab] = -np.inf
+        
+        for start in range(0, n_resumes, self.block_size):
+            stop = min(start + self.block_size, n_resumes)
+            block = skill_ids[start:stop]
+            width = max(1, max(len(ids) for ids in block))
+            padded = np.full((len(block), width), n_vocab, dtype=np.int64)
+            for row, ids in enumerate(block):
+                padded[row, :len(ids)] = ids
+            
+            # (B, width, J) -> best skill position per (resume, job skill)
+            block_similarities = table[padded]
+            block_best = block_similarities.argmax(axis=1)
+            best_indices[start:stop] = block_best
+            best_similarities[start:stop] = np.take_along_axis(
+                block_similarities, block_best[:, None, :], axis=1
+            )[:, 0, :]
+        
+        return best_indices, best_similarities
+    
+    def _encode_normalized(self, texts: List[str]) -> np.ndarray:
+        embeddings = self.model.encode(
+            texts,
+            batch_size=self.encode_batch_size,
+            normalize_embeddings=True
+        )
+        return np.asarray(embeddings, dtype=np.float32)
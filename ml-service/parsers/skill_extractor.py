@@ -1,68 +1,43 @@
-from sentence_transformers import SentenceTransformer
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 from typing import List, Dict, Tuple, Any
 import re
 
+from parsers.skill_taxonomy import get_taxonomy
+from utils.embedding_cache import load_or_compute
+from utils.model_registry import DEFAULT_SENTENCE_MODEL, get_encoder
+
 class AdvancedSkillExtractor:
     """
     Hybrid skill extraction using BERT embeddings + TF-IDF
     """
     
-    def __init__(self):
-        # Load Sentence-BERT model
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+    def __init__(self, model_name: str = DEFAULT_SENTENCE_MODEL, encode_batch_size: int = 32):
+        # Shared Sentence-BERT model (loaded once per process)
+        self.model = get_encoder(model_name)
+        
+        # Sentences per forward pass in semantic matching
+        self.encode_batch_size = encode_batch_size
         
-        # Comprehensive skill database
+        # Comprehensive skill database. The extractor keeps the taxonomy it
+        # started with: its skill embeddings are computed for exactly this list.
+        self.taxonomy = get_taxonomy()
         self.skill_database = self._load_skill_database()
         
-        # Pre-compute skill embeddings
-        self.skill_embeddings = self.model.encode(self.skill_database)
+        # Pre-computed skill embeddings, unit length so cosine similarity is a
+        # single matrix product. Memory-mapped from the on-disk cache and only
+        # re-encoded when the model or the skill list changes.
+        self.skill_embeddings = load_or_compute(
+            model_name,
+            self.skill_database,
+            lambda skills: self._normalize_rows(self.model.encode(skills, batch_size=self.encode_batch_size))
+        )
         
     def _load_skill_database(self) -> List[str]:
         """
-        Load comprehensive skill database
+        Load comprehensive skill database (semantic_skills in the skill taxonomy)
         """
-        skills = [
-            # Programming Languages
-            'Python', 'Java', 'JavaScript', 'TypeScript', 'C++', 'C#', 'Go', 'Rust',
-            'Ruby', 'PHP', 'Swift', 'Kotlin', 'Scala', 'R', 'MATLAB', 'SQL',
-            
-            # Web Technologies
-            'HTML', 'CSS', 'React', 'Angular', 'Vue.js', 'Node.js', 'Express',
-            'Django', 'Flask', 'FastAPI', 'Spring Boot', 'ASP.NET', 'Laravel',
-            'Next.js', 'Nuxt.js', 'Svelte', 'jQuery', 'Bootstrap', 'Tailwind CSS',
-            
-            # Mobile Development
-            'React Native', 'Flutter', 'iOS Development', 'Android Development',
-            'Swift UI', 'Jetpack Compose',
-            
-            # Databases
-            'MongoDB', 'PostgreSQL', 'MySQL', 'Redis', 'Elasticsearch', 'Cassandra',
-            'Oracle', 'SQL Server', 'DynamoDB', 'Firebase', 'Neo4j',
-            
-            # Cloud & DevOps
-            'AWS', 'Azure', 'Google Cloud', 'Docker', 'Kubernetes', 'Jenkins',
-            'GitLab CI', 'GitHub Actions', 'Terraform', 'Ansible', 'CI/CD',
-            
-            # Machine Learning
-            'Machine Learning', 'Deep Learning', 'TensorFlow', 'PyTorch', 'Keras',
-            'Scikit-learn', 'NLP', 'Computer Vision', 'Neural Networks',
-            
-            # Data Science
-            'Pandas', 'NumPy', 'Matplotlib', 'Seaborn', 'Data Analysis',
-            'Data Visualization', 'Statistical Analysis',
-            
-            # Tools
-            'Git', 'GitHub', 'GitLab', 'Bitbucket', 'JIRA', 'Confluence',
-            'VS Code', 'IntelliJ IDEA', 'Postman', 'Swagger',
-            
-            # Methodologies
-            'Agile', 'Scrum', 'Kanban', 'Test-Driven Development', 'Microservices',
-            'REST API', 'GraphQL', 'WebSockets', 'Object-Oriented Programming'
-        ]
-        return skills
+        return list(self.taxonomy.semantic_skills)
     
     def extract_skills(self, text: str, threshold: float = 0.7) -> Dict[str, Any]:
         """
@@ -92,78 +67,60 @@ class AdvancedSkillExtractor:
         TF-IDF based exact skill matching
         """
         text_lower = text.lower()
-        found_skills = []
-        
-        for skill in self.skill_database:
-            if skill.lower() in text_lower:
-                found_skills.append(skill)
-        
-        return found_skills
+        return [
+            skill for skill, skill_lower in zip(self.taxonomy.semantic_skills, self.taxonomy.semantic_skills_lower)
+            if skill_lower in text_lower
+        ]
     
     def _semantic_skill_matching(self, text: str, threshold: float) -> List[str]:
         """
         BERT-based semantic skill matching
         """
         # Split text into sentences/chunks
-        sentences = text.split('.')
-        found_skills = []
-        
-        for sentence in sentences[:50]:  # Limit to first 50 sentences
-            if len(sentence.strip()) < 10:
-                continue
-                
-            # Get sentence embedding
-            sentence_embedding = self.model.encode([sentence])[0]
-            
-            # Calculate similarity with all skills
-            similarities = cosine_similarity(
-                [sentence_embedding],
-                self.skill_embeddings
-            )[0]
-            
-            # Find skills above threshold
-            for idx, similarity in enumerate(similarities):
-                if similarity >= threshold:
-                    skill = self.skill_database[idx]
-                    if skill not in found_skills:
-                        found_skills.append(skill)
-        
-        return found_skills
+        sentences = [
+            sentence for sentence in text.split('.')[:50]  # Limit to first 50 sentences
+            if len(sentence.strip()) >= 10
+        ]
+        if not sentences:
+            return []
+        
+        # Encode every chunk in batched forward passes
+        sentence_embeddings = self.model.encode(
+            sentences,
+            batch_size=self.encode_batch_size,
+            normalize_embeddings=True
+        )
+        
+        # Cosine similarity of every chunk against every skill at once
+        similarities = np.asarray(sentence_embeddings, dtype=np.float32) @ self.skill_embeddings.T
+        hits = similarities >= threshold
+        
+        # Skills above threshold, ordered by the first chunk that matched them
+        matched_idx = np.flatnonzero(hits.any(axis=0))
+        first_chunk = hits[:, matched_idx].argmax(axis=0)
+        order = matched_idx[np.lexsort((matched_idx, first_chunk))]
+        
+        return [self.skill_database[idx] for idx in order]
+    
+    @staticmethod
+    def _normalize_rows(embeddings) -> np.ndarray:
+        """
+        Scale each embedding to unit length (zero rows stay zero)
+        """
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
     
     def _categorize_skills(self, skills: List[str]) -> Dict[str, List[str]]:
         """
         Categorize skills into groups
         """
-        categories = {
-            'programming_languages': [],
-            'frameworks': [],
-            'databases': [],
-            'cloud_devops': [],
-            'ml_ai': [],
-            'tools': [],
-            'methodologies': []
-        }
-        
-        # Simple categorization logic
-        prog_langs = ['Python', 'Java', 'JavaScript', 'C++', 'Go', 'Ruby']
-        frameworks = ['React', 'Angular', 'Vue', 'Django', 'Flask', 'Spring']
-        databases = ['MongoDB', 'PostgreSQL', 'MySQL', 'Redis']
-        cloud = ['AWS', 'Azure', 'Docker', 'Kubernetes']
-        ml = ['Machine Learning', 'TensorFlow', 'PyTorch']
+        categories = {name: [] for name in self.taxonomy.category_names}
+        categories.setdefault(self.taxonomy.default_category, [])
         
         for skill in skills:
-            if skill in prog_langs:
-                categories['programming_languages'].append(skill)
-            elif skill in frameworks:
-                categories['frameworks'].append(skill)
-            elif skill in databases:
-                categories['databases'].append(skill)
-            elif skill in cloud:
-                categories['cloud_devops'].append(skill)
-            elif skill in ml:
-                categories['ml_ai'].append(skill)
-            else:
-                categories['tools'].append(skill)
+            categories[self.taxonomy.category_of(skill)].append(skill)
         
         return {k: v for k, v in categories.items() if v}  # Remove empty categories
     
@@ -0,0 +1,238 @@
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+# Characters the legacy per-skill patterns accepted around a match:
+# (?:^|[\s,\.\-\(\)\[\]\{\}]) ... (?:$|[\s,\.\-\(\)\[\]\{\}])
+_EDGE_PUNCT = frozenset(',.-()[]{}')
+
+# Characters a space inside a multi-word skill may stretch over: [\s\-\_]*
+_GAP_PUNCT = frozenset('-_')
+
+# A skill can only start where the previous character is not a word char
+_CANDIDATE_START = re.compile(r'(?<!\w)\S')
+
+# Boundary kinds
+EDGE = 'edge'   # separator boundaries (long skills and variations)
+WORD = 'word'   # regex \b boundaries (very short skills: C, R, Go, C++)
+KINDS = (EDGE, WORD)
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+def _is_edge(ch: str) -> bool:
+    return ch.isspace() or ch in _EDGE_PUNCT
+
+
+class _Node:
+    __slots__ = ('children', 'gap', 'terminals')
+    # Declared here: annotations on self.<attr> are evaluated on every __init__
+    children: Dict[str, '_Node']
+    gap: Optional['_Node']
+    terminals: List[Tuple[str, str]]
+
+    def __init__(self):
+        self.children = {}
+        self.gap = None
+        self.terminals = []
+
+
+class SkillMatcher:
+    """
+    Boundary-aware trie that finds every canonical skill in one pass over the text.
+    Built once at startup; per-request cost depends on text length, not taxonomy size.
+    """
+
+    def __init__(self):
+        self._root = _Node()
+        self.size = 0
+        # Set when a \b-bounded phrase starts with a non-word char (e.g. '#x'),
+        # which can then begin right after a word char
+        self._scan_every_position = False
+
+    @classmethod
+    def from_taxonomy(cls, skills: Iterable[str], variations: Dict[str, str]) -> 'SkillMatcher':
+        """
+        Build a matcher with the same rules extract_skills used per skill
+        """
+        matcher = cls()
+        for skill in skills:
+            matcher.add_skill(skill)
+        for variant, canonical in variations.items():
+            matcher.add_variation(variant, canonical)
+        return matcher
+
+    def add_skill(self, skill: str):
+        """
+        Register a canonical skill name.
+        Very short skills (C, R, C++, Go) need strict word boundaries; longer ones
+        accept separators around them and let spaces stretch over [\\s-_]*.
+        """
+        skill_lower = skill.lower()
+        if len(skill_lower.replace('+', '').replace('#', '').replace('.', '')) <= 2:
+            self._insert(skill_lower, skill, WORD, flexible_spaces=False)
+        else:
+            self._insert(skill_lower, skill, EDGE, flexible_spaces=True)
+
+    def add_variation(self, variant: str, canonical: str):
+        """
+        Register an alias that maps to a canonical skill (spaces match literally)
+        """
+        self._insert(variant.lower(), canonical, EDGE, flexible_spaces=False)
+
+    def _insert(self, phrase: str, canonical: str, kind: str, flexible_spaces: bool):
+        if not phrase:
+            return
+        if kind == WORD and not _is_word(phrase[0]):
+            self._scan_every_position = True
+        node = self._root
+        for ch in phrase:
+            if ch == ' ' and flexible_spaces:
+                if node.gap is None:
+                    node.gap = _Node()
+                node = node.gap
+            else:
+                node = node.children.setdefault(ch, _Node())
+        if (canonical, kind) not in node.terminals:
+            node.terminals.append((canonical, kind))
+            self.size += 1
+
+    def to_arrays(self) -> Tuple[Dict[str, np.ndarray], Dict]:
+        """
+        Flat form of the trie for the taxonomy artifact: nodes numbered
+        breadth-first, children/terminals as CSR arrays (offsets per node
+        into a shared edge/terminal array), gap child -1 when absent.
+        Returns (arrays, metadata); metadata holds the terminal names.
+        """
+        nodes = [self._root]
+        index = {id(self._root): 0}
+        child_offsets, child_chars, child_nodes = [0], [], []
+        terminal_offsets, terminal_names, terminal_kinds = [0], [], []
+        gaps = []
+        names: Dict[str, int] = {}
+
+        def number(node: _Node) -> int:
+            if id(node) not in index:
+                index[id(node)] = len(nodes)
+                nodes.append(node)
+            return index[id(node)]
+
+        position = 0
+        while position < len(nodes):
+            node = nodes[position]
+            position += 1
+            for ch, child in node.children.items():
+                child_chars.append(ord(ch))
+                child_nodes.append(number(child))
+            child_offsets.append(len(child_chars))
+            gaps.append(number(node.gap) if node.gap is not None else -1)
+            for canonical, kind in node.terminals:
+                terminal_names.append(names.setdefault(canonical, len(names)))
+                terminal_kinds.append(KINDS.index(kind))
+            terminal_offsets.append(len(terminal_names))
+
+        arrays = {
+            'child_offsets': np.array(child_offsets, dtype=np.int32),
+            'child_chars': np.array(child_chars, dtype=np.uint32),
+            'child_nodes': np.array(child_nodes, dtype=np.int32),
+            'gaps': np.array(gaps, dtype=np.int32),
+            'terminal_offsets': np.array(terminal_offsets, dtype=np.int32),
+            'terminal_names': np.array(terminal_names, dtype=np.int32),
+            'terminal_kinds': np.array(terminal_kinds, dtype=np.uint8)
+        }
+        metadata = {
+            'names': list(names),
+            'size': self.size,
+            'scan_every_position': self._scan_every_position
+        }
+        return arrays, metadata
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], metadata: Dict) -> 'SkillMatcher':
+        """
+        Rebuild the matcher from to_arrays() output (e.g. memory-mapped)
+        """
+        matcher = cls()
+        matcher.size = metadata['size']
+        matcher._scan_every_position = metadata['scan_every_position']
+        names = metadata['names']
+
+        child_offsets = arrays['child_offsets'].tolist()
+        child_chars = [chr(code) for code in arrays['child_chars'].tolist()]
+        child_nodes = arrays['child_nodes'].tolist()
+        terminal_offsets = arrays['terminal_offsets'].tolist()
+        terminals = [
+            (names[name], KINDS[kind])
+            for name, kind in zip(arrays['terminal_names'].tolist(), arrays['terminal_kinds'].tolist())
+        ]
+        gaps = arrays['gaps'].tolist()
+
+        nodes = [matcher._root] + [_Node() for _ in range(len(gaps) - 1)]
+        for i, node in enumerate(nodes):
+            start, end = child_offsets[i], child_offsets[i + 1]
+            if end > start:
+                node.children = {
+                    ch: nodes[child] for ch, child in zip(child_chars[start:end], child_nodes[start:end])
+                }
+            if gaps[i] >= 0:
+                node.gap = nodes[gaps[i]]
+            start, end = terminal_offsets[i], terminal_offsets[i + 1]
+            if end > start:
+                node.terminals = terminals[start:end]
+        return matcher
+
+    def match(self, text_lower: str) -> Set[str]:
+        """
+        Return the canonical skills found in already-lowercased text
+        """
+        found = set()
+        root_children = self._root.children
+        if self._scan_every_position:
+            starts = range(len(text_lower))
+        else:
+            starts = (m.start() for m in _CANDIDATE_START.finditer(text_lower))
+        for start in starts:
+            if text_lower[start] in root_children:
+                self._walk(text_lower, self._root, start, start, found)
+        return found
+
+    def _walk(self, text: str, node: _Node, pos: int, start: int, found: Set[str]):
+        n = len(text)
+        while True:
+            if node.terminals:
+                self._collect(text, node, start, pos, found)
+
+            if node.gap is not None:
+                # [\s\-\_]* - try every gap length, including zero
+                gap_end = pos
+                self._walk(text, node.gap, gap_end, start, found)
+                while gap_end < n and (text[gap_end].isspace() or text[gap_end] in _GAP_PUNCT):
+                    gap_end += 1
+                    self._walk(text, node.gap, gap_end, start, found)
+
+            if pos >= n:
+                return
+            node = node.children.get(text[pos])
+            if node is None:
+                return
+            pos += 1
+
+    @staticmethod
+    def _collect(text: str, node: _Node, start: int, end: int, found: Set[str]):
+        n = len(text)
+        for canonical, kind in node.terminals:
+            if canonical in found:
+                continue
+            if kind == EDGE:
+                left_ok = start == 0 or _is_edge(text[start - 1])
+                right_ok = end == n or _is_edge(text[end])
+            else:
+                first_is_word = _is_word(text[start])
+                last_is_word = _is_word(text[end - 1])
+                left_ok = first_is_word != (start > 0 and _is_word(text[start - 1]))
+                right_ok = last_is_word != (end < n and _is_word(text[end]))
+            if left_ok and right_ok:
+                found.add(canonical)
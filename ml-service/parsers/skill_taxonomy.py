@@ -0,0 +1,399 @@
+"""
+Skill taxonomy: one JSON source (taxonomy/skills.json) compiled into a
+versioned binary artifact holding everything per-request code needs -
+the SkillMatcher trie, canonical skill ids, the implication rules and the
+category map. The artifact is data only: a JSON header (format version,
+compiler fingerprint, source hash, rules) followed by the trie as flat
+numpy arrays, which workers memory-map. Each worker swaps in a new
+artifact when it changes on disk, so a taxonomy update is deployed by
+recompiling:
+
+    python -m parsers.skill_taxonomy [--source taxonomy/skills.json] [--out <artifact>]
+"""
+import argparse
+import hashlib
+import inspect
+import json
+import logging
+import marshal
+import os
+import struct
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from parsers import skill_matcher
+from parsers.skill_matcher import SkillMatcher
+
+logger = logging.getLogger(__name__)
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_SOURCE = os.getenv('SKILL_TAXONOMY_SOURCE', os.path.join(SERVICE_DIR, 'taxonomy', 'skills.json'))
+DEFAULT_ARTIFACT = os.getenv('SKILL_TAXONOMY_ARTIFACT', os.path.join(SERVICE_DIR, '.cache', 'taxonomy', 'skills.sktx'))
+
+# Seconds between checks of the artifact for a newer version
+RELOAD_INTERVAL_SECONDS = float(os.getenv('SKILL_TAXONOMY_RELOAD_SECONDS', '5'))
+
+# Artifact layout: preamble (magic, format version, header length), the
+# UTF-8 JSON header, then every array at a 64-byte aligned offset
+ARTIFACT_MAGIC = b'SKTX'
+# Bump when the layout changes; compiler changes are caught by COMPILER_FINGERPRINT
+ARTIFACT_FORMAT_VERSION = 2
+_PREAMBLE = struct.Struct('<4sII')
+_ALIGNMENT = 64
+
+
+class TaxonomyError(ValueError):
+    """
+    Raised for an invalid taxonomy source or an unreadable artifact
+    """
+
+
+class CompiledTaxonomy:
+    """
+    Everything extract_skills and AdvancedSkillExtractor look up per request,
+    built once from the source file
+    """
+
+    def __init__(self, source: Dict, source_hash: str, matcher: SkillMatcher = None):
+        # Kept for the artifact header
+        self.source = source
+        self.version = str(source.get('version', '0'))
+        self.source_hash = source_hash
+        # Identifies what this build answers: the source and the code that compiled it
+        self.key = hashlib.sha256(f'{COMPILER_FINGERPRINT}:{source_hash}'.encode('utf-8')).hexdigest()
+        self.groups: Dict[str, Tuple[str, ...]] = {
+            group['name']: tuple(group['skills']) for group in source['groups']
+        }
+        # Canonical skills in source order (duplicates kept, as in the old SKILLS list)
+        self.skills: Tuple[str, ...] = tuple(skill for skills in self.groups.values() for skill in skills)
+        self.variations: Dict[str, str] = dict(source.get('variations', {}))
+
+        # Canonical ids: every distinct skill name the taxonomy can produce
+        names = list(self.skills) + list(self.variations.values())
+        for rule in source.get('parents', []):
+            names.append(rule['skill'])
+        for rule in source.get('implied', []):
+            names.append(rule['skill'])
+        self.normalize: Dict[str, str] = dict(source.get('normalize', {}))
+        names.extend(self.normalize.values())
+        self.skill_ids: Dict[str, int] = {}
+        for name in names:
+            self.skill_ids.setdefault(name, len(self.skill_ids))
+
+        # Given when loading an artifact, which stores the trie already built
+        self.matcher = matcher or SkillMatcher.from_taxonomy(self.skills, self.variations)
+
+        # Implication graph, in rule order (a parent added by one rule can satisfy a later one)
+        self.parent_rules: Tuple[Tuple[str, Tuple[str, ...], Tuple[str, ...]], ...] = tuple(
+            (rule['skill'], tuple(rule['children']), tuple(child.lower() for child in rule['children']))
+            for rule in source.get('parents', [])
+        )
+        self.implied_rules: Tuple[Tuple[str, frozenset], ...] = tuple(
+            (rule['skill'], frozenset(rule['if_any'])) for rule in source.get('implied', [])
+        )
+
+        self.default_category = source.get('default_category', 'other')
+        self.category_names: Tuple[str, ...] = tuple(source.get('categories', {}))
+        self.categories: Dict[str, str] = {}
+        for category, skills in source.get('categories', {}).items():
+            for skill in skills:
+                self.categories.setdefault(skill, category)
+
+        self.semantic_skills: Tuple[str, ...] = tuple(source.get('semantic_skills', ()))
+        self.semantic_skills_lower: Tuple[str, ...] = tuple(skill.lower() for skill in self.semantic_skills)
+
+    def category_of(self, skill: str) -> str:
+        return self.categories.get(skill, self.default_category)
+
+    def expand(self, found_skills: Set[str], text_lower: str) -> Set[str]:
+        """
+        Apply the implication graph to matcher output: parents of found (or
+        mentioned) children, name normalization, then implied skills
+        """
+        for parent, children, children_lower in self.parent_rules:
+            for child, child_lower in zip(children, children_lower):
+                if child in found_skills or child_lower in text_lower:
+                    found_skills.add(parent)
+                    break
+
+        normalize = self.normalize
+        found_skills = {normalize.get(skill, skill) for skill in found_skills}
+
+        for skill, triggers in self.implied_rules:
+            if not triggers.isdisjoint(found_skills):
+                found_skills.add(skill)
+        return found_skills
+
+    def info(self) -> Dict:
+        return {
+            'version': self.version,
+            'source_hash': self.source_hash,
+            'compiler': COMPILER_FINGERPRINT,
+            'skills': len(self.skill_ids),
+            'variations': len(self.variations),
+            'matcher_terms': self.matcher.size,
+            'parent_rules': len(self.parent_rules),
+            'implied_rules': len(self.implied_rules),
+            'semantic_skills': len(self.semantic_skills)
+        }
+
+
+def _compute_compiler_version() -> str:
+    """
+    Fingerprint of the code that turns a source into a CompiledTaxonomy and
+    matches with it, so a build (and anything cached from it) is keyed to
+    the compiler as well as the source
+    """
+    digest = hashlib.sha256(COMPILER_VERSION.encode('utf-8'))
+    namespaces = [CompiledTaxonomy] + [
+        obj for obj in vars(skill_matcher).values()
+        if inspect.isclass(obj) and obj.__module__ == skill_matcher.__name__
+    ]
+    functions = [obj for obj in vars(skill_matcher).values() if inspect.isfunction(obj)]
+    for namespace in namespaces:
+        for obj in vars(namespace).values():
+            obj = getattr(obj, '__func__', obj)
+            if inspect.isfunction(obj):
+                functions.append(obj)
+    for func in sorted(functions, key=lambda func: func.__qualname__):
+        digest.update(marshal.dumps(func.__code__))
+    return digest.hexdigest()[:16]
+
+
+# Bump by hand for compiler changes the fingerprint cannot see (e.g. module-level tables)
+COMPILER_VERSION = "1"
+COMPILER_FINGERPRINT = _compute_compiler_version()
+
+
+def source_hash(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+
+def compile_source(path: str = None) -> CompiledTaxonomy:
+    path = path or DEFAULT_SOURCE
+    with open(path, 'rb') as f:
+        raw = f.read()
+    try:
+        source = json.loads(raw)
+        return CompiledTaxonomy(source, source_hash(raw))
+    except (ValueError, KeyError, TypeError) as e:
+        raise TaxonomyError(f"Invalid skill taxonomy {path}: {e}") from e
+
+
+def write_artifact(taxonomy: CompiledTaxonomy, path: str = None) -> str:
+    """
+    Write the artifact atomically: readers see the old file or the new one,
+    and a worker still mapping the old file keeps a valid mapping
+    """
+    path = path or DEFAULT_ARTIFACT
+    arrays, matcher_metadata = taxonomy.matcher.to_arrays()
+
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        layout[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+        offset += -(-array.nbytes // _ALIGNMENT) * _ALIGNMENT
+    payload = bytearray(offset)
+    for name, array in arrays.items():
+        start = layout[name]['offset']
+        payload[start:start + array.nbytes] = array.tobytes()
+
+    header = json.dumps({
+        'compiler': COMPILER_FINGERPRINT,
+        'source_hash': taxonomy.source_hash,
+        'source': taxonomy.source,
+        'matcher': matcher_metadata,
+        'arrays': layout,
+        'payload_sha256': hashlib.sha256(payload).hexdigest()
+    }).encode('utf-8')
+    # Pad so the payload (and every array in it) starts aligned
+    data_start = -(-(_PREAMBLE.size + len(header)) // _ALIGNMENT) * _ALIGNMENT
+    header += b' ' * (data_start - _PREAMBLE.size - len(header))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        # Readable by workers running as other users
+        os.fchmod(fd, 0o644)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_PREAMBLE.pack(ARTIFACT_MAGIC, ARTIFACT_FORMAT_VERSION, len(header)))
+            f.write(header)
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return path
+
+
+def read_artifact(path: str = None) -> CompiledTaxonomy:
+    """
+    Memory-map an artifact, verify its header and checksum, and rebuild the
+    taxonomy from it. Only JSON and raw arrays are read: nothing in the file
+    is executed. An artifact from another compiler is rejected.
+    """
+    path = path or DEFAULT_ARTIFACT
+    try:
+        mapped = np.memmap(path, dtype=np.uint8, mode='r')
+    except ValueError as e:
+        # Empty file
+        raise TaxonomyError(f"Truncated skill taxonomy artifact {path}: {e}") from e
+    if len(mapped) < _PREAMBLE.size:
+        raise TaxonomyError(f"Truncated skill taxonomy artifact {path}")
+    magic, format_version, header_length = _PREAMBLE.unpack(mapped[:_PREAMBLE.size].tobytes())
+    if magic != ARTIFACT_MAGIC or format_version != ARTIFACT_FORMAT_VERSION:
+        raise TaxonomyError(f"{path} is not a v{ARTIFACT_FORMAT_VERSION} skill taxonomy artifact")
+    data_start = _PREAMBLE.size + header_length
+    try:
+        header = json.loads(mapped[_PREAMBLE.size:data_start].tobytes())
+        if header['compiler'] != COMPILER_FINGERPRINT:
+            raise TaxonomyError(f"{path} was built by compiler {header['compiler']}, not {COMPILER_FINGERPRINT}")
+        payload = mapped[data_start:]
+        if hashlib.sha256(payload).hexdigest() != header['payload_sha256']:
+            raise TaxonomyError(f"Corrupt skill taxonomy artifact {path}")
+        arrays = {}
+        for name, spec in header['arrays'].items():
+            dtype = np.dtype(spec['dtype'])
+            count = int(np.prod(spec['shape']))
+            start = spec['offset']
+            arrays[name] = payload[start:start + count * dtype.itemsize].view(dtype).reshape(spec['shape'])
+        matcher = SkillMatcher.from_arrays(arrays, header['matcher'])
+        return CompiledTaxonomy(header['source'], header['source_hash'], matcher)
+    except (ValueError, KeyError, TypeError, IndexError) as e:
+        raise TaxonomyError(f"Unreadable skill taxonomy artifact {path}: {e}") from e
+
+
+def _file_signature(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+class TaxonomyStore:
+    """
+    Process-wide holder of the current CompiledTaxonomy. get() is a couple of
+    attribute reads; at most every reload_interval it also stats the artifact
+    and, when the file was replaced, loads the new one and swaps the reference.
+    Callers take one taxonomy per request, so a request never mixes versions.
+    """
+
+    def __init__(self, artifact_path: str = None, source_path: str = None,
+                 reload_interval: float = RELOAD_INTERVAL_SECONDS):
+        self.artifact_path = artifact_path or DEFAULT_ARTIFACT
+        self.source_path = source_path or DEFAULT_SOURCE
+        self.reload_interval = reload_interval
+        self._taxonomy: Optional[CompiledTaxonomy] = None
+        self._signature = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self.reloads = 0
+        self.reload_failures = 0
+
+    def get(self) -> CompiledTaxonomy:
+        taxonomy = self._taxonomy
+        if taxonomy is None or time.monotonic() >= self._next_check:
+            taxonomy = self._refresh()
+        return taxonomy
+
+    def _refresh(self) -> CompiledTaxonomy:
+        # One thread checks; the others keep using the current taxonomy meanwhile
+        if not self._lock.acquire(blocking=self._taxonomy is None):
+            return self._taxonomy
+        try:
+            if self._taxonomy is None:
+                self._taxonomy = self._initial_load()
+                self._signature = _file_signature(self.artifact_path)
+            else:
+                signature = _file_signature(self.artifact_path)
+                if signature is not None and signature != self._signature:
+                    try:
+                        taxonomy = read_artifact(self.artifact_path)
+                        self._taxonomy = taxonomy
+                        self.reloads += 1
+                        logger.info(f"🔄 Skill taxonomy reloaded: version {taxonomy.version} ({taxonomy.source_hash[:12]})")
+                    except (OSError, TaxonomyError) as e:
+                        self.reload_failures += 1
+                        logger.error(f"❌ Keeping skill taxonomy {self._taxonomy.version}, reload failed: {e}")
+                    self._signature = signature
+            self._next_check = time.monotonic() + self.reload_interval
+            return self._taxonomy
+        finally:
+            self._lock.release()
+
+    def _initial_load(self) -> CompiledTaxonomy:
+        """
+        The artifact, recompiled first when it is missing, was built by a
+        different compiler, or from a different source file than the one
+        shipped alongside
+        """
+        current_hash = None
+        if os.path.exists(self.source_path):
+            with open(self.source_path, 'rb') as f:
+                current_hash = source_hash(f.read())
+
+        if os.path.exists(self.artifact_path):
+            try:
+                taxonomy = read_artifact(self.artifact_path)
+                if current_hash is None or taxonomy.source_hash == current_hash:
+                    return taxonomy
+                logger.info("🔧 Skill taxonomy source changed, recompiling")
+            except (OSError, TaxonomyError) as e:
+                logger.warning(f"⚠️ Recompiling skill taxonomy artifact {self.artifact_path}: {e}")
+
+        taxonomy = compile_source(self.source_path)
+        try:
+            write_artifact(taxonomy, self.artifact_path)
+            # Serve what every other worker will map, not the in-memory build
+            return read_artifact(self.artifact_path)
+        except (OSError, TaxonomyError) as e:
+            logger.warning(f"⚠️ Could not write skill taxonomy artifact {self.artifact_path}: {e}")
+            return taxonomy
+
+    def stats(self) -> Dict:
+        taxonomy = self.get()
+        return {
+            **taxonomy.info(),
+            'artifact': self.artifact_path,
+            'reload_interval_seconds': self.reload_interval,
+            'reloads': self.reloads,
+            'reload_failures': self.reload_failures
+        }
+
+
+taxonomy_store = TaxonomyStore()
+
+
+def get_taxonomy() -> CompiledTaxonomy:
+    return taxonomy_store.get()
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description='Compile the skill taxonomy into its binary artifact')
+    parser.add_argument('--source', default=DEFAULT_SOURCE, help='taxonomy JSON source')
+    parser.add_argument('--out', default=DEFAULT_ARTIFACT, help='artifact path (replaced atomically)')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    taxonomy = compile_source(args.source)
+    path = write_artifact(taxonomy, args.out)
+    info = taxonomy.info()
+    print(
+        f"✅ Compiled skill taxonomy {info['version']} ({info['source_hash'][:12]}): "
+        f"{info['skills']} skills, {info['matcher_terms']} matcher terms → {path} "
+        f"({os.path.getsize(path)} bytes, {time.perf_counter() - start:.2f}s)"
+    )
+
+
+if __name__ == '__main__':
+    main()
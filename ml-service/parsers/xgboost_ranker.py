@@ -1,49 +1,118 @@
 import xgboost as xgb
 import numpy as np
-from typing import Dict, List
-import pickle
+from typing import Dict, List, Optional
+import logging
 import os
+import threading
+
+from parsers.feature_engineering import FEATURE_LABELS, NUM_FEATURES
+
+logger = logging.getLogger(__name__)
+
+# XGBoost's own formats; the extension picks JSON or UBJSON (binary JSON)
+NATIVE_MODEL_EXTENSIONS = ('.json', '.ubj')
 
 class XGBoostRanker:
     """
     XGBoost model for ranking resume relevance
     """
     
-    def __init__(self, model_path: str = None):
-        if model_path and os.path.exists(model_path):
-            # Load pre-trained model
-            self.model = pickle.load(open(model_path, 'rb'))
-            self.is_trained = True
-        else:
-            # Initialize new model
-            self.model = xgb.XGBRegressor(
-                objective='reg:squarederror',
-                n_estimators=100,
-                max_depth=6,
-                learning_rate=0.1,
-                random_state=42
+    def __init__(self, model_path: str = None, n_threads: int = None):
+        self.model_path = model_path
+        # None lets XGBoost use every core; pass 1 inside process-pool workers
+        self.n_threads = n_threads or int(os.getenv('XGB_NTHREADS', '0')) or None
+        self.load_error: Optional[str] = None
+        self._booster: Optional[xgb.Booster] = None
+        self._booster_threads = None
+        self._lock = threading.Lock()
+        
+        # Initialize new model; a saved one is loaded on first prediction
+        self.model = xgb.XGBRegressor(
+            objective='reg:squarederror',
+            n_estimators=100,
+            max_depth=6,
+            learning_rate=0.1,
+            random_state=42
+        )
+        self.is_trained = bool(model_path and os.path.exists(model_path))
+    
+    def _get_booster(self) -> Optional[xgb.Booster]:
+        """
+        Load and validate the saved model once; None if it cannot be used
+        """
+        if self._booster is not None or not self.is_trained:
+            return self._booster
+        
+        with self._lock:
+            if self._booster is None and self.is_trained:
+                try:
+                    self._booster = self.load_model(self.model_path)
+                except (ValueError, xgb.core.XGBoostError) as e:
+                    # Fall back to rule-based scoring rather than failing every request
+                    self.load_error = str(e)
+                    self.is_trained = False
+                    logger.error(f"❌ Could not load ranking model {self.model_path}: {e}")
+        return self._booster
+    
+    @staticmethod
+    def load_model(path: str) -> xgb.Booster:
+        """
+        Load a model saved in XGBoost's native JSON/UBJ format
+        """
+        if not path.lower().endswith(NATIVE_MODEL_EXTENSIONS):
+            raise ValueError(
+                f"Unsupported model file '{path}': expected one of {NATIVE_MODEL_EXTENSIONS}. "
+                f"Pickled models are no longer loaded; re-save with save_model()"
+            )
+        
+        booster = xgb.Booster()
+        booster.load_model(path)
+        
+        if booster.num_features() != NUM_FEATURES:
+            raise ValueError(
+                f"Model {path} expects {booster.num_features()} features, ranker provides {NUM_FEATURES}"
             )
-            self.is_trained = False
+        
+        logger.info(f"✅ Loaded ranking model from {path} ({booster.num_boosted_rounds()} trees)")
+        return booster
     
     def predict_relevance(self, feature_vector: List[float]) -> float:
         """
         Predict relevance score for a resume
         Returns score between 0-100
         """
-        if not self.is_trained:
+        if self._get_booster() is None:
             # Use rule-based scoring if model not trained
             return self._rule_based_score(feature_vector)
         
-        # Reshape for prediction
-        X = np.array([feature_vector])
-        
-        # Predict
-        score = self.model.predict(X)[0]
+        return float(self.predict_batch(np.asarray([feature_vector]))[0])
+    
+    def predict_batch(self, feature_matrix: np.ndarray, n_threads: int = None) -> np.ndarray:
+        """
+        Relevance scores (0-100) for an (N, NUM_FEATURES) feature matrix in one call,
+        e.g. from FeatureEngineer.extract_feature_matrix
+        """
+        X = np.asarray(feature_matrix, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != NUM_FEATURES:
+            raise ValueError(f"Expected an (N, {NUM_FEATURES}) feature matrix, got shape {X.shape}")
+        if not len(X):
+            return np.zeros(0, dtype=np.float64)
+        
+        booster = self._get_booster()
+        if booster is None:
+            return self._rule_based_scores(X)
+        
+        n_threads = n_threads or self.n_threads
+        if n_threads and n_threads != self._booster_threads:
+            with self._lock:
+                if n_threads != self._booster_threads:
+                    booster.set_param({'nthread': n_threads})
+                    self._booster_threads = n_threads
+        # inplace_predict is thread-safe and skips building a DMatrix; concurrent callers predict in parallel
+        scores = booster.inplace_predict(X)
         
         # Normalize to 0-100 range
-        score = max(0, min(100, score))
-        
-        return float(score)
+        return np.clip(np.asarray(scores, dtype=np.float64), 0, 100)
     
     def _rule_based_score(self, feature_vector: List[float]) -> float:
         """
@@ -94,6 +163,21 @@ class XGBoostRanker:
         
         return round(score, 2)
     
+    def _rule_based_scores(self, X: np.ndarray) -> np.ndarray:
+        """
+        Vectorized _rule_based_score over every row of X, with identical results
+        """
+        score = np.zeros(len(X))
+        score += (X[:, 0] + X[:, 1] + X[:, 2] + X[:, 3]) / 4 * 0.10 * 100
+        score += np.minimum(X[:, 4], 1.0) * 0.15 * 100
+        score += (X[:, 6] + X[:, 7] + X[:, 8] + X[:, 9]) / 4 * 0.15 * 100
+        score += np.minimum(X[:, 10] / 5.0, 1.0) * 0.15 * 100
+        score += np.minimum(X[:, 12] / 15.0, 1.0) * 0.20 * 100
+        score += X[:, 18] / 100.0 * 0.20 * 100
+        score += (X[:, 22] + X[:, 23] + X[:, 24]) / 3 * 0.05 * 100
+        # Python's round() so batch and single-row scores agree to the last digit
+        return np.array([round(value, 2) for value in score.tolist()])
+    
     def train_model(self, X_train: np.ndarray, y_train: np.ndarray):
         """
         Train the XGBoost model
@@ -101,32 +185,37 @@ class XGBoostRanker:
         y_train: Target scores (0-100)
         """
         self.model.fit(X_train, y_train)
+        with self._lock:
+            self._booster = self.model.get_booster()
+            self._booster_threads = None
         self.is_trained = True
+        self.load_error = None
     
     def save_model(self, path: str):
         """
-        Save trained model to file
+        Save trained model in XGBoost's native format (.json or .ubj)
         """
-        pickle.dump(self.model, open(path, 'wb'))
+        if not path.lower().endswith(NATIVE_MODEL_EXTENSIONS):
+            raise ValueError(f"Model path must end with one of {NATIVE_MODEL_EXTENSIONS}: {path}")
+        booster = self._get_booster()
+        if booster is None:
+            raise ValueError("No trained model to save")
+        booster.save_model(path)
+        self.model_path = path
     
     def get_feature_importance(self) -> Dict[str, float]:
         """
         Get feature importance scores
         """
-        if not self.is_trained:
+        booster = self._get_booster()
+        if booster is None:
             return {}
         
-        feature_names = [
-            'has_name', 'has_email', 'has_phone', 'has_location',
-            'word_count', 'sentence_count',
-            'experience_section', 'education_section', 'skills_section', 'projects_section',
-            'years_experience', 'organizations',
-            'total_skills', 'skill_density',
-            'prog_skills', 'framework_skills', 'db_skills', 'cloud_skills',
-            'skill_match_%', 'matched_count', 'missing_count', 'match_ratio',
-            'action_verbs', 'bullet_points', 'capitalization'
-        ]
-        
-        importance = self.model.feature_importances_
+        # Same normalized gain XGBRegressor.feature_importances_ reports
+        gain = booster.get_score(importance_type='gain')
+        importance = np.array([gain.get(f"f{i}", 0.0) for i in range(NUM_FEATURES)], dtype=np.float32)
+        total = importance.sum()
+        if total > 0:
+            importance /= total
         
-        return dict(zip(feature_names, importance))
+        return dict(zip(FEATURE_LABELS, importance))
@@ -1,9 +1,11 @@
 from typing import Dict, List, Any
+import numpy as np
 from parsers.ner_parser import NERResumeParser
 from parsers.skill_extractor import AdvancedSkillExtractor
 from parsers.similarity_engine import SimilarityEngine
-from features.feature_engineering import FeatureEngineer
-from scoring.xgboost_ranker import XGBoostRanker
+from parsers.feature_engineering import NUM_FEATURES, FeatureEngineer
+from parsers.xgboost_ranker import XGBoostRanker
+from utils.profiling import stage
 
 class ATSScorer:
     """
@@ -22,70 +24,110 @@ class ATSScorer:
     def score_resume(
         self,
         resume_text: str,
-        job_skills: List[str] = None
+        job_skills: List[str] = None,
+        report: Dict = None
     ) -> Dict[str, Any]:
         """
         Complete ATS scoring pipeline
         Returns comprehensive scoring results
+        Stage timings (seconds) go to report['stages'] when a report is given,
+        under 'ats.*' names; the caller records them (this may run in a worker process).
         """
-        # 1️⃣ Parse resume with NER
-        parsed_data = self.ner_parser.parse(resume_text)
-        
-        # 2️⃣ Extract skills with BERT + TF-IDF
-        skill_data = self.skill_extractor.extract_skills(resume_text)
-        parsed_data['skills'] = skill_data
+        return self.score_resumes([resume_text], job_skills, [report], report)[0]
+    
+    def score_resumes(
+        self,
+        resume_texts: List[str],
+        job_skills: List[str] = None,
+        reports: List[Dict] = None,
+        batch_report: Dict = None
+    ) -> List[Dict[str, Any]]:
+        """
+        score_resume for many resumes against the same job skills: each is
+        parsed on its own, then all are featurized into one matrix and
+        ranked with one predict_batch call.
+        Per-resume stages go to reports[i], the matrix stages (ats.features,
+        ats.predict) to batch_report.
+        """
+        reports = reports or [None] * len(resume_texts)
+        parsed_resumes, skill_results, similarity_results = [], [], []
+        for resume_text, report in zip(resume_texts, reports):
+            # 1️⃣ Parse resume with NER
+            with stage(report, 'ats.ner_parse'):
+                parsed_data = self.ner_parser.parse(resume_text)
+            
+            # 2️⃣ Extract skills with BERT + TF-IDF
+            with stage(report, 'ats.skill_extract'):
+                skill_data = self.skill_extractor.extract_skills(resume_text)
+                parsed_data['skills'] = skill_data
+            
+            # 3️⃣ Calculate similarity (if job skills provided)
+            with stage(report, 'ats.similarity'):
+                if job_skills:
+                    similarity_data = self.similarity_engine.calculate_skill_similarity(
+                        skill_data['all_skills'],
+                        job_skills
+                    )
+                else:
+                    similarity_data = {
+                        'overall_similarity': 0,
+                        'matched_skills': [],
+                        'missing_skills': [],
+                        'skill_matches': []
+                    }
+            
+            parsed_resumes.append(parsed_data)
+            skill_results.append(skill_data)
+            similarity_results.append(similarity_data)
         
-        # 3️⃣ Calculate similarity (if job skills provided)
-        if job_skills:
-            similarity_data = self.similarity_engine.calculate_skill_similarity(
-                skill_data['all_skills'],
-                job_skills
+        # 4️⃣ Engineer features: one (N, 25) matrix for the ranker, dicts for the breakdowns
+        with stage(batch_report, 'ats.features'):
+            feature_matrix = self.feature_engineer.extract_feature_matrix(
+                parsed_resumes,
+                similarity_results,
+                out=np.empty((len(parsed_resumes), NUM_FEATURES))
             )
-        else:
-            similarity_data = {
-                'overall_similarity': 0,
-                'matched_skills': [],
-                'missing_skills': [],
-                'skill_matches': []
-            }
-        
-        # 4️⃣ Engineer features
-        features = self.feature_engineer.extract_features(
-            parsed_data,
-            similarity_data
-        )
-        feature_vector = self.feature_engineer.get_feature_vector(features)
+            features_list = [
+                self.feature_engineer.extract_features(parsed_data, similarity_data)
+                for parsed_data, similarity_data in zip(parsed_resumes, similarity_results)
+            ]
         
         # 5️⃣ Predict with XGBoost
-        ml_score = self.xgboost_ranker.predict_relevance(feature_vector)
+        with stage(batch_report, 'ats.predict'):
+            ml_scores = self.xgboost_ranker.predict_batch(feature_matrix).tolist()
         
-        # 6️⃣ Calculate final ATS score (ensemble)
-        final_score = self._calculate_final_score(
-            ml_score,
-            similarity_data,
-            features
-        )
-        
-        # Generate detailed breakdown
-        score_breakdown = self._generate_breakdown(
-            parsed_data,
-            skill_data,
-            similarity_data,
-            features,
-            ml_score,
-            final_score
-        )
-        
-        return {
-            'final_ats_score': final_score,
-            'ml_relevance_score': ml_score,
-            'skill_match_score': similarity_data['overall_similarity'],
-            'score_breakdown': score_breakdown,
-            'parsed_data': parsed_data,
-            'extracted_skills': skill_data['all_skills'],
-            'skill_gaps': similarity_data.get('missing_skills', []),
-            'recommendations': self._generate_recommendations(score_breakdown, similarity_data)
-        }
+        results = []
+        for parsed_data, skill_data, similarity_data, features, ml_score in zip(
+            parsed_resumes, skill_results, similarity_results, features_list, ml_scores
+        ):
+            # 6️⃣ Calculate final ATS score (ensemble)
+            final_score = self._calculate_final_score(
+                ml_score,
+                similarity_data,
+                features
+            )
+            
+            # Generate detailed breakdown
+            score_breakdown = self._generate_breakdown(
+                parsed_data,
+                skill_data,
+                similarity_data,
+                features,
+                ml_score,
+                final_score
+            )
+            
+            results.append({
+                'final_ats_score': final_score,
+                'ml_relevance_score': ml_score,
+                'skill_match_score': similarity_data['overall_similarity'],
+                'score_breakdown': score_breakdown,
+                'parsed_data': parsed_data,
+                'extracted_skills': skill_data['all_skills'],
+                'skill_gaps': similarity_data.get('missing_skills', []),
+                'recommendations': self._generate_recommendations(score_breakdown, similarity_data)
+            })
+        return results
     
     def _calculate_final_score(
         self,
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Tests import the service's packages (parsers, utils, app) the way app.py does
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SERVICE_DIR not in sys.path:
+    sys.path.insert(0, SERVICE_DIR)
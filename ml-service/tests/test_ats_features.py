@@ -0,0 +1,94 @@
+"""
+scan_ats_features must report exactly what calculate_ats_score's inline
+regexes and substring checks found. legacy_features below is that code,
+kept as the reference.
+"""
+import random
+import re
+
+import pytest
+
+from app import (ATS_ACTION_VERBS, ATS_CERTIFICATIONS, ATS_DEGREES, ATS_INDUSTRY_KEYWORDS, ATS_JOB_TITLES,
+                 ATS_OPTIONAL_SECTIONS, ATS_QUANTITY_UNITS, ATS_REQUIRED_SECTIONS, ATS_UNIVERSITIES,
+                 scan_ats_features)
+
+EMAIL_PATTERN = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+PHONE_PATTERN = r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]'
+LINKEDIN_PATTERN = r'(linkedin\.com|github\.com|portfolio|website)'
+LOCATION_PATTERN = r'\b(city|state|country|address|location|remote)\b'
+DATE_PATTERNS = [
+    r'\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{4}\b',
+    r'\b\d{1,2}/\d{4}\b',
+    r'\b\d{4}\s*-\s*\d{4}\b',
+    r'\b(present|current)\b'
+]
+NUMBERS_PATTERN = r'\b\d+%|\b\d+\+|\b\d+ (users|customers|projects|teams|million|thousand)\b'
+
+
+def legacy_features(text):
+    text_lower = text.lower()
+    exp_match = re.search(r'experience.*?(?=education|skills|$)', text_lower, re.DOTALL)
+    return {
+        'has_email': bool(re.search(EMAIL_PATTERN, text)),
+        'has_phone': bool(re.search(PHONE_PATTERN, text)),
+        'has_location': bool(re.search(LOCATION_PATTERN, text_lower)),
+        'has_linkedin': bool(re.search(LINKEDIN_PATTERN, text_lower)),
+        'required_found': sum(1 for s in ATS_REQUIRED_SECTIONS if s in text_lower),
+        'optional_found': sum(1 for s in ATS_OPTIONAL_SECTIONS if s in text_lower),
+        'has_dates': any(re.search(pattern, text_lower) for pattern in DATE_PATTERNS),
+        'experience_span': exp_match.span() if exp_match else None,
+        'action_count': sum(text_lower.count(verb) for verb in ATS_ACTION_VERBS),
+        'quantified_count': len(re.findall(NUMBERS_PATTERN, text_lower)),
+        'title_count': sum(1 for title in ATS_JOB_TITLES if title in text_lower),
+        'has_degree': any(degree in text_lower for degree in ATS_DEGREES),
+        'has_cert': any(cert in text_lower for cert in ATS_CERTIFICATIONS),
+        'has_institution': any(uni in text_lower for uni in ATS_UNIVERSITIES),
+        'keyword_matches': sum(1 for kw in ATS_INDUSTRY_KEYWORDS if kw in text_lower)
+    }
+
+
+FIXED_TEXTS = [
+    '',
+    'experience',
+    'Experience\n',
+    'EXPERIENCE at Acme\nEDUCATION\nSkills',
+    'experience skills education',
+    'work experience\n\n',
+    'jane.doe@example.com | +1 (555) 123-4567 | Remote',
+    'a@b.c a@b.co x@y',
+    'Jan 2020 - Present, 03/2019, 2015 - 2018, currently',
+    'grew revenue 40% for 10+ teams, 5 users, 3 million, 12 usersx, a5%, 7 teams.',
+    '100%+ 2+% 4 projects 9 thousand',
+    'B.S. Computer Science, State University; AWS Certified; PMP',
+    'developed developed led leadership managed',
+    'Senior Software Engineer, agile/scrum, API, cloud, version control',
+    'linkedin.com/in/jane github.com/jane portfolio website',
+    'cityscape statement countryside addressed relocation',
+    'ıİſ experience İstanbul',
+]
+
+
+@pytest.mark.parametrize('text', FIXED_TEXTS)
+def test_fixed_texts_match_legacy(text):
+    assert scan_ats_features(text, text.lower()) == legacy_features(text)
+
+
+def test_fuzzed_texts_match_legacy():
+    rng = random.Random(3)
+    pieces = (
+        ATS_REQUIRED_SECTIONS + ATS_OPTIONAL_SECTIONS + ATS_ACTION_VERBS + ATS_JOB_TITLES + ATS_DEGREES +
+        ATS_CERTIFICATIONS + ATS_UNIVERSITIES + ATS_INDUSTRY_KEYWORDS + ATS_QUANTITY_UNITS +
+        ['city', 'remote', 'linkedin.com', 'present', 'current', 'jan', 'sept', '2020', '12/2021', '1999-2004',
+         '5', '42', '%', '+', '@', 'a@b.io', '+1 555 123 4567', 'x', 'İ', '_', '.']
+    )
+    separators = [' ', '', '\n', ', ', '-', '/', ' - ', '\n\n']
+    for _ in range(3000):
+        words = []
+        for _ in range(rng.randint(0, 40)):
+            word = rng.choice(pieces)
+            if rng.random() < 0.2:
+                word = word.upper() if rng.random() < 0.5 else word.capitalize()
+            words.append(word)
+            words.append(rng.choice(separators))
+        text = ''.join(words)
+        assert scan_ats_features(text, text.lower()) == legacy_features(text), text
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+import app
+from utils.job_queue import FAILED, SUCCEEDED, JobStore
+from utils.worker_pool import WorkerPool
+
+RESUME = 'Experience\nLed the platform team at Acme, built Python services on AWS\nEducation\nBSc'
+
+
+class FakeScorer:
+    def __init__(self):
+        self.batches = []
+
+    def score_resumes(self, texts, job_skills=None, reports=None, batch_report=None):
+        self.batches.append(list(texts))
+        for report in reports:
+            report.setdefault('stages', {})['ats.ner_parse'] = 0.001
+        batch_report.setdefault('stages', {})['ats.predict'] = 0.002
+        return [{'final_ats_score': len(text), 'job_skills': job_skills} for text in texts]
+
+
+@pytest.fixture
+def deep(monkeypatch, tmp_path):
+    scorer = FakeScorer()
+    monkeypatch.setattr(app, 'get_ats_scorer', lambda: scorer)
+    monkeypatch.setattr(app, 'parse_docx', lambda content: content.decode())
+    monkeypatch.setattr(app, 'job_pool', WorkerPool(mode='thread', max_workers=1))
+    store = JobStore(str(tmp_path / 'jobs.sqlite3'))
+    yield scorer, store
+    store.close()
+    app.job_pool.shutdown()
+
+
+def test_deep_job_files_are_scored_as_one_batch(deep, monkeypatch):
+    scorer, store = deep
+    observed = []
+    monkeypatch.setattr(app, 'observe_pipeline_report', lambda report: observed.append(sorted(report.get('stages', {}))))
+    files = [('a.docx', RESUME.encode()), ('short.docx', b'too short'), ('b.docx', (RESUME + ' Go').encode())]
+    job_id = store.submit('deep', files, options={'job_skills': ['Python']})
+
+    async def dispatch_once():
+        task = store.claim(60)
+        await app.run_job_batch(store, await app.claim_deep_batch(store, task, 60))
+
+    asyncio.run(dispatch_once())
+    assert scorer.batches == [[RESUME, RESUME + ' Go']]
+    results = store.get(job_id)['results']
+    assert [result['status'] for result in results] == [SUCCEEDED, FAILED, SUCCEEDED]
+    assert results[0]['data'] == {'final_ats_score': len(RESUME), 'job_skills': ['Python']}
+    assert (results[1]['status_code'], results[1]['error']) == (400, 'Resume content too short')
+    # One report per file plus the batch stages
+    assert observed == [['ats.ner_parse', 'parse_docx'], ['parse_docx'], ['ats.ner_parse', 'parse_docx'], ['ats.predict']]
+
+
+def test_batches_stop_at_the_batch_size(deep, monkeypatch):
+    scorer, store = deep
+    monkeypatch.setattr(app, 'JOB_DEEP_BATCH_SIZE', 2)
+    job_id = store.submit('deep', [(f'{i}.docx', RESUME.encode()) for i in range(3)])
+
+    async def dispatch():
+        while (task := store.claim(60)) is not None:
+            await app.run_job_batch(store, await app.claim_deep_batch(store, task, 60))
+
+    asyncio.run(dispatch())
+    assert [len(batch) for batch in scorer.batches] == [2, 1]
+    assert store.get(job_id)['status'] == 'completed'
@@ -0,0 +1,23 @@
+import pytest
+
+from parsers.feature_engineering import FeatureEngineer, parse_date_spans
+
+
+@pytest.mark.parametrize('dates, years', [
+    (['Jan 2020 - Dec 2020'], 1.0),
+    (['May 2018 - Jun 2018'], 0.17),
+    (['01/2019 - 12/2019'], 1.0),
+    (['2019 - 2021'], 2.0),
+    (['Jan 2020 - Dec 2020', 'Jan 2021 - Jun 2021'], 1.5),
+    (['Jan 2020 - Dec 2020', 'Jun 2020 - Mar 2021'], 1.25),
+    (['2018', '2021'], 3.0),
+])
+def test_years_of_experience(dates, years):
+    assert FeatureEngineer()._extract_years_of_experience(dates) == years
+
+
+def test_range_end_months_are_inclusive():
+    current_month = 2025 * 12 + 5
+    ranges, points = parse_date_spans('Mar 2024 - Present, 2019', current_month)
+    assert ranges == [(2024 * 12 + 2, current_month + 1)]
+    assert points == [2019 * 12]
@@ -0,0 +1,107 @@
+import pytest
+
+from utils import job_queue
+from utils.job_queue import CANCELLED, FAILED, QUEUED, RUNNING, SUCCEEDED, JobStore
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(job_queue.time, 'time', clock.time)
+    return clock
+
+
+@pytest.fixture
+def store(tmp_path, clock):
+    store = JobStore(str(tmp_path / 'jobs.sqlite3'), max_attempts=2, retry_backoff_seconds=10, result_ttl_seconds=60)
+    yield store
+    store.close()
+
+
+def test_claims_highest_priority_first_then_oldest(store, clock):
+    low = store.submit('ats', [('a.pdf', b'a0'), ('b.pdf', b'b0')], priority=0)
+    clock.now += 1
+    high = store.submit('deep', [('c.pdf', b'c1')], priority=5, options={'job_skills': ['Python']})
+
+    order = [store.claim(60) for _ in range(3)]
+    assert [(task['job_id'], task['index']) for task in order] == [(high, 0), (low, 0), (low, 1)]
+    assert order[0] == {
+        'job_id': high, 'index': 0, 'filename': 'c.pdf', 'content': b'c1', 'attempt': 1,
+        'mode': 'deep', 'options': {'job_skills': ['Python']}
+    }
+    assert store.claim(60) is None
+    assert store.get(low, include_results=False)['status'] == RUNNING
+
+
+def test_retry_waits_for_its_backoff(store, clock):
+    job_id = store.submit('ats', [('a.pdf', b'a')])
+    store.claim(60)
+    assert store.fail(job_id, 0, 'busy', 503, retry=True) == QUEUED
+    assert store.claim(60) is None
+
+    clock.now += 10
+    task = store.claim(60)
+    assert task['attempt'] == 2
+    # Out of attempts: a retryable error still fails the task
+    assert store.fail(job_id, 0, 'busy', 503, retry=True) == FAILED
+    job = store.get(job_id)
+    assert job['status'] == 'completed'
+    assert job['results'][0] == {'index': 0, 'filename': 'a.pdf', 'status': FAILED, 'attempts': 2,
+                                 'error': 'busy', 'status_code': 503}
+
+
+def test_expired_lease_is_reclaimed_until_max_attempts(store, clock):
+    job_id = store.submit('ats', [('a.pdf', b'a')])
+    assert store.claim(30)['attempt'] == 1
+    clock.now += 29
+    assert store.claim(30) is None
+
+    clock.now += 2
+    assert store.claim(30)['attempt'] == 2
+    clock.now += 31
+    # A worker was lost max_attempts times: the task fails instead of running again
+    assert store.claim(30) is None
+    result = store.get(job_id)['results'][0]
+    assert (result['status'], result['error'], result['status_code']) == (FAILED, 'Worker lost', 500)
+
+
+def test_cancelled_job_stays_cancelled_when_its_running_task_finishes(store, clock):
+    job_id = store.submit('ats', [('a.pdf', b'a')])
+    store.claim(30)
+    assert store.cancel(job_id) is True
+    store.complete(job_id, 0, {'score': 1})
+    assert store.get(job_id)['status'] == CANCELLED
+
+
+def test_finished_jobs_expire(store, clock):
+    job_id = store.submit('ats', [('a.pdf', b'a'), ('b.pdf', b'b')])
+    for _ in range(2):
+        task = store.claim(60)
+        store.complete(job_id, task['index'], {'score': task['index']})
+    job = store.get(job_id)
+    assert job['status'] == 'completed' and job['expires_at'] == clock.now + 60
+    assert [result['data'] for result in job['results']] == [{'score': 0}, {'score': 1}]
+    assert [result['status'] for result in job['results']] == [SUCCEEDED, SUCCEEDED]
+
+    clock.now += 59
+    assert store.purge_expired() == 0
+    clock.now += 2
+    assert store.purge_expired() == 1
+    assert store.get(job_id) is None
+    assert store.stats()['tasks'] == {}
+
+
+def test_claim_within_a_job(store, clock):
+    first = store.submit('deep', [('a.pdf', b'a'), ('b.pdf', b'b')])
+    other = store.submit('deep', [('c.pdf', b'c')], priority=9)
+    assert store.claim(60)['job_id'] == other
+    assert [store.claim(60, job_id=first)['index'] for _ in range(2)] == [0, 1]
+    assert store.claim(60, job_id=first) is None
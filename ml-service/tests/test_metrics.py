@@ -0,0 +1,94 @@
+import math
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app
+from utils.metrics import MetricsRegistry
+
+SAMPLE_LINE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{.*\})? (-?[0-9.e+-]+|\+Inf|NaN)$')
+
+
+def test_counter_totals_per_label_set():
+    registry = MetricsRegistry()
+    requests = registry.counter('http_requests', 'Requests served', ('method', 'status'))
+    requests.labels('GET', '200').inc()
+    requests.labels('GET', '200').inc(2)
+    requests.labels('POST', '500').inc(0.5)
+
+    assert registry.render().splitlines() == [
+        '# HELP http_requests Requests served',
+        '# TYPE http_requests counter',
+        'http_requests_total{method="GET",status="200"} 3',
+        'http_requests_total{method="POST",status="500"} 0.5',
+    ]
+    with pytest.raises(ValueError):
+        requests.labels('GET')
+
+
+def test_histogram_buckets_are_cumulative_and_inclusive():
+    registry = MetricsRegistry()
+    latency = registry.histogram('latency_seconds', 'Latency', buckets=(1.0, 0.1, 0.5))
+    for value in (0.05, 0.1, 0.3, 0.5, 0.7, 2.0):
+        latency.observe(value)
+
+    assert registry.render().splitlines()[2:] == [
+        'latency_seconds_bucket{le="0.1"} 2',
+        'latency_seconds_bucket{le="0.5"} 4',
+        'latency_seconds_bucket{le="1"} 5',
+        'latency_seconds_bucket{le="+Inf"} 6',
+        'latency_seconds_sum 3.65',
+        'latency_seconds_count 6',
+    ]
+
+
+def test_histogram_labels_precede_le():
+    registry = MetricsRegistry()
+    stages = registry.histogram('stage_seconds', 'Stages', ('stage',), buckets=(1.0,))
+    stages.labels('parse').observe(math.inf)
+
+    assert registry.render().splitlines()[2:] == [
+        'stage_seconds_bucket{stage="parse",le="1"} 0',
+        'stage_seconds_bucket{stage="parse",le="+Inf"} 1',
+        'stage_seconds_sum{stage="parse"} +Inf',
+        'stage_seconds_count{stage="parse"} 1',
+    ]
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    errors = registry.counter('errors', 'Errors', ('message',))
+    errors.labels('bad "quote"\\path\nnext').inc()
+
+    assert registry.render().splitlines()[2] == r'errors_total{message="bad \"quote\"\\path\nnext"} 1'
+
+
+def test_gauges_and_duplicate_names():
+    registry = MetricsRegistry()
+    in_flight = registry.gauge('in_flight', 'In flight')
+    in_flight.inc(3)
+    in_flight.dec()
+    registry.gauge('queue_depth', 'Queue depth', function=lambda: 7)
+
+    lines = registry.render().splitlines()
+    assert 'in_flight 2' in lines and 'queue_depth 7' in lines
+    with pytest.raises(ValueError):
+        registry.counter('in_flight', 'Again')
+
+
+def test_metrics_endpoint_serves_the_text_format():
+    response = TestClient(app.app).get('/metrics')
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain; version=0.0.4')
+    assert response.text.endswith('\n')
+    types = {}
+    for line in response.text.splitlines():
+        if line.startswith('# TYPE '):
+            _, _, name, kind = line.split(' ')
+            types[name] = kind
+        elif not line.startswith('# HELP '):
+            assert SAMPLE_LINE.match(line), line
+    assert types['ml_stage_duration_seconds'] == 'histogram'
+    assert types['ml_requests_in_flight'] == 'gauge'
@@ -0,0 +1,82 @@
+"""
+NERResumeParser._extract_sections must return exactly what the line-by-line
+regex scan it replaced returned. legacy_sections below is that code, kept as
+the reference.
+"""
+import random
+import re
+
+import pytest
+
+from parsers.ner_parser import SECTION_TERMS, NERResumeParser
+
+LEGACY_HEADERS = {
+    'experience': r'(?i)(work experience|experience|employment|professional experience)',
+    'education': r'(?i)(education|academic|qualifications)',
+    'skills': r'(?i)(skills|technical skills|competencies)',
+    'projects': r'(?i)(projects|portfolio)',
+    'certifications': r'(?i)(certifications|certificates|licenses)'
+}
+
+
+def legacy_sections(text):
+    sections = {}
+    lines = text.split('\n')
+    for header, pattern in LEGACY_HEADERS.items():
+        for i, line in enumerate(lines):
+            if re.search(pattern, line):
+                section_content = []
+                j = i + 1
+                while j < len(lines):
+                    next_line = lines[j]
+                    if any(re.search(p, next_line) for p in LEGACY_HEADERS.values()):
+                        break
+                    section_content.append(next_line)
+                    j += 1
+                sections[header] = '\n'.join(section_content).strip()
+                break
+    return sections
+
+
+@pytest.fixture(scope='module')
+def parser():
+    # Section splitting never touches the spaCy pipeline, which loads lazily
+    return NERResumeParser()
+
+
+FIXED_TEXTS = [
+    '',
+    'Experience',
+    'Experience\n',
+    'EXPERIENCE\nAcme Corp\n\nEDUCATION\nState University\nSKILLS\nPython',
+    'Skills\nPython\nWork Experience\nAcme\nSkills again\nGo',
+    'Professional Experience: 5 years\nBuilt things\nProjects\nPortfolio site\nCertificates\nPMP',
+    'no headers at all\njust text',
+    'Education Education\n\nAcademic\nMIT',
+    'line one\nCompetencies\n\n\n',
+    'İ ı ſkills\nİNSTANBUL\nExperıence\nſkills\nPython',
+    'Licenses\r\nCDL\r\nQualifications\r\nBSc',
+]
+
+
+@pytest.mark.parametrize('text', FIXED_TEXTS)
+def test_fixed_texts_match_legacy(parser, text):
+    assert parser._extract_sections(text) == legacy_sections(text)
+
+
+def test_fuzzed_texts_match_legacy(parser):
+    rng = random.Random(5)
+    terms = [term for header_terms in SECTION_TERMS.values() for term in header_terms]
+    words = ['acme', 'python', 'built', 'x', '', ' ', 'İ', 'ı', 'ſ', 'é', ':', '-']
+    for _ in range(3000):
+        lines = []
+        for _ in range(rng.randint(0, 15)):
+            parts = []
+            for _ in range(rng.randint(0, 4)):
+                word = rng.choice(terms) if rng.random() < 0.3 else rng.choice(words)
+                if rng.random() < 0.3:
+                    word = word.upper() if rng.random() < 0.5 else word.title()
+                parts.append(word)
+            lines.append(rng.choice([' ', '', '  ']).join(parts))
+        text = '\n'.join(lines)
+        assert parser._extract_sections(text) == legacy_sections(text), text
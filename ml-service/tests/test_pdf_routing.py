@@ -0,0 +1,59 @@
+import pytest
+
+import app
+from app import PDF_ENGINES, parse_pdf, plan_pdf_engines, probe_pdf
+
+ALL = tuple(PDF_ENGINES)
+
+
+def probe(text_layer='yes', encrypted=False, page_estimate=2, images=0):
+    return {'bytes': 1000, 'encrypted': encrypted, 'page_estimate': page_estimate,
+            'text_layer': text_layer, 'images': images}
+
+
+@pytest.mark.parametrize('probed, available, expected', [
+    (probe(), ALL, ('text', ('PyMuPDF', 'pdfplumber', 'PyPDF2'))),
+    (probe(text_layer='unknown', page_estimate=None), ALL, ('text', ('PyMuPDF', 'pdfplumber', 'PyPDF2'))),
+    (probe(page_estimate=app.PDF_PLUMBER_MAX_PAGES), ALL, ('text', ('PyMuPDF', 'pdfplumber', 'PyPDF2'))),
+    (probe(page_estimate=app.PDF_PLUMBER_MAX_PAGES + 1), ALL, ('long', ('PyMuPDF', 'PyPDF2'))),
+    (probe(encrypted=True), ALL, ('encrypted', ('PyMuPDF', 'pdfplumber'))),
+    (probe(encrypted=True, text_layer='no'), ALL, ('encrypted', ('PyMuPDF', 'pdfplumber'))),
+    (probe(text_layer='no', images=3), ALL, ('image', ('PyMuPDF',))),
+    (probe(text_layer='no'), ALL, ('no-text', ('PyMuPDF',))),
+    # Only installed engines are planned; the best of them reads an image PDF
+    (probe(text_layer='no', images=1), ('pdfplumber', 'PyPDF2'), ('image', ('pdfplumber',))),
+    (probe(), ('PyPDF2',), ('text', ('PyPDF2',))),
+    (probe(encrypted=True), ('PyPDF2',), ('encrypted', ())),
+])
+def test_routing_table(probed, available, expected):
+    assert plan_pdf_engines(probed, available) == expected
+
+
+def make_pdf(text=None, pages=1):
+    fitz = pytest.importorskip('fitz')
+    doc = fitz.open()
+    for _ in range(pages):
+        page = doc.new_page()
+        if text:
+            page.insert_text((72, 72), text)
+    try:
+        return doc.tobytes()
+    finally:
+        doc.close()
+
+
+def test_pdf_without_text_layer_is_read_once():
+    report = {}
+    with pytest.raises(Exception, match='Unable to extract text'):
+        parse_pdf(make_pdf(), report)
+    assert report['route'] == 'no-text'
+    assert [attempt['engine'] for attempt in report['attempts']] == ['PyMuPDF']
+
+
+def test_text_pdf_is_read_by_pymupdf():
+    report = {}
+    text = parse_pdf(make_pdf('Senior Python developer with ten years of experience in AWS and Docker'), report)
+    assert 'Python developer' in text
+    assert probe_pdf(make_pdf('x'))['text_layer'] == 'yes'
+    assert (report['route'], report['engine']) == ('text', 'PyMuPDF')
+    assert len(report['attempts']) == 1
@@ -0,0 +1,99 @@
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+import app
+from utils import profiling
+from utils.profiling import ProfileRing, profiled, stage
+
+
+def test_profile_ring_keeps_the_newest_profiles(tmp_path, monkeypatch):
+    ring = ProfileRing(str(tmp_path / 'profiles'), max_profiles=3)
+    assert ring.ids() == []
+
+    clock = iter(1_700_000_000 + i for i in range(5))
+    monkeypatch.setattr(profiling.time, 'time', lambda: next(clock))
+    ids = [ring.save({'n': n}) for n in range(5)]
+
+    assert ring.ids() == ids[2:]
+    assert ring.load(ids[4]) == {'id': ids[4], 'n': 4}
+    with pytest.raises(KeyError):
+        ring.load(ids[0])
+
+
+def test_profile_ring_rejects_ids_outside_the_pattern(tmp_path):
+    ring = ProfileRing(str(tmp_path))
+    (tmp_path / 'secret.json').write_text('{}')
+    for profile_id in ('secret', '../secret', '20240101T000000000000-zzzzzzzz'):
+        with pytest.raises(KeyError):
+            ring.load(profile_id)
+    assert ring.ids() == []
+
+
+def test_profiled_fills_stages_and_memory():
+    report = {}
+    with profiled(report, interval=0.001):
+        with stage(report, 'alloc'):
+            blob = [bytearray(1024) for _ in range(256)]
+    del blob
+
+    profile = report['profile']
+    assert profile['memory_tracked'] is True
+    assert profile['peak_alloc_bytes'] >= 256 * 1024
+    assert profile['stages']['alloc']['peak_alloc_bytes'] >= 256 * 1024
+    assert 'alloc' in report['stages']
+    assert not profiling._memory_lock.locked()
+
+
+def test_concurrent_profiles_skip_memory_tracking():
+    inside, release = threading.Event(), threading.Event()
+    first = {}
+
+    def hold():
+        with profiled(first):
+            inside.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    inside.wait(5)
+    second = {}
+    try:
+        with profiled(second):
+            with stage(second, 'work'):
+                pass
+    finally:
+        release.set()
+        thread.join()
+
+    assert second['profile']['memory_tracked'] is False
+    assert second['profile']['peak_alloc_bytes'] is None
+    assert 'peak_alloc_bytes' not in second['profile']['stages']['work']
+    assert first['profile']['memory_tracked'] is True
+
+
+def test_profile_admin_token(monkeypatch):
+    monkeypatch.setattr(app, 'PROFILE_ADMIN_TOKEN', None)
+    assert not app.is_profile_admin('anything')
+
+    monkeypatch.setattr(app, 'PROFILE_ADMIN_TOKEN', 's3cret')
+    assert app.is_profile_admin('s3cret')
+    assert not app.is_profile_admin('s3cret ')
+    assert not app.is_profile_admin(None)
+
+
+@pytest.mark.parametrize('header', ['1', 'attach', 'ATTACH', ' 1 '])
+def test_profile_header_values_request_a_profile(monkeypatch, header):
+    monkeypatch.setattr(app, 'PROFILE_ADMIN_TOKEN', 's3cret')
+    assert app.profile_trigger(header, 's3cret') == 'header'
+    with pytest.raises(HTTPException) as excinfo:
+        app.profile_trigger(header, 'wrong')
+    assert excinfo.value.status_code == 403
+
+
+@pytest.mark.parametrize('header', [None, '', '0', 'false', 'no'])
+def test_other_profile_header_values_are_ignored(monkeypatch, header):
+    monkeypatch.setattr(app, 'PROFILE_ADMIN_TOKEN', 's3cret')
+    monkeypatch.setattr(app, 'PROFILE_SAMPLE_RATE', 0)
+    assert app.profile_trigger(header, None) is None
@@ -0,0 +1,80 @@
+import pytest
+
+import app
+from utils import response_cache
+from utils.response_cache import ResponseCache, json_size
+
+
+def test_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+    assert cache.stats()['evictions'] == 1
+
+
+def test_byte_budget_evicts_oldest_and_skips_oversized_values():
+    cache = ResponseCache(max_entries=10, max_bytes=10, sizeof=len)
+    cache.put('a', 'xxxx')
+    cache.put('b', 'yyyy')
+    cache.put('c', 'zzzz')
+
+    assert cache.get('a') is None
+    assert cache.stats()['bytes'] == 8
+
+    # Replacing a value releases its old size
+    cache.put('b', 'y')
+    assert cache.stats()['bytes'] == 5
+    assert cache.get('c') == 'zzzz'
+
+    cache.put('huge', 'x' * 11)
+    assert cache.get('huge') is None
+    assert cache.stats()['entries'] == 2
+
+    cache.clear()
+    assert cache.stats()['bytes'] == 0
+
+
+def test_json_size_measures_the_serialized_response():
+    assert json_size({'score': 1}) == len('{"score": 1}')
+
+
+def test_entries_expire(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(response_cache.time, 'monotonic', lambda: now[0])
+    cache = ResponseCache(ttl_seconds=10, max_bytes=100, sizeof=len)
+    cache.put('a', 'value')
+    now[0] += 5
+    assert cache.get('a') == 'value'
+    now[0] += 6
+
+    assert cache.get('a') is None
+    stats = cache.stats()
+    assert (stats['expirations'], stats['hits'], stats['misses'], stats['bytes']) == (1, 1, 1, 0)
+
+
+def test_zero_entries_disables_caching():
+    cache = ResponseCache(max_entries=0)
+    cache.put('a', 1)
+    assert cache.get('a') is None
+
+
+@pytest.mark.parametrize('changed', [
+    (b'other bytes', 'resume.pdf', 'taxonomy-1'),
+    (b'resume bytes', 'resume.docx', 'taxonomy-1'),
+    (b'resume bytes', 'resume.pdf', 'taxonomy-2'),
+])
+def test_cache_key_follows_every_response_input(changed):
+    key = app.response_cache_key(b'resume bytes', 'resume.pdf', 'taxonomy-1')
+    assert app.response_cache_key(b'resume bytes', 'renamed.pdf', 'taxonomy-1') == key
+    assert app.response_cache_key(*changed) != key
+
+
+def test_cache_key_includes_the_scoring_version(monkeypatch):
+    key = app.response_cache_key(b'resume bytes', 'resume.pdf', 'taxonomy-1')
+    monkeypatch.setattr(app, 'SCORING_VERSION', app.SCORING_VERSION + '-next')
+    assert app.response_cache_key(b'resume bytes', 'resume.pdf', 'taxonomy-1') != key
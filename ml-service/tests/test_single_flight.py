@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+import app
+from utils.response_cache import ResponseCache
+from utils.single_flight import SingleFlight
+
+
+def test_followers_share_the_leaders_result():
+    async def scenario():
+        flights = SingleFlight()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return 'parsed'
+
+        results = await asyncio.gather(*(flights.do('key', compute) for _ in range(3)))
+        return flights, calls, results
+
+    flights, calls, results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert results == [('parsed', False), ('parsed', True), ('parsed', True)]
+    assert flights.stats() == {'in_flight': 0, 'leaders': 1, 'coalesced': 2, 'coalesced_rate': 0.6667}
+
+
+def test_leader_exception_reaches_every_follower_and_clears_the_key():
+    async def scenario():
+        joined = []
+        flights = SingleFlight(on_join=lambda: joined.append(1))
+        started = asyncio.Event()
+
+        async def fail():
+            started.set()
+            await asyncio.sleep(0.01)
+            raise ValueError('corrupt upload')
+
+        leader = asyncio.ensure_future(flights.do('key', fail))
+        await started.wait()
+        followers = [asyncio.ensure_future(flights.do('key', fail)) for _ in range(2)]
+        outcomes = await asyncio.gather(leader, *followers, return_exceptions=True)
+        in_flight = flights.stats()['in_flight']
+
+        # The next call starts a fresh computation
+        async def succeed():
+            return 'ok'
+        retry = await flights.do('key', succeed)
+        return outcomes, joined, in_flight, retry
+
+    outcomes, joined, in_flight, retry = asyncio.run(scenario())
+    assert [type(outcome) for outcome in outcomes] == [ValueError] * 3
+    assert len({id(outcome) for outcome in outcomes}) == 1
+    assert len(joined) == 2
+    assert in_flight == 0
+    assert retry == ('ok', False)
+
+
+def test_a_cancelled_caller_does_not_cancel_the_computation():
+    async def scenario():
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def compute():
+            await release.wait()
+            return 'parsed'
+
+        leader = asyncio.ensure_future(flights.do('key', compute))
+        follower = asyncio.ensure_future(flights.do('key', compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        return await follower, leader.cancelled()
+
+    assert asyncio.run(scenario()) == (('parsed', True), True)
+
+
+@pytest.fixture
+def isolated_uploads(monkeypatch):
+    monkeypatch.setattr(app, 'response_cache', ResponseCache())
+    monkeypatch.setattr(app, 'upload_flights', SingleFlight())
+    runs = []
+
+    async def run_pipeline(content, filename, profile=False, pool=None):
+        runs.append(pool)
+        await asyncio.sleep(0.01)
+        return {'filename': filename}, {'taxonomy': app.get_taxonomy().key}
+
+    monkeypatch.setattr(app, 'run_pipeline', run_pipeline)
+    return runs
+
+
+def test_uploads_coalesce_only_within_a_pool(isolated_uploads):
+    async def scenario():
+        return await asyncio.gather(
+            app.score_upload(b'same bytes', 'a.pdf'),
+            app.score_upload(b'same bytes', 'b.pdf'),
+            app.score_upload(b'same bytes', 'c.pdf', pool=app.job_pool)
+        )
+
+    results = asyncio.run(scenario())
+    assert isolated_uploads == [None, app.job_pool]
+    assert results[0] is results[1]
+    assert app.upload_flights.stats()['coalesced'] == 1
@@ -0,0 +1,123 @@
+"""
+SkillMatcher must find exactly what the per-skill regexes it replaced found.
+legacy_match below is that regex code, kept as the reference.
+"""
+import json
+import os
+import random
+import re
+
+import pytest
+
+from parsers.skill_matcher import SkillMatcher
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+with open(os.path.join(SERVICE_DIR, 'taxonomy', 'skills.json'), encoding='utf-8') as f:
+    TAXONOMY = json.load(f)
+SKILLS = [skill for group in TAXONOMY['groups'] for skill in group['skills']]
+VARIATIONS = TAXONOMY['variations']
+
+EDGE = r'[\s,\.\-\(\)\[\]\{\}]'
+
+
+def legacy_patterns(skills, variations):
+    """
+    Methods 1 and 2 of extract_skills before the trie: one regex per skill
+    and per variation (compiled here; re's cache is smaller than the taxonomy)
+    """
+    patterns = []
+    for skill in skills:
+        skill_lower = skill.lower()
+        if len(skill_lower.replace('+', '').replace('#', '').replace('.', '')) <= 2:
+            pattern = r'\b' + re.escape(skill_lower) + r'\b'
+        else:
+            skill_pattern = re.escape(skill_lower).replace(r'\ ', r'[\s\-\_]*')
+            pattern = r'(?:^|' + EDGE + ')' + skill_pattern + r'(?:$|' + EDGE + ')'
+        patterns.append((re.compile(pattern), skill))
+    for variant, canonical in variations.items():
+        pattern = r'(?:^|' + EDGE + ')' + re.escape(variant) + r'(?:$|' + EDGE + ')'
+        patterns.append((re.compile(pattern), canonical))
+    return patterns
+
+
+def legacy_match(text_lower, patterns):
+    return {canonical for pattern, canonical in patterns if pattern.search(text_lower)}
+
+
+LEGACY_PATTERNS = legacy_patterns(SKILLS, VARIATIONS)
+
+
+@pytest.fixture(scope='module')
+def matcher():
+    return SkillMatcher.from_taxonomy(SKILLS, VARIATIONS)
+
+
+FIXED_TEXTS = [
+    '',
+    'python',
+    'Python, Java and C++ (C#), plus C and R.',
+    'c++/c# go-lang golang go. r&d r-studio',
+    'node.js nodejs node js node-js node_js',
+    'react native, react-native, react_native, react   native, reactnative',
+    'machine learning\nmachine-learning\nmachine_learning\nmachine\tlearning',
+    '[aws] {docker} (kubernetes) k8s.',
+    'ci/cd cicd ci-cd',
+    '.net asp.net dotnet .net core',
+    'objective-c f# visual basic',
+    'spring boot springboot spring-boot',
+    'scikit-learn scikit learn sklearn',
+    'rest api restful rest-api',
+    'html5 html css3 css sass scss',
+    'emails like dev@python.org and urls like https://react.dev',
+    'pythonic javascripting reacts',
+    'PYTHON JAVA SQL',
+    'ünïcödé python—java…go «react»',
+    '-python- .java. ,sql,',
+    'tensorflow/pytorch keras;pandas:numpy',
+]
+
+
+@pytest.mark.parametrize('text', FIXED_TEXTS)
+def test_fixed_texts_match_legacy(matcher, text):
+    text_lower = text.lower()
+    assert matcher.match(text_lower) == legacy_match(text_lower, LEGACY_PATTERNS)
+
+
+def _fuzzed_texts(count, seed):
+    rng = random.Random(seed)
+    pieces = SKILLS + list(VARIATIONS) + ['foo', 'and', 'x', '1', 'é', 'ß']
+    separators = [' ', '  ', ',', '.', '-', '_', '/', '(', ')', '[', ']', '{', '}', '\n', '\t', '+', '#', ':', '']
+    for _ in range(count):
+        words = []
+        for _ in range(rng.randint(1, 30)):
+            word = rng.choice(pieces)
+            if rng.random() < 0.2:
+                word = word.upper()
+            if rng.random() < 0.15:
+                # Stretch a space into the gap characters multi-word skills accept
+                word = word.replace(' ', rng.choice(['-', '_', ' - ', '__', '\n', '']))
+            words.append(word)
+            words.append(rng.choice(separators))
+        yield ''.join(words)
+
+
+def test_fuzzed_texts_match_legacy(matcher):
+    for text in _fuzzed_texts(1000, seed=1):
+        text_lower = text.lower()
+        assert matcher.match(text_lower) == legacy_match(text_lower, LEGACY_PATTERNS), text
+
+
+# Shapes the production taxonomy does not exercise: \b phrases starting with a
+# non-word char, gaps in short skills, overlapping prefixes, repeated entries
+EDGE_SKILLS = ['#x', 'C', 'C++', '.n', 'a b', 'a b c', 'ab', 'x-y z', 'q_q', 'Go', 'Go']
+EDGE_VARIATIONS = {'a b': 'AB', 'c c': 'C', '#x': 'Hash', 'x.y': 'XY', 'a': 'A'}
+
+
+def test_edge_taxonomy_matches_legacy():
+    matcher = SkillMatcher.from_taxonomy(EDGE_SKILLS, EDGE_VARIATIONS)
+    patterns = legacy_patterns(EDGE_SKILLS, EDGE_VARIATIONS)
+    rng = random.Random(7)
+    alphabet = ['a', 'b', 'c', 'x', 'y', 'z', 'q', 'n', 'g', 'o', '#', '+', '.', '-', '_', ' ', '\n', ',', '(', 'é']
+    for _ in range(5000):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 24)))
+        assert matcher.match(text) == legacy_match(text, patterns), text
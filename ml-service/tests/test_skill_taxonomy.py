@@ -0,0 +1,111 @@
+import json
+import os
+import pickle
+import random
+
+import pytest
+
+from parsers import skill_taxonomy
+from parsers.skill_taxonomy import (DEFAULT_SOURCE, CompiledTaxonomy, TaxonomyError, TaxonomyStore, compile_source,
+                                    read_artifact, source_hash, write_artifact)
+
+
+@pytest.fixture(scope='module')
+def compiled():
+    return compile_source()
+
+
+def build(source):
+    raw = json.dumps(source).encode('utf-8')
+    return CompiledTaxonomy(source, source_hash(raw))
+
+
+def replace_artifact(taxonomy, path, mtime):
+    write_artifact(taxonomy, str(path))
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_artifact_round_trip(tmp_path, compiled):
+    path = write_artifact(compiled, str(tmp_path / 'skills.sktx'))
+    loaded = read_artifact(path)
+    assert loaded.key == compiled.key
+    assert loaded.info() == compiled.info()
+    assert loaded.skill_ids == compiled.skill_ids
+    assert loaded.parent_rules == compiled.parent_rules
+
+    rng = random.Random(7)
+    words = list(compiled.skills) + list(compiled.variations) + ['x', 'c++', '#', '-', ',', '  ']
+    for _ in range(500):
+        text = ' '.join(rng.choice(words) for _ in range(25)).lower()
+        assert loaded.matcher.match(text) == compiled.matcher.match(text), text
+
+
+def test_artifact_of_another_compiler_is_rejected(tmp_path, compiled, monkeypatch):
+    path = write_artifact(compiled, str(tmp_path / 'skills.sktx'))
+    monkeypatch.setattr(skill_taxonomy, 'COMPILER_FINGERPRINT', 'other')
+    with pytest.raises(TaxonomyError, match='compiler'):
+        read_artifact(path)
+
+
+@pytest.mark.parametrize('damage', ['flip_payload', 'truncate', 'empty', 'pickle'])
+def test_damaged_artifact_is_rejected(tmp_path, compiled, damage):
+    path = tmp_path / 'skills.sktx'
+    write_artifact(compiled, str(path))
+    data = path.read_bytes()
+    if damage == 'flip_payload':
+        data = data[:-10] + bytes([data[-10] ^ 0xFF]) + data[-9:]
+    elif damage == 'truncate':
+        data = data[:len(data) // 2]
+    elif damage == 'empty':
+        data = b''
+    else:
+        data = pickle.dumps(compiled)
+    path.write_bytes(data)
+    with pytest.raises(TaxonomyError):
+        read_artifact(str(path))
+
+
+def test_store_swaps_in_replaced_artifacts(tmp_path, compiled):
+    with open(DEFAULT_SOURCE) as f:
+        source = json.load(f)
+    path = tmp_path / 'skills.sktx'
+    replace_artifact(compiled, path, 1_000_000_000)
+    store = TaxonomyStore(str(path), DEFAULT_SOURCE, reload_interval=0)
+    first = store.get()
+    assert first.key == compiled.key
+
+    source['groups'].append({'name': 'extra', 'skills': ['Zig']})
+    replace_artifact(build(source), path, 2_000_000_000)
+    second = store.get()
+    assert second.key != first.key
+    assert 'Zig' in second.matcher.match('zig and python')
+
+    # A broken artifact keeps the last good build
+    path.write_bytes(b'SKTX broken')
+    os.utime(path, ns=(3_000_000_000, 3_000_000_000))
+    assert store.get() is second
+    assert (store.reloads, store.reload_failures) == (1, 1)
+
+
+def test_initial_load_recompiles_a_stale_artifact(tmp_path, compiled):
+    with open(DEFAULT_SOURCE) as f:
+        source = json.load(f)
+    source['version'] = 'old'
+    path = tmp_path / 'skills.sktx'
+    write_artifact(build(source), str(path))
+
+    store = TaxonomyStore(str(path), DEFAULT_SOURCE)
+    assert store.get().key == compiled.key
+    assert read_artifact(str(path)).key == compiled.key
+
+
+def test_key_covers_the_compiler(compiled, monkeypatch):
+    monkeypatch.setattr(skill_taxonomy, 'COMPILER_FINGERPRINT', 'other')
+    assert compile_source().key != compiled.key
+
+
+def test_invalid_source_is_rejected(tmp_path):
+    path = tmp_path / 'skills.json'
+    path.write_text('{"version": 1}')
+    with pytest.raises(TaxonomyError):
+        compile_source(str(path))
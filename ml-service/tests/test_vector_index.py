@@ -0,0 +1,137 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from utils.vector_index import VectorIndex
+
+
+def clustered_vectors(count, dim=32, clusters=20, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    labels = rng.integers(clusters, size=count)
+    return (centers[labels] + 0.3 * rng.normal(size=(count, dim))).astype(np.float32)
+
+
+def test_search_returns_cosine_similarities_best_first():
+    index = VectorIndex()
+    index.add(['x', 'y', 'xy'], np.array([[1, 0], [0, 2], [1, 1]], dtype=np.float32))
+
+    results = index.search(np.array([3, 0]), top_k=2)
+    assert [item_id for item_id, _ in results] == ['x', 'xy']
+    assert results[0][1] == pytest.approx(1.0)
+    assert results[1][1] == pytest.approx(np.sqrt(0.5))
+
+
+def test_delete_tombstones_rows_until_compact():
+    index = VectorIndex()
+    index.add(['a', 'b', 'c'], np.eye(3, dtype=np.float32))
+
+    assert index.delete(['b', 'missing']) == 1
+    assert 'b' not in index and len(index) == 2
+    assert index.stats()['tombstones'] == 1
+    assert [item_id for item_id, _ in index.search(np.array([0, 1, 0]), top_k=3)] == ['a', 'c']
+
+    index.compact()
+    assert index.stats()['tombstones'] == 0
+    assert [item_id for item_id, _ in index.search(np.array([0, 0, 1]), top_k=1)] == ['c']
+    assert index.search(np.array([1, 0, 0]), top_k=1)[0][0] == 'a'
+
+
+def test_readding_an_id_replaces_its_vector():
+    index = VectorIndex()
+    index.add(['a', 'b'], np.array([[1, 0], [0, 1]], dtype=np.float32))
+    index.add(['a'], np.array([[0, 1]], dtype=np.float32))
+
+    assert len(index) == 2
+    results = index.search(np.array([0, 1]), top_k=5)
+    assert sorted(item_id for item_id, _ in results) == ['a', 'b']
+    assert all(score == pytest.approx(1.0) for _, score in results)
+
+    # Within one batch the last vector for an id wins
+    index.add(['c', 'c'], np.array([[1, 0], [0, 1]], dtype=np.float32))
+    assert index.search(np.array([1, 0]), top_k=1)[0][0] != 'c'
+
+
+def test_add_rejects_mismatched_input():
+    index = VectorIndex(dim=3)
+    with pytest.raises(ValueError):
+        index.add(['a', 'b'], np.ones((1, 3)))
+    with pytest.raises(ValueError):
+        index.add(['a'], np.ones((1, 4)))
+
+
+def test_ivf_recall_against_exact():
+    vectors = clustered_vectors(2000)
+    ids = [f"r{i}" for i in range(len(vectors))]
+    exact = VectorIndex(mode='exact', block_size=256)
+    ivf = VectorIndex(mode='ivf', nprobe=8)
+    exact.add(ids, vectors)
+    ivf.add(ids, vectors)
+    assert ivf.stats()['lists'] > 8
+
+    queries = clustered_vectors(50, seed=1)
+    hits = 0
+    for query in queries:
+        truth = {item_id for item_id, _ in exact.search(query, top_k=10)}
+        hits += len(truth & {item_id for item_id, _ in ivf.search(query, top_k=10)})
+    assert hits / (10 * len(queries)) >= 0.9
+
+    # Probing every list is an exact search
+    query = queries[0]
+    assert ivf.search(query, top_k=10, nprobe=ivf.stats()['lists']) == pytest.approx(exact.search(query, top_k=10))
+
+
+def test_ivf_searches_exactly_until_trained():
+    index = VectorIndex(mode='ivf')
+    index.add(['a', 'b'], np.eye(2, dtype=np.float32))
+    assert index.stats()['lists'] == 0
+    assert index.search(np.array([0, 1]), top_k=1)[0][0] == 'b'
+
+
+def test_save_load_round_trip(tmp_path):
+    vectors = clustered_vectors(500)
+    ids = [f"r{i}" for i in range(len(vectors))]
+    index = VectorIndex(mode='ivf', nprobe=4, metadata={'model_name': 'test-model'})
+    index.add(ids, vectors)
+    index.delete(ids[:10])
+
+    directory = str(tmp_path / 'index')
+    index.save(directory)
+    with open(os.path.join(directory, 'manifest.json')) as f:
+        manifest = json.load(f)
+    assert manifest['count'] == 490 and manifest['ids'] == ids[10:]
+    assert sorted(manifest['files']) == ['assignments', 'centroids', 'vectors']
+    assert sorted(os.listdir(directory)) == sorted(['manifest.json', *manifest['files'].values()])
+
+    loaded = VectorIndex.load(directory)
+    assert loaded.metadata == {'model_name': 'test-model'}
+    assert loaded.stats() == index.stats()
+    for query in clustered_vectors(5, seed=2):
+        assert loaded.search(query, top_k=5) == index.search(query, top_k=5)
+
+    # A second save replaces the arrays of the first
+    loaded.add(['new'], vectors[:1])
+    loaded.save(directory)
+    with open(os.path.join(directory, 'manifest.json')) as f:
+        files = json.load(f)['files']
+    assert sorted(os.listdir(directory)) == sorted(['manifest.json', *files.values()])
+    assert 'new' in VectorIndex.load(directory)
+
+
+def test_load_rejects_inconsistent_manifest(tmp_path):
+    index = VectorIndex()
+    index.add(['a', 'b'], np.eye(2, dtype=np.float32))
+    directory = str(tmp_path / 'index')
+    index.save(directory)
+
+    path = os.path.join(directory, 'manifest.json')
+    with open(path) as f:
+        manifest = json.load(f)
+    manifest['ids'].append('c')
+    manifest['count'] = 3
+    with open(path, 'w') as f:
+        json.dump(manifest, f)
+    with pytest.raises(ValueError):
+        VectorIndex.load(directory)
@@ -0,0 +1,40 @@
+import asyncio
+import os
+
+import app
+from utils.model_registry import ModelRegistry
+from utils.worker_pool import WorkerPool
+
+
+def test_job_workers_report_their_model_loads(monkeypatch):
+    registry = ModelRegistry(loader=lambda name: object())
+    monkeypatch.setattr(app, 'model_registry', registry)
+    monkeypatch.setattr(app, 'WARMUP_MODELS', ['encoder-a', 'spacy/missing_model'])
+    monkeypatch.setattr(app, 'get_pipeline', lambda name: (_ for _ in ()).throw(OSError(f"Can't find model '{name}'")))
+
+    async def scenario():
+        pool = WorkerPool(mode='thread', max_workers=2)
+        try:
+            return await pool.warmup(app.warm_job_worker)
+        finally:
+            pool.shutdown()
+
+    reports = asyncio.run(scenario())
+    assert [report['pid'] for report in reports] == [os.getpid()] * 2
+    models = app.aggregate_model_stats(reports)
+    assert models['encoder-a']['loaded'] is True
+    assert models['encoder-a']['workers'] == 1
+    assert models['spacy/missing_model'] == {
+        'loaded': False, 'workers': 0, 'load_seconds': [], 'error': "Can't find model 'missing_model'"
+    }
+
+
+def test_model_stats_are_aggregated_across_workers():
+    reports = [
+        {'pid': 1, 'models': {'m': {'load_seconds': 1.5, 'parameter_bytes': 10, 'rss_delta_bytes': 20}}, 'errors': {}},
+        {'pid': 2, 'models': {'m': {'load_seconds': 2.0, 'parameter_bytes': 10, 'rss_delta_bytes': 25}}, 'errors': {}},
+        {'pid': 1, 'models': {'m': {'load_seconds': 1.5, 'parameter_bytes': 10, 'rss_delta_bytes': 20}}, 'errors': {}},
+    ]
+    assert app.aggregate_model_stats(reports) == {
+        'm': {'loaded': True, 'workers': 2, 'load_seconds': [1.5, 2.0], 'parameter_bytes': 10, 'rss_delta_bytes': 25}
+    }
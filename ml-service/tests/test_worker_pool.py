@@ -0,0 +1,57 @@
+import asyncio
+import time
+
+import pytest
+
+from utils.worker_pool import PipelineTimeoutError, WorkerPool
+
+
+def sleep_for(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def double(value):
+    return value * 2
+
+
+@pytest.mark.parametrize('mode', ['process', 'thread'])
+def test_timed_out_jobs_give_their_slots_back(mode):
+    async def scenario():
+        pool = WorkerPool(mode=mode, max_workers=2, max_pending=2, timeout_seconds=0.3)
+        try:
+            for _ in range(2):
+                with pytest.raises(PipelineTimeoutError):
+                    await pool.run(sleep_for, 30)
+            assert pool.stats()['pending'] == 0
+            # A saturated pool would raise PoolSaturatedError here
+            assert await asyncio.gather(pool.run(double, 1), pool.run(double, 2)) == [2, 4]
+            return pool.stats()
+        finally:
+            pool.shutdown()
+
+    stats = asyncio.run(scenario())
+    assert stats['timed_out'] == 2
+    assert stats['recycled'] == 2
+
+
+def test_job_sharing_a_recycled_pool_is_resubmitted():
+    async def scenario():
+        pool = WorkerPool(mode='process', max_workers=2, max_pending=4, timeout_seconds=1.0)
+        try:
+            await pool.run(double, 0)
+
+            async def bystander():
+                await asyncio.sleep(0.3)
+                return await pool.run(sleep_for, 0.9)
+
+            stuck, finished = await asyncio.gather(pool.run(sleep_for, 30), bystander(), return_exceptions=True)
+            return stuck, finished, pool.stats()
+        finally:
+            pool.shutdown()
+
+    stuck, finished, stats = asyncio.run(scenario())
+    assert isinstance(stuck, PipelineTimeoutError)
+    assert finished == 0.9
+    assert stats['resubmitted'] == 1
+    assert stats['pending'] == 0
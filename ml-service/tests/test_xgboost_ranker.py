@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('xgboost')
+
+from parsers.feature_engineering import NUM_FEATURES  # noqa: E402
+from parsers.xgboost_ranker import XGBoostRanker  # noqa: E402
+
+
+def feature_matrix(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.random((rows, NUM_FEATURES))
+    X[:, 10] *= 12   # years of experience
+    X[:, 12] *= 30   # skill count
+    X[:, 18] *= 100  # skill match (0-100)
+    return X
+
+
+def test_rule_based_batch_matches_single_rows():
+    ranker = XGBoostRanker()
+    X = feature_matrix(200)
+    assert ranker.predict_batch(X).tolist() == [ranker.predict_relevance(row.tolist()) for row in X]
+
+
+def test_model_batch_matches_single_rows(tmp_path):
+    ranker = XGBoostRanker(n_threads=1)
+    X = feature_matrix(300, seed=1)
+    ranker.train_model(X, X[:, 18] * 0.8 + X[:, 10])
+    path = str(tmp_path / 'ranker.ubj')
+    ranker.save_model(path)
+
+    loaded = XGBoostRanker(model_path=path, n_threads=2)
+    batch = loaded.predict_batch(X)
+    assert np.allclose(batch, [loaded.predict_relevance(row.tolist()) for row in X])
+    assert batch.min() >= 0 and batch.max() <= 100
+
+
+def test_feature_matrix_shape_is_checked():
+    with pytest.raises(ValueError):
+        XGBoostRanker().predict_batch(np.zeros((3, NUM_FEATURES - 1)))
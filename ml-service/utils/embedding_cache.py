@@ -0,0 +1,78 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+from typing import Callable, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout or the way embeddings are produced changes
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_CACHE_DIR = os.getenv(
+    'EMBEDDING_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'embeddings')
+)
+
+
+def cache_key(model_name: str, items: List[str]) -> str:
+    """
+    Stable key for a (model, item list) pair
+    """
+    digest = hashlib.sha256()
+    digest.update(f"v{CACHE_FORMAT_VERSION}\0{model_name}\0".encode('utf-8'))
+    digest.update(json.dumps(items, ensure_ascii=False).encode('utf-8'))
+    return digest.hexdigest()[:20]
+
+
+def cache_path(model_name: str, items: List[str], cache_dir: str = None) -> str:
+    safe_model = re.sub(r'[^A-Za-z0-9._-]+', '_', model_name)
+    filename = f"{safe_model}-{cache_key(model_name, items)}.v{CACHE_FORMAT_VERSION}.npy"
+    return os.path.join(cache_dir or DEFAULT_CACHE_DIR, filename)
+
+
+def load_or_compute(
+    model_name: str,
+    items: List[str],
+    compute: Callable[[List[str]], np.ndarray],
+    cache_dir: str = None
+) -> np.ndarray:
+    """
+    Return embeddings for items, memory-mapped from disk when cached.
+    Recomputed only when the model name or the item list changes.
+    """
+    path = cache_path(model_name, items, cache_dir)
+
+    if os.path.exists(path):
+        try:
+            embeddings = np.load(path, mmap_mode='r')
+            if embeddings.ndim == 2 and embeddings.shape[0] == len(items):
+                logger.info(f"✅ Loaded {len(items)} cached embeddings from {path}")
+                return embeddings
+            logger.warning(f"⚠️ Ignoring embedding cache with shape {embeddings.shape}: {path}")
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Unreadable embedding cache {path}: {e}")
+
+    embeddings = np.ascontiguousarray(compute(items), dtype=np.float32)
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp file and rename so concurrent workers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, embeddings)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+        logger.info(f"💾 Cached {len(items)} embeddings at {path}")
+        return np.load(path, mmap_mode='r')
+    except OSError as e:
+        # Read-only or full disk: keep serving from memory
+        logger.warning(f"⚠️ Could not write embedding cache {path}: {e}")
+        return embeddings
@@ -0,0 +1,60 @@
+import threading
+from collections import Counter
+from typing import Any, Dict, Optional
+
+OUTCOMES = ('ok', 'short', 'timeout', 'error', 'unavailable')
+
+
+class EngineStats:
+    """
+    Thread-safe per-engine success and latency counters for document extraction.
+    Fed with the report dicts parse_pdf fills in, in whichever process
+    the extraction ran.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.documents = 0
+        self.routes: Counter = Counter()
+        self.winners: Counter = Counter()
+        self._engines: Dict[str, Dict[str, float]] = {}
+
+    def _engine(self, name: str) -> Dict[str, float]:
+        engine = self._engines.get(name)
+        if engine is None:
+            engine = self._engines[name] = {
+                'attempts': 0, **{outcome: 0 for outcome in OUTCOMES}, 'total_ms': 0.0, 'max_ms': 0.0
+            }
+        return engine
+
+    def record(self, report: Optional[Dict[str, Any]]):
+        if not report or 'attempts' not in report:
+            return
+        with self._lock:
+            self.documents += 1
+            self.routes[report.get('route', 'unknown')] += 1
+            self.winners[report.get('engine') or 'none'] += 1
+            for attempt in report['attempts']:
+                engine = self._engine(attempt['engine'])
+                engine['attempts'] += 1
+                engine[attempt['outcome']] += 1
+                engine['total_ms'] += attempt['ms']
+                engine['max_ms'] = max(engine['max_ms'], attempt['ms'])
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            engines = {}
+            for name, engine in self._engines.items():
+                attempts = engine['attempts']
+                engines[name] = {
+                    **{key: value for key, value in engine.items() if key not in ('total_ms', 'max_ms')},
+                    'success_rate': round(engine['ok'] / attempts, 4) if attempts else 0.0,
+                    'avg_ms': round(engine['total_ms'] / attempts, 2) if attempts else 0.0,
+                    'max_ms': round(engine['max_ms'], 2)
+                }
+            return {
+                'documents': self.documents,
+                'routes': dict(self.routes),
+                'winners': dict(self.winners),
+                'engines': engines
+            }
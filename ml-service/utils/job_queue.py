@@ -0,0 +1,351 @@
+import json
+import logging
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOB_DB = os.getenv(
+    'JOB_DB_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'jobs.sqlite3')
+)
+
+# Task states; a job is 'queued' until its first task starts, 'running' until
+# every task is finished, then 'completed' (per-file failures are in its results)
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = 'queued', 'running', 'succeeded', 'failed', 'cancelled'
+FINISHED_TASK_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    mode TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    options TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    expires_at REAL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    job_id TEXT NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+    idx INTEGER NOT NULL,
+    filename TEXT NOT NULL,
+    content BLOB,
+    priority INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    not_before REAL NOT NULL DEFAULT 0,
+    lease_until REAL,
+    result TEXT,
+    error TEXT,
+    status_code INTEGER,
+    PRIMARY KEY (job_id, idx)
+);
+-- Claim lookups are answered from these indexes alone: reading a task row
+-- means walking past its upload blob
+DROP INDEX IF EXISTS tasks_claim;
+CREATE INDEX IF NOT EXISTS tasks_queued ON tasks (status, priority DESC, created_at, idx, not_before, job_id, attempts);
+CREATE INDEX IF NOT EXISTS tasks_leased ON tasks (status, lease_until, priority, created_at, idx, job_id, attempts);
+CREATE INDEX IF NOT EXISTS jobs_expiry ON jobs (expires_at);
+"""
+
+
+def _to_json(value: Any) -> str:
+    # numpy scalars/arrays from the deep pipeline
+    return json.dumps(value, default=lambda o: o.tolist() if hasattr(o, 'tolist') else str(o))
+
+
+class JobStore:
+    """
+    Persistent job queue in SQLite. A job is one upload of one or more files;
+    every file is a task that is claimed, leased, retried and finished on its
+    own, highest priority first. Finished jobs expire after result_ttl_seconds.
+    One connection guarded by a lock: every call is a short transaction.
+    """
+
+    def __init__(
+        self,
+        path: str = None,
+        max_attempts: int = 3,
+        retry_backoff_seconds: float = 5.0,
+        result_ttl_seconds: float = 86400
+    ):
+        self.path = path or DEFAULT_JOB_DB
+        self.max_attempts = max_attempts
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.result_ttl_seconds = result_ttl_seconds
+        self._lock = threading.Lock()
+
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute('PRAGMA foreign_keys=ON')
+        self._db.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _transaction(self):
+        # BEGIN IMMEDIATE takes the write lock up front, so a claim can't race
+        # another process sharing the database file
+        self._db.execute('BEGIN IMMEDIATE')
+
+    def submit(self, mode: str, files: List[Tuple[str, bytes]], priority: int = 0, options: Dict = None) -> str:
+        job_id = secrets.token_hex(12)
+        now = time.time()
+        with self._lock:
+            self._transaction()
+            try:
+                self._db.execute(
+                    'INSERT INTO jobs (id, mode, priority, status, options, total, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (job_id, mode, priority, QUEUED, json.dumps(options or {}), len(files), now)
+                )
+                self._db.executemany(
+                    'INSERT INTO tasks (job_id, idx, filename, content, priority, created_at, status) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    [(job_id, idx, filename, content, priority, now, QUEUED) for idx, (filename, content) in enumerate(files)]
+                )
+                self._db.execute('COMMIT')
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+        return job_id
+
+    def claim(self, lease_seconds: float, job_id: str = None) -> Optional[Dict[str, Any]]:
+        """
+        Lease the next runnable task: queued and past its retry delay, or
+        running under an expired lease (its worker died). None if there is none.
+        With job_id, only a queued task of that job (to batch its tasks).
+        """
+        now = time.time()
+        with self._lock:
+            self._transaction()
+            try:
+                while True:
+                    row = self._next_runnable(now, job_id)
+                    if row is None:
+                        self._db.execute('COMMIT')
+                        return None
+                    if row['status'] == RUNNING and row['attempts'] >= self.max_attempts:
+                        logger.warning(f"⚠️ Job {row['job_id']} task {row['idx']} lost its worker {row['attempts']} times")
+                        self._finish_task(row['job_id'], row['idx'], FAILED, error='Worker lost', status_code=500)
+                        continue
+                    break
+
+                self._db.execute(
+                    'UPDATE tasks SET status = ?, attempts = attempts + 1, lease_until = ? WHERE job_id = ? AND idx = ?',
+                    (RUNNING, now + lease_seconds, row['job_id'], row['idx'])
+                )
+                self._db.execute(
+                    'UPDATE jobs SET status = ?, started_at = ? WHERE id = ? AND status = ?',
+                    (RUNNING, now, row['job_id'], QUEUED)
+                )
+                # Only the leased task's upload is read
+                upload = self._db.execute(
+                    'SELECT filename, content FROM tasks WHERE job_id = ? AND idx = ?', (row['job_id'], row['idx'])
+                ).fetchone()
+                job = self._db.execute('SELECT mode, options FROM jobs WHERE id = ?', (row['job_id'],)).fetchone()
+                self._db.execute('COMMIT')
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+
+        return {
+            'job_id': row['job_id'],
+            'index': row['idx'],
+            'filename': upload['filename'],
+            'content': bytes(upload['content']),
+            'attempt': row['attempts'] + 1,
+            'mode': job['mode'],
+            'options': json.loads(job['options'])
+        }
+
+    def _next_runnable(self, now: float, job_id: str = None) -> Optional[sqlite3.Row]:
+        """
+        Highest-priority task that is queued past its retry delay or running
+        under an expired lease. One lookup per state, each covered by its
+        index, instead of an OR that can use neither.
+        """
+        queued = self._db.execute(
+            f"""
+            SELECT job_id, idx, status, attempts, priority, created_at FROM tasks INDEXED BY tasks_queued
+            WHERE status = ? AND not_before <= ?{' AND job_id = ?' if job_id else ''}
+            ORDER BY priority DESC, created_at, idx
+            LIMIT 1
+            """,
+            (QUEUED, now, job_id) if job_id else (QUEUED, now)
+        ).fetchone()
+        if job_id:
+            return queued
+        leased = self._db.execute(
+            """
+            SELECT job_id, idx, status, attempts, priority, created_at FROM tasks INDEXED BY tasks_leased
+            WHERE status = ? AND lease_until < ?
+            ORDER BY priority DESC, created_at, idx
+            LIMIT 1
+            """,
+            (RUNNING, now)
+        ).fetchone()
+        candidates = [row for row in (queued, leased) if row is not None]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda row: (-row['priority'], row['created_at'], row['idx']))
+
+    def complete(self, job_id: str, index: int, result: Any):
+        self._finish(job_id, index, SUCCEEDED, result=_to_json(result))
+
+    def fail(self, job_id: str, index: int, error: str, status_code: int, retry: bool) -> str:
+        """
+        Record a failed attempt; retried with exponential backoff while
+        attempts remain. Returns the task's new state.
+        """
+        with self._lock:
+            self._transaction()
+            try:
+                row = self._db.execute(
+                    'SELECT attempts, status FROM tasks WHERE job_id = ? AND idx = ?', (job_id, index)
+                ).fetchone()
+                if row is None or row['status'] != RUNNING:
+                    # Job expired or was cancelled meanwhile
+                    self._db.execute('COMMIT')
+                    return row['status'] if row else CANCELLED
+                if retry and row['attempts'] < self.max_attempts:
+                    delay = self.retry_backoff_seconds * 2 ** (row['attempts'] - 1)
+                    self._db.execute(
+                        'UPDATE tasks SET status = ?, not_before = ?, lease_until = NULL, error = ? WHERE job_id = ? AND idx = ?',
+                        (QUEUED, time.time() + delay, error, job_id, index)
+                    )
+                    state = QUEUED
+                else:
+                    self._finish_task(job_id, index, FAILED, error=error, status_code=status_code)
+                    state = FAILED
+                self._db.execute('COMMIT')
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+        return state
+
+    def _finish(self, job_id: str, index: int, state: str, **fields):
+        with self._lock:
+            self._transaction()
+            try:
+                self._finish_task(job_id, index, state, **fields)
+                self._db.execute('COMMIT')
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+
+    def _finish_task(self, job_id: str, index: int, state: str, result: str = None, error: str = None,
+                     status_code: int = None):
+        """
+        Terminal task state (the upload itself is dropped); completes the job
+        when it was the last task. Runs inside the caller's transaction.
+        """
+        updated = self._db.execute(
+            """
+            UPDATE tasks SET status = ?, result = ?, error = ?, status_code = ?, content = NULL, lease_until = NULL
+            WHERE job_id = ? AND idx = ? AND status = ?
+            """,
+            (state, result, error, status_code, job_id, index, RUNNING)
+        ).rowcount
+        if not updated:
+            return
+        remaining = self._db.execute(
+            f"SELECT COUNT(*) FROM tasks WHERE job_id = ? AND status NOT IN ({','.join('?' * len(FINISHED_TASK_STATES))})",
+            (job_id, *FINISHED_TASK_STATES)
+        ).fetchone()[0]
+        if not remaining:
+            now = time.time()
+            self._db.execute(
+                "UPDATE jobs SET status = 'completed', finished_at = ?, expires_at = ? WHERE id = ? AND status != ?",
+                (now, now + self.result_ttl_seconds, job_id, CANCELLED)
+            )
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel the job's tasks that have not started; running ones still finish
+        """
+        now = time.time()
+        with self._lock:
+            self._transaction()
+            try:
+                updated = self._db.execute(
+                    "UPDATE jobs SET status = ?, finished_at = ?, expires_at = ? WHERE id = ? AND status IN (?, ?)",
+                    (CANCELLED, now, now + self.result_ttl_seconds, job_id, QUEUED, RUNNING)
+                ).rowcount
+                self._db.execute(
+                    'UPDATE tasks SET status = ?, content = NULL WHERE job_id = ? AND status = ?',
+                    (CANCELLED, job_id, QUEUED)
+                )
+                self._db.execute('COMMIT')
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+        return bool(updated)
+
+    def get(self, job_id: str, include_results: bool = True) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._db.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+            if job is None:
+                return None
+            tasks = self._db.execute(
+                'SELECT idx, filename, status, attempts, result, error, status_code FROM tasks WHERE job_id = ? ORDER BY idx',
+                (job_id,)
+            ).fetchall()
+
+        counts = {state: 0 for state in (QUEUED, RUNNING, *FINISHED_TASK_STATES)}
+        for task in tasks:
+            counts[task['status']] += 1
+        report = {
+            'job_id': job['id'],
+            'status': job['status'],
+            'mode': job['mode'],
+            'priority': job['priority'],
+            'total': job['total'],
+            'progress': counts,
+            'created_at': job['created_at'],
+            'started_at': job['started_at'],
+            'finished_at': job['finished_at'],
+            'expires_at': job['expires_at']
+        }
+        if include_results:
+            results = []
+            for task in tasks:
+                entry = {'index': task['idx'], 'filename': task['filename'], 'status': task['status'],
+                         'attempts': task['attempts']}
+                if task['result'] is not None:
+                    entry['data'] = json.loads(task['result'])
+                if task['error'] is not None:
+                    entry['error'] = task['error']
+                    entry['status_code'] = task['status_code']
+                results.append(entry)
+            report['results'] = results
+        return report
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            return self._db.execute(
+                'DELETE FROM jobs WHERE expires_at IS NOT NULL AND expires_at < ?', (time.time(),)
+            ).rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            jobs = dict(self._db.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status').fetchall())
+            tasks = dict(self._db.execute('SELECT status, COUNT(*) FROM tasks GROUP BY status').fetchall())
+        return {
+            'path': self.path,
+            'jobs': jobs,
+            'tasks': tasks,
+            'max_attempts': self.max_attempts,
+            'result_ttl_seconds': self.result_ttl_seconds
+        }
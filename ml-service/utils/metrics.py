@@ -0,0 +1,224 @@
+import math
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, List, Sequence, Tuple
+
+# Seconds; resume stages range from sub-millisecond regexes to multi-second PDFs
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class _Metric:
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._series: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str):
+        """
+        The child series for these label values; keep it around on hot paths
+        """
+        series = self._series.get(values)
+        if series is None:
+            if len(values) != len(self.label_names):
+                raise ValueError(f"{self.name} expects labels {self.label_names}, got {values}")
+            with self._lock:
+                series = self._series.setdefault(values, self._new_series())
+        return series
+
+    def _new_series(self):
+        raise NotImplementedError
+
+    def collect(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        for values, series in sorted(self._series.items()):
+            lines.extend(self._sample_lines(values, series))
+        return lines
+
+    def _sample_lines(self, values, series) -> List[str]:
+        raise NotImplementedError
+
+
+class _CounterSeries:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        # acquire/release directly: a with block costs several times more here
+        self._lock.acquire()
+        self.value += amount
+        self._lock.release()
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def _new_series(self):
+        return _CounterSeries()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def _sample_lines(self, values, series) -> List[str]:
+        return [f'{self.name}_total{_label_text(self.label_names, values)} {_format_value(series.value)}']
+
+
+class _GaugeSeries(_CounterSeries):
+    __slots__ = ()
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+    def set(self, value: float):
+        self.value = value
+
+
+class Gauge(_Metric):
+    """
+    Settable gauge, or one read from a callable at scrape time
+    """
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                 function: Callable[[], float] = None):
+        super().__init__(name, documentation, label_names)
+        self.function = function
+        if function is not None:
+            self.labels()
+
+    def _new_series(self):
+        return _GaugeSeries()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self.labels().dec(amount)
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+    def _sample_lines(self, values, series) -> List[str]:
+        value = self.function() if self.function is not None else series.value
+        return [f'{self.name}{_label_text(self.label_names, values)} {_format_value(value)}']
+
+
+class _HistogramSeries:
+    __slots__ = ('bounds', 'counts', 'sum', '_lock')
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        # One bisect and two additions under the lock, well under a microsecond;
+        # nothing between acquire and release can raise
+        index = bisect_left(self.bounds, value)
+        self._lock.acquire()
+        self.counts[index] += 1
+        self.sum += value
+        self._lock.release()
+
+
+class Histogram(_Metric):
+    """
+    Fixed-bucket histogram; per-bucket counts are made cumulative only when scraped
+    """
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.bounds = tuple(sorted(buckets))
+
+    def _new_series(self):
+        return _HistogramSeries(self.bounds)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def _sample_lines(self, values, series) -> List[str]:
+        with series._lock:
+            counts = list(series.counts)
+            total = series.sum
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.bounds + (math.inf,), counts):
+            cumulative += count
+            le = 'le="' + _format_value(bound) + '"'
+            lines.append(f'{self.name}_bucket{_label_text(self.label_names, values, le)} {cumulative}')
+        labels = _label_text(self.label_names, values)
+        lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+        lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Process-local set of metrics rendered in the Prometheus text format
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, label_names: Sequence[str] = (),
+              function: Callable[[], float] = None) -> Gauge:
+        return self.register(Gauge(name, documentation, label_names, function))
+
+    def histogram(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, label_names, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.collect())
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+# Shared so pipeline code outside app.py (e.g. ATSScorer) reports into the same histogram
+STAGE_SECONDS = registry.histogram(
+    'ml_stage_duration_seconds', 'Time spent in each resume pipeline stage', ('stage',)
+)
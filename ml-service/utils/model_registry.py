@@ -0,0 +1,163 @@
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SENTENCE_MODEL = 'all-MiniLM-L6-v2'
+
+
+def _rss_bytes() -> Optional[int]:
+    """
+    Current resident set size of this process (Linux only)
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _parameter_bytes(model: Any) -> Optional[int]:
+    """
+    Size of a torch model's weights, if it exposes parameters()
+    """
+    try:
+        return int(sum(p.numel() * p.element_size() for p in model.parameters()))
+    except Exception:
+        return None
+
+
+def _load_sentence_transformer(model_name: str):
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name)
+
+
+class SharedEncoder:
+    """
+    Thread-safe handle around one loaded embedding model.
+    encode() is serialized; every other attribute is passed through to the model.
+    """
+
+    def __init__(self, model: Any, name: str):
+        self._model = model
+        self._lock = threading.Lock()
+        self.name = name
+
+    def encode(self, *args, **kwargs):
+        with self._lock:
+            return self._model.encode(*args, **kwargs)
+
+    def __getattr__(self, item):
+        return getattr(self._model, item)
+
+
+class ModelRegistry:
+    """
+    Process-wide registry: each model name is loaded once and shared by every caller
+    """
+
+    def __init__(self, loader: Callable[[str], Any] = _load_sentence_transformer):
+        self._loader = loader
+        self._models: Dict[str, Any] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._loading: Dict[str, threading.Lock] = {}
+
+    def get(self, model_name: str = DEFAULT_SENTENCE_MODEL, loader: Callable[[str], Any] = None) -> Any:
+        """
+        Return the shared encoder for model_name, loading it on first use.
+        With a custom loader (e.g. a spaCy pipeline) the loaded object is
+        returned as-is instead of wrapped in a SharedEncoder.
+        """
+        encoder = self._models.get(model_name)
+        if encoder is not None:
+            return encoder
+
+        # One lock per model so loading one model never blocks another
+        with self._lock:
+            load_lock = self._loading.setdefault(model_name, threading.Lock())
+
+        with load_lock:
+            encoder = self._models.get(model_name)
+            if encoder is not None:
+                return encoder
+
+            rss_before = _rss_bytes()
+            start = time.perf_counter()
+            model = (loader or self._loader)(model_name)
+            load_seconds = time.perf_counter() - start
+            rss_after = _rss_bytes()
+
+            stats = {
+                'load_seconds': round(load_seconds, 3),
+                'parameter_bytes': _parameter_bytes(model),
+                'rss_delta_bytes': (
+                    rss_after - rss_before
+                    if rss_before is not None and rss_after is not None else None
+                )
+            }
+            encoder = model if loader else SharedEncoder(model, model_name)
+            with self._lock:
+                self._stats[model_name] = stats
+                self._models[model_name] = encoder
+
+            logger.info(
+                f"✅ Loaded model '{model_name}' in {stats['load_seconds']}s "
+                f"(weights: {_format_mb(stats['parameter_bytes'])}, "
+                f"rss +{_format_mb(stats['rss_delta_bytes'])})"
+            )
+            return encoder
+
+    def is_loaded(self, model_name: str) -> bool:
+        return model_name in self._models
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Load time and memory per loaded model
+        """
+        with self._lock:
+            return {name: dict(s) for name, s in self._stats.items()}
+
+
+def _format_mb(num_bytes: Optional[int]) -> str:
+    if num_bytes is None:
+        return 'n/a'
+    return f"{num_bytes / (1024 * 1024):.1f} MB"
+
+
+class LazyEncoder:
+    """
+    Handle to a registry model that is only loaded on first use, so building
+    a component (or serving cached embeddings) never pays the model load
+    """
+
+    def __init__(self, registry: ModelRegistry, name: str):
+        self._registry = registry
+        self.name = name
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._registry.is_loaded(self.name)
+
+    def encode(self, *args, **kwargs):
+        return self._registry.get(self.name).encode(*args, **kwargs)
+
+    def __getattr__(self, item):
+        # Private lookups (copy, pickle) must not trigger a model load
+        if item.startswith('_'):
+            raise AttributeError(item)
+        return getattr(self._registry.get(self.name), item)
+
+
+# Shared by every component in this process
+registry = ModelRegistry()
+
+
+def get_encoder(model_name: str = DEFAULT_SENTENCE_MODEL) -> LazyEncoder:
+    """
+    Shared, thread-safe encoder for model_name, loaded on first encode()
+    """
+    return LazyEncoder(registry, model_name)
@@ -0,0 +1,230 @@
+import json
+import logging
+import os
+import re
+import secrets
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_DIR = os.getenv(
+    'PROFILE_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'profiles')
+)
+
+# UTC timestamp to the microsecond, so ids sort oldest first
+PROFILE_ID_PATTERN = re.compile(r'^[0-9]{8}T[0-9]{12}-[0-9a-f]{8}$')
+
+# tracemalloc is process-global: one profile at a time may reset and read its peak
+_memory_lock = threading.Lock()
+
+
+@contextmanager
+def stage(report: Optional[dict], name: str):
+    """
+    Time a pipeline stage: wall seconds into report['stages'][name], and when
+    the report is being profiled (see profiled) CPU seconds and peak allocation
+    into report['profile']['stages'][name]. Stages may nest.
+    """
+    if report is None:
+        yield
+        return
+
+    profile = report.get('profile')
+    if profile is not None and profile.get('tracing'):
+        # reset_peak() hides the enclosing stage's peak, so carry it forward
+        outer_peak = max(profile['peak'], tracemalloc.get_traced_memory()[1])
+        profile['peak'] = 0
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+    else:
+        outer_peak = base = None
+    wall = time.perf_counter()
+    cpu = time.thread_time()
+    try:
+        yield
+    finally:
+        wall = time.perf_counter() - wall
+        report.setdefault('stages', {})[name] = wall
+        if profile is not None:
+            entry = {'wall_seconds': round(wall, 6), 'cpu_seconds': round(time.thread_time() - cpu, 6)}
+            if base is not None:
+                peak = max(tracemalloc.get_traced_memory()[1], profile['peak'])
+                entry['peak_alloc_bytes'] = max(0, peak - base)
+                profile['peak'] = max(outer_peak, peak)
+            profile['stages'][name] = entry
+
+
+class StackSampler:
+    """
+    Statistical profiler: a daemon thread reads one thread's Python stack
+    every interval. Samples are weighted by the time since the previous one,
+    so a long call that holds the GIL (a regex, a C parser) is charged
+    to the line that was running when the sampler got the GIL back.
+    """
+
+    def __init__(self, thread_id: int = None, interval: float = 0.002, max_depth: int = 64):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks: Counter = Counter()
+        self.lines: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'StackSampler':
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> 'StackSampler':
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            if frame is None:
+                continue
+            self._record(frame, now - last)
+            last = now
+
+    def _record(self, frame, weight: float):
+        leaf = frame
+        names = []
+        while frame is not None and len(names) < self.max_depth:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        self.stacks[';'.join(reversed(names))] += weight
+        self.lines[f"{leaf.f_code.co_name} ({leaf.f_code.co_filename}:{leaf.f_lineno})"] += weight
+        self.samples += 1
+
+    def collapsed(self) -> str:
+        """
+        Stacks in the collapsed format flamegraph.pl and speedscope read (weights in µs)
+        """
+        return '\n'.join(
+            f"{stack} {max(1, round(seconds * 1e6))}" for stack, seconds in self.stacks.most_common()
+        )
+
+    def hot_lines(self, limit: int = 20) -> List[Dict[str, Any]]:
+        return [
+            {'line': line, 'seconds': round(seconds, 6)} for line, seconds in self.lines.most_common(limit)
+        ]
+
+
+@contextmanager
+def profiled(report: dict, interval: float = 0.002):
+    """
+    Profile the calling thread for the duration of the block: a StackSampler,
+    tracemalloc and whole-run wall/CPU time.
+    Fills report['profile']; stages run inside fill report['profile']['stages'].
+    Only one profile per process tracks memory; while another one holds
+    tracemalloc, peak_alloc_bytes is None and memory_tracked is False.
+    """
+    tracing = _memory_lock.acquire(blocking=False)
+    profile = report['profile'] = {'stages': {}, 'peak': 0, 'tracing': tracing}
+    started_tracing = tracing and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    if tracing:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+    sampler = StackSampler(interval=interval).start()
+    wall = time.perf_counter()
+    cpu = time.thread_time()
+    try:
+        yield profile
+    finally:
+        wall = time.perf_counter() - wall
+        cpu = time.thread_time() - cpu
+        sampler.stop()
+        peak = profile.pop('peak')
+        if profile.pop('tracing'):
+            peak = max(0, max(tracemalloc.get_traced_memory()[1], peak) - base)
+            if started_tracing:
+                tracemalloc.stop()
+            _memory_lock.release()
+        else:
+            peak = None
+        profile.update(
+            wall_seconds=round(wall, 6),
+            cpu_seconds=round(cpu, 6),
+            peak_alloc_bytes=peak,
+            memory_tracked=tracing,
+            sample_interval_seconds=interval,
+            samples=sampler.samples,
+            hot_lines=sampler.hot_lines(),
+            collapsed_stacks=sampler.collapsed()
+        )
+
+
+class ProfileRing:
+    """
+    Bounded on-disk ring of request profiles (one JSON file each); the
+    oldest are deleted once more than max_profiles are stored
+    """
+
+    def __init__(self, directory: str = None, max_profiles: int = 50):
+        self.directory = directory or DEFAULT_PROFILE_DIR
+        self.max_profiles = max(1, max_profiles)
+        self._lock = threading.Lock()
+
+    def _path(self, profile_id: str) -> str:
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            raise KeyError(profile_id)
+        return os.path.join(self.directory, f"{profile_id}.json")
+
+    def ids(self) -> List[str]:
+        """
+        Stored profile ids, oldest first
+        """
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(name[:-5] for name in names if name.endswith('.json') and PROFILE_ID_PATTERN.match(name[:-5]))
+
+    def save(self, profile: Dict[str, Any]) -> str:
+        now = time.time()
+        profile_id = f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime(now))}{int(now % 1 * 1e6):06d}-{secrets.token_hex(4)}"
+        profile = {'id': profile_id, **profile}
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(profile, f)
+                os.replace(tmp_path, self._path(profile_id))
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+
+            for old_id in self.ids()[:-self.max_profiles]:
+                try:
+                    os.unlink(self._path(old_id))
+                except FileNotFoundError:
+                    pass
+        logger.info(f"🔬 Saved profile {profile_id}")
+        return profile_id
+
+    def load(self, profile_id: str) -> Dict[str, Any]:
+        try:
+            with open(self._path(profile_id), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise KeyError(profile_id)
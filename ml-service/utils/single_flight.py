@@ -0,0 +1,52 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key onto one computation.
+    The first caller starts it as its own task; callers arriving while it
+    runs await that task instead of starting another, and get the same
+    result or exception. A caller giving up (e.g. a client disconnect)
+    never cancels the computation the others are waiting on.
+    Event-loop only: not for use across threads.
+    on_join, if given, is called for every caller that joins a running call.
+    """
+
+    def __init__(self, on_join: Callable[[], Any] = None):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.on_join = on_join
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        (result of func(), whether it was shared with an earlier caller)
+        """
+        task = self._calls.get(key)
+        shared = task is not None
+        if shared:
+            self.coalesced += 1
+            if self.on_join is not None:
+                self.on_join()
+        else:
+            self.leaders += 1
+            task = self._calls[key] = asyncio.ensure_future(func())
+            task.add_done_callback(lambda done: self._finished(key, done))
+        return await asyncio.shield(task), shared
+
+    def _finished(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Retrieve it, so an error nobody stayed to await isn't logged as never retrieved
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        calls = self.leaders + self.coalesced
+        return {
+            'in_flight': len(self._calls),
+            'leaders': self.leaders,
+            'coalesced': self.coalesced,
+            'coalesced_rate': round(self.coalesced / calls, 4) if calls else 0.0
+        }
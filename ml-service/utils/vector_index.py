@@ -0,0 +1,388 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout changes
+INDEX_FORMAT_VERSION = 1
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first
+    """
+    if k >= len(scores):
+        return np.argsort(-scores, kind='stable')
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+
+def _atomic_write(path: str, write: Callable[[Any], None], mode: str = 'wb'):
+    # Write to a temp file and rename so readers never see a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode) as f:
+            write(f)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+class VectorIndex:
+    """
+    Cosine top-K index over string-keyed vectors with incremental add/delete.
+
+    mode='exact' scans every vector in blocks of block_size rows.
+    mode='ivf' clusters vectors with k-means into nlist inverted lists and
+    scans only the nprobe lists whose centroids are closest to the query,
+    so search cost grows roughly with sqrt(N) instead of N. Until enough
+    vectors exist to train the clusters, ivf falls back to exact search.
+
+    Deletes leave tombstones that compact() (run automatically once half
+    the rows are dead) reclaims.
+    """
+
+    def __init__(
+        self,
+        dim: int = None,
+        mode: str = 'exact',
+        nlist: int = None,
+        nprobe: int = 8,
+        block_size: int = 65536,
+        metadata: Dict[str, Any] = None
+    ):
+        if mode not in ('exact', 'ivf'):
+            raise ValueError(f"Unknown index mode '{mode}' (expected 'exact' or 'ivf')")
+
+        self.dim = dim
+        self.mode = mode
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.block_size = block_size
+        self.metadata = dict(metadata or {})
+
+        self._lock = threading.RLock()
+        self._vectors = np.empty((0, dim or 0), dtype=np.float32)
+        self._size = 0
+        self._ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._alive = np.zeros(0, dtype=bool)
+
+        # IVF state
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._lists: List[List[int]] = []
+        self._list_arrays: Dict[int, np.ndarray] = {}
+        self._trained_size = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._rows
+
+    def add(self, ids: List[str], vectors: np.ndarray):
+        """
+        Insert or replace vectors; an existing id is overwritten
+        """
+        vectors = _normalize_rows(np.atleast_2d(vectors))
+        if len(ids) != len(vectors):
+            raise ValueError(f"Got {len(ids)} ids for {len(vectors)} vectors")
+        if not len(ids):
+            return
+
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                self._vectors = np.empty((0, self.dim), dtype=np.float32)
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Expected {self.dim}-dimensional vectors, got {vectors.shape[1]}")
+
+            # Within one batch the last vector for an id wins
+            latest = {item_id: i for i, item_id in enumerate(ids)}
+            if len(latest) != len(ids):
+                keep = sorted(latest.values())
+                ids = [ids[i] for i in keep]
+                vectors = vectors[keep]
+
+            self._tombstone([item_id for item_id in ids if item_id in self._rows])
+
+            start = self._size
+            self._reserve(start + len(ids))
+            self._vectors[start:start + len(ids)] = vectors
+            self._alive[start:start + len(ids)] = True
+            self._ids.extend(ids)
+            for offset, item_id in enumerate(ids):
+                self._rows[item_id] = start + offset
+            self._size += len(ids)
+
+            if self.mode == 'ivf':
+                if self._centroids is None or len(self._rows) >= 4 * max(self._trained_size, 1):
+                    self._train()
+                else:
+                    self._assign(np.arange(start, self._size))
+
+    def delete(self, ids: Iterable[str]) -> int:
+        """
+        Remove ids; returns how many were present
+        """
+        with self._lock:
+            removed = self._tombstone([item_id for item_id in ids if item_id in self._rows])
+            dead = self._size - len(self._rows)
+            if self._size >= 1024 and dead * 2 >= self._size:
+                self.compact()
+            return removed
+
+    def _tombstone(self, ids: List[str]) -> int:
+        for item_id in ids:
+            row = self._rows.pop(item_id)
+            self._alive[row] = False
+            self._ids[row] = None
+        return len(ids)
+
+    def _reserve(self, rows: int):
+        capacity = len(self._vectors)
+        if rows <= capacity:
+            return
+        # Grow geometrically so repeated small adds stay amortized O(1)
+        capacity = max(rows, capacity * 2, 1024)
+        vectors = np.empty((capacity, self.dim), dtype=np.float32)
+        vectors[:self._size] = self._vectors[:self._size]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self._size] = self._alive[:self._size]
+        assignments = np.zeros(capacity, dtype=np.int32)
+        assignments[:len(self._assignments)] = self._assignments[:capacity]
+        self._vectors, self._alive, self._assignments = vectors, alive, assignments
+
+    def compact(self):
+        """
+        Drop tombstoned rows and rebuild the inverted lists
+        """
+        with self._lock:
+            keep = np.flatnonzero(self._alive[:self._size])
+            self._vectors = np.ascontiguousarray(self._vectors[keep])
+            self._alive = np.ones(len(keep), dtype=bool)
+            self._assignments = self._assignments[keep] if len(self._assignments) else self._assignments
+            self._ids = [self._ids[row] for row in keep.tolist()]
+            self._rows = {item_id: row for row, item_id in enumerate(self._ids)}
+            self._size = len(keep)
+            if self.mode == 'ivf' and self._centroids is not None:
+                self._rebuild_lists()
+
+    def _train(self, iterations: int = 10, seed: int = 0):
+        """
+        Spherical k-means over the live vectors
+        """
+        live = np.flatnonzero(self._alive[:self._size])
+        nlist = self.nlist or max(1, int(np.sqrt(len(live))))
+        if len(live) < max(2 * nlist, 64):
+            # Too few vectors for useful clusters; search stays exact
+            self._centroids = None
+            return
+
+        rng = np.random.default_rng(seed)
+        sample = live if len(live) <= 256 * nlist else rng.choice(live, 256 * nlist, replace=False)
+        data = self._vectors[sample]
+        centroids = data[rng.choice(len(data), nlist, replace=False)].copy()
+
+        for _ in range(iterations):
+            labels = np.argmax(data @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, data)
+            counts = np.bincount(labels, minlength=nlist)
+            empty = counts == 0
+            # Re-seed empty clusters with random points so every list is used
+            sums[empty] = data[rng.choice(len(data), int(empty.sum()))]
+            centroids = _normalize_rows(sums)
+
+        self._centroids = centroids.astype(np.float32)
+        self._trained_size = len(live)
+        self._assign(np.arange(self._size), update_lists=False)
+        self._rebuild_lists()
+        logger.info(f"🧭 Trained IVF index: {nlist} lists over {len(live)} vectors")
+
+    def _assign(self, rows: np.ndarray, update_lists: bool = True):
+        if self._centroids is None or not len(rows):
+            return
+        for start in range(0, len(rows), self.block_size):
+            block = rows[start:start + self.block_size]
+            labels = np.argmax(self._vectors[block] @ self._centroids.T, axis=1).astype(np.int32)
+            self._assignments[block] = labels
+            if update_lists:
+                for row, label in zip(block.tolist(), labels.tolist()):
+                    self._lists[label].append(row)
+                    self._list_arrays.pop(label, None)
+
+    def _rebuild_lists(self):
+        self._lists = [[] for _ in range(len(self._centroids))]
+        live = np.flatnonzero(self._alive[:self._size])
+        for row, label in zip(live.tolist(), self._assignments[live].tolist()):
+            self._lists[label].append(row)
+        self._list_arrays = {}
+
+    def _list_rows(self, label: int) -> np.ndarray:
+        rows = self._list_arrays.get(label)
+        if rows is None:
+            rows = np.asarray(self._lists[label], dtype=np.int64)
+            self._list_arrays[label] = rows
+        return rows
+
+    def search(self, query: np.ndarray, top_k: int = 10, nprobe: int = None) -> List[Tuple[str, float]]:
+        """
+        (id, cosine similarity) of the top_k nearest vectors, best first
+        """
+        with self._lock:
+            if not self._rows or top_k <= 0:
+                return []
+            query = _normalize_rows(np.atleast_2d(query))[0]
+
+            if self.mode == 'ivf' and self._centroids is not None:
+                rows, scores = self._search_ivf(query, top_k, nprobe or self.nprobe)
+            else:
+                rows, scores = self._search_exact(query, top_k)
+
+            return [(self._ids[row], float(score)) for row, score in zip(rows.tolist(), scores.tolist())]
+
+    def _search_exact(self, query: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        best_rows, best_scores = [], []
+        for start in range(0, self._size, self.block_size):
+            stop = min(start + self.block_size, self._size)
+            scores = self._vectors[start:stop] @ query
+            scores[~self._alive[start:stop]] = -np.inf
+            top = _top_k(scores, top_k)
+            best_rows.append(top + start)
+            best_scores.append(scores[top])
+
+        rows = np.concatenate(best_rows)
+        scores = np.concatenate(best_scores)
+        top = _top_k(scores, top_k)
+        top = top[np.isfinite(scores[top])]
+        return rows[top], scores[top]
+
+    def _search_ivf(self, query: np.ndarray, top_k: int, nprobe: int) -> Tuple[np.ndarray, np.ndarray]:
+        probes = _top_k(self._centroids @ query, min(nprobe, len(self._centroids)))
+        rows = np.concatenate([self._list_rows(label) for label in probes.tolist()])
+        if not len(rows):
+            return rows, np.zeros(0, dtype=np.float32)
+        rows = rows[self._alive[rows]]
+        scores = self._vectors[rows] @ query
+        top = _top_k(scores, top_k)
+        return rows[top], scores[top]
+
+    def save(self, directory: str):
+        """
+        Write the index to directory. Arrays go to new files and manifest.json,
+        which names them, is replaced last, so a crash mid-save leaves the
+        previous index loadable.
+        """
+        with self._lock:
+            self.compact()
+            os.makedirs(directory, exist_ok=True)
+            generation = os.urandom(4).hex()
+            trained = self._centroids is not None
+
+            arrays = {'vectors': self._vectors[:self._size]}
+            if trained:
+                arrays['centroids'] = self._centroids
+                arrays['assignments'] = self._assignments[:self._size]
+
+            files = {}
+            for name, array in arrays.items():
+                files[name] = f"{name}-{generation}.npy"
+                _atomic_write(os.path.join(directory, files[name]), lambda f, a=array: np.save(f, a))
+
+            manifest = {
+                'format_version': INDEX_FORMAT_VERSION,
+                'dim': self.dim,
+                'mode': self.mode,
+                'nlist': self.nlist,
+                'nprobe': self.nprobe,
+                'trained_size': self._trained_size if trained else 0,
+                'count': self._size,
+                'files': files,
+                'ids': self._ids,
+                'metadata': self.metadata
+            }
+            _atomic_write(
+                os.path.join(directory, 'manifest.json'),
+                lambda f: json.dump(manifest, f, ensure_ascii=False),
+                mode='w'
+            )
+
+            # Arrays from earlier saves are no longer referenced
+            current = set(files.values())
+            for filename in os.listdir(directory):
+                if filename.endswith('.npy') and filename not in current:
+                    try:
+                        os.unlink(os.path.join(directory, filename))
+                    except OSError:
+                        pass
+
+            logger.info(f"💾 Saved {self._size} vectors to {directory}")
+
+    @classmethod
+    def load(cls, directory: str) -> 'VectorIndex':
+        """
+        Load an index written by save(); raises ValueError if it is incomplete
+        """
+        with open(os.path.join(directory, 'manifest.json')) as f:
+            manifest = json.load(f)
+        if manifest.get('format_version') != INDEX_FORMAT_VERSION:
+            raise ValueError(f"Unsupported index format {manifest.get('format_version')} in {directory}")
+
+        index = cls(
+            dim=manifest['dim'],
+            mode=manifest['mode'],
+            nlist=manifest['nlist'],
+            nprobe=manifest['nprobe'],
+            metadata=manifest.get('metadata')
+        )
+        files = manifest['files']
+        count = manifest['count']
+
+        vectors = np.load(os.path.join(directory, files['vectors']))
+        if vectors.shape != (count, manifest['dim']) or len(manifest['ids']) != count:
+            raise ValueError(f"Index in {directory} is inconsistent: {vectors.shape} vectors for {count} ids")
+
+        index._vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        index._alive = np.ones(count, dtype=bool)
+        index._ids = list(manifest['ids'])
+        index._rows = {item_id: row for row, item_id in enumerate(index._ids)}
+        index._size = count
+        index._assignments = np.zeros(count, dtype=np.int32)
+
+        if 'centroids' in files:
+            index._centroids = np.load(os.path.join(directory, files['centroids'])).astype(np.float32)
+            index._assignments = np.load(os.path.join(directory, files['assignments'])).astype(np.int32)
+            index._trained_size = manifest['trained_size']
+            index._rebuild_lists()
+
+        logger.info(f"✅ Loaded {count} vectors from {directory}")
+        return index
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'mode': self.mode,
+                'dim': self.dim,
+                'count': len(self._rows),
+                'tombstones': self._size - len(self._rows),
+                'capacity': len(self._vectors),
+                'lists': len(self._centroids) if self._centroids is not None else 0,
+                'nprobe': self.nprobe,
+                'trained_size': self._trained_size
+            }
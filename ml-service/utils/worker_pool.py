@@ -0,0 +1,247 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import weakref
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class PoolSaturatedError(RuntimeError):
+    """
+    Raised when the pool already holds max_pending jobs
+    """
+
+
+class PipelineTimeoutError(TimeoutError):
+    """
+    Raised when a job does not finish within the pool timeout
+    """
+
+
+class WorkerPool:
+    """
+    Runs CPU-bound pipeline work off the event loop.
+    Uses a process pool when available, falling back to a thread pool.
+    Admission is bounded by max_pending and every job by timeout_seconds.
+    """
+
+    def __init__(
+        self,
+        mode: str = 'process',
+        max_workers: int = None,
+        max_pending: int = None,
+        timeout_seconds: float = 60.0,
+        start_method: str = None
+    ):
+        self.requested_mode = mode
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.max_workers * 4
+        self.timeout_seconds = timeout_seconds
+        self.start_method = start_method
+
+        self.mode: Optional[str] = None
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        # Futures of timed-out jobs whose slot was released early
+        self._abandoned = set()
+        # Executors torn down by _recycle; their BrokenProcessPool isn't the job's fault
+        self._recycled_executors = weakref.WeakSet()
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.failed = 0
+        self.recycled = 0
+        self.resubmitted = 0
+
+    @classmethod
+    def from_env(cls, prefix: str = 'PIPELINE', default_workers: int = 0, default_timeout: float = 60) -> 'WorkerPool':
+        """
+        Pool configured from <prefix>_EXECUTOR, _WORKERS, _MAX_PENDING,
+        _TIMEOUT_SECONDS and _START_METHOD
+        """
+        return cls(
+            mode=os.getenv(f'{prefix}_EXECUTOR', 'process'),
+            max_workers=int(os.getenv(f'{prefix}_WORKERS', str(default_workers))) or None,
+            max_pending=int(os.getenv(f'{prefix}_MAX_PENDING', '0')) or None,
+            timeout_seconds=float(os.getenv(f'{prefix}_TIMEOUT_SECONDS', str(default_timeout))),
+            start_method=os.getenv(f'{prefix}_START_METHOD') or None
+        )
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is not None:
+                return self._executor
+
+            if self.requested_mode == 'process':
+                try:
+                    context = multiprocessing.get_context(self.start_method)
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+                    self.mode = 'process'
+                except (OSError, ValueError, NotImplementedError, ImportError) as e:
+                    logger.warning(f"⚠️ Process pool unavailable ({e}), falling back to threads")
+
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix='pipeline'
+                )
+                self.mode = 'thread'
+
+            logger.info(f"🧵 Pipeline pool ready: {self.mode} x{self.max_workers} (max pending {self.max_pending})")
+            return self._executor
+
+    def _release(self, future):
+        with self._lock:
+            if future in self._abandoned:
+                # Its slot was already given back when the pool was recycled
+                self._abandoned.discard(future)
+                return
+            self._pending -= 1
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+    def _submit(self, func: Callable, args: tuple) -> Tuple[Future, Executor]:
+        """
+        Submit to the current executor, replacing it once if it is broken.
+        Gives the caller's slot back if the job can't be submitted at all.
+        """
+        try:
+            try:
+                executor = self._get_executor()
+                future = executor.submit(func, *args)
+            except (BrokenProcessPool, RuntimeError):
+                # A crashed worker poisons the whole process pool; start a fresh one
+                self._reset_executor()
+                executor = self._get_executor()
+                future = executor.submit(func, *args)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+
+        # Slot is freed when the work actually finishes, not when we stop waiting
+        future.add_done_callback(self._release)
+        return future, executor
+
+    async def run(self, func: Callable, *args) -> Any:
+        """
+        Run func(*args) in the pool and await its result.
+        A job that outlives timeout_seconds gets its pool recycled (see
+        _recycle); a job that only died because it shared that pool is
+        resubmitted once.
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise PoolSaturatedError(f"Pipeline queue is full ({self.max_pending} pending)")
+            self._pending += 1
+
+        resubmitted = False
+        while True:
+            future, executor = self._submit(func, args)
+            try:
+                return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout_seconds)
+            except asyncio.TimeoutError:
+                with self._lock:
+                    self.timed_out += 1
+                # Still queued: cancelling frees the slot; only a started job needs its worker stopped
+                if not future.cancel():
+                    self._recycle(executor, future)
+                raise PipelineTimeoutError(f"Pipeline did not finish within {self.timeout_seconds}s")
+            except BrokenProcessPool:
+                self._reset_executor(executor)
+                if resubmitted or executor not in self._recycled_executors:
+                    raise
+                # Killed along with another job's stuck worker; the slot it
+                # held was freed when it failed, so take one again
+                resubmitted = True
+                with self._lock:
+                    self._pending += 1
+                    self.resubmitted += 1
+
+    def _recycle(self, executor: Executor, future: Future):
+        """
+        Stop a job that timed out. Waiting alone would leave it holding its
+        worker and its pending slot for as long as it runs, which for a hung
+        parse is forever. Worker processes are terminated and the executor
+        replaced; jobs queued or running on it fail with BrokenProcessPool,
+        which run() resubmits. Threads can't be killed, so a stuck thread is
+        left behind with its executor (jobs already queued there still run
+        there) and only stops holding a slot.
+        """
+        with self._lock:
+            if not future.done():
+                self._abandoned.add(future)
+                self._pending -= 1
+                self.failed += 1
+            if self._executor is not executor:
+                # Already replaced (another job on it timed out first)
+                return
+            self._executor = None
+            self.recycled += 1
+
+        if isinstance(executor, ProcessPoolExecutor):
+            self._recycled_executors.add(executor)
+            terminate = getattr(executor, 'terminate_workers', None)
+            if terminate is not None:
+                terminate()
+            else:
+                for process in list((executor._processes or {}).values()):
+                    process.terminate()
+            logger.warning("♻️ Pipeline job timed out, worker processes terminated and pool replaced")
+        else:
+            logger.warning("♻️ Pipeline job timed out, its thread is abandoned and the pool replaced")
+        # No cancel_futures: queued jobs must fail (and be resubmitted) or still
+        # run, never surface as a cancellation of the awaiting request
+        executor.shutdown(wait=False)
+
+    async def warmup(self, func: Callable) -> list:
+        """
+        Run func once per worker slot so every worker is started (and has
+        done its imports) before the first real job
+        """
+        executor = self._get_executor()
+        futures = [asyncio.wrap_future(executor.submit(func)) for _ in range(self.max_workers)]
+        return await asyncio.wait_for(asyncio.gather(*futures), self.timeout_seconds)
+
+    def _reset_executor(self, executor: Executor = None):
+        """
+        Drop the current executor (or only the given one, if still current)
+        """
+        with self._lock:
+            if executor is None or self._executor is executor:
+                executor, self._executor = self._executor, None
+            else:
+                executor = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'mode': self.mode or self.requested_mode,
+                'max_workers': self.max_workers,
+                'max_pending': self.max_pending,
+                'timeout_seconds': self.timeout_seconds,
+                'pending': self._pending,
+                'completed': self.completed,
+                'failed': self.failed,
+                'rejected': self.rejected,
+                'timed_out': self.timed_out,
+                'recycled': self.recycled,
+                'resubmitted': self.resubmitted
+            }